@@ -7,6 +7,8 @@ from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import json
+from .answer_cache import SemanticAnswerCache
+from .federated import FederatedRetriever, configured_policy_retriever, departments_for_services
 
 
 class AgentDecision(Enum):
@@ -84,9 +86,17 @@ class GraderAgent:
     "Are these chunks relevant to the query?"
     """
     
-    def __init__(self, llm_client=None):
+    def __init__(self, llm_client=None, min_score: float = 0.3):
+        """
+        Args:
+            llm_client: LLM used for grading
+            min_score: Minimum retriever cosine similarity for a chunk to be
+                relevant. Chunks without a retriever score are graded by
+                word overlap against relevance_threshold instead.
+        """
         self.llm_client = llm_client
         self.relevance_threshold = 0.7
+        self.min_score = min_score
     
     def grade_chunks(self, query: str, chunks: List[Dict]) -> AgentResult:
         """
@@ -112,10 +122,10 @@ class GraderAgent:
         total_relevance = 0.0
         
         for chunk in chunks:
-            relevance_score = self._calculate_relevance(query, chunk)
+            relevance_score, threshold = self._calculate_relevance(query, chunk)
             total_relevance += relevance_score
             
-            if relevance_score >= self.relevance_threshold:
+            if relevance_score >= threshold:
                 relevant_chunks.append({
                     **chunk,
                     "relevance_score": relevance_score
@@ -138,21 +148,29 @@ class GraderAgent:
             data={"relevant_chunks": relevant_chunks, "avg_relevance": avg_relevance}
         )
     
-    def _calculate_relevance(self, query: str, chunk: Dict) -> float:
-        """Calculate relevance score between query and chunk"""
-        # Simple keyword matching for now
-        # In production, use semantic similarity with embeddings
+    def _calculate_relevance(self, query: str, chunk: Dict) -> Tuple[float, float]:
+        """
+        Relevance of a chunk to the query, and the threshold it must reach
+        Retrieved chunks carry the retriever's cosine similarity ('raw_score'
+        before any per-shard normalisation). Word overlap with the query
+        stays as the fallback for chunks from elsewhere; it is far too strict
+        for retrieved chunks, which rarely repeat most of the query's words.
+        """
+        score = chunk.get('raw_score', chunk.get('score'))
+        if score is not None:
+            return float(score), self.min_score
+        
         query_words = set(query.lower().split())
         chunk_text = chunk.get('text', '').lower()
         chunk_words = set(chunk_text.split())
         
         if not query_words or not chunk_words:
-            return 0.0
+            return 0.0, self.relevance_threshold
         
         overlap = len(query_words.intersection(chunk_words))
         relevance = overlap / len(query_words)
         
-        return min(relevance, 1.0)
+        return min(relevance, 1.0), self.relevance_threshold
     
     def rewrite_query(self, original_query: str, failed_attempt: Dict) -> str:
         """Rewrite query for better retrieval"""
@@ -264,17 +282,37 @@ class AgenticRAGPipeline:
     Router → Retrieve → Grader → Generate → Validator → Retry if needed
     """
     
-    def __init__(self, vector_db=None, llm_client=None, max_retries: int = 3):
+    def __init__(self, vector_db=None, llm_client=None, max_retries: int = 3, answer_cache: Optional[SemanticAnswerCache] = None):
+        """
+        Args:
+            vector_db: Any object with search(query, top_k) returning chunk
+                dicts ('id', 'text', 'score'). Defaults to the policy corpus
+                retriever chosen by AI_POLICY_RETRIEVER. A FederatedRetriever
+                is restricted to the departments of
+                context['service_categories'].
+            llm_client: LLM used by the agents
+            max_retries: Retrieval/validation retry limit
+            answer_cache: Answer cache; defaults to one keyed on the
+                retriever's embedder and invalidated by its version
+        """
         self.router = RouterAgent(llm_client)
         self.grader = GraderAgent(llm_client)
         self.validator = ValidatorAgent(llm_client)
-        self.vector_db = vector_db
+        self.vector_db = vector_db if vector_db is not None else configured_policy_retriever()
         self.llm_client = llm_client
         self.max_retries = max_retries
+        
+        embedder = getattr(self.vector_db, 'embedder', None)
+        self.answer_cache = answer_cache or SemanticAnswerCache(
+            embed=(lambda q: embedder.embed([q])[0]) if embedder else None
+        )
     
     def process(self, query: str, context: Optional[Dict] = None) -> Dict:
         """
         Process query through agentic RAG pipeline
+        Context-free queries are answered from the answer cache when the
+        same (or a near-identical) question was answered against the
+        current index version.
         
         Args:
             query: Input query
@@ -283,7 +321,15 @@ class AgenticRAGPipeline:
         Returns:
             Dict with answer and metadata
         """
-        context = context or {}
+        if context:
+            return self._process(query, context)
+        return self.answer_cache.get_or_compute(
+            query,
+            getattr(self.vector_db, 'version', None),
+            lambda: self._process(query, {})
+        )
+    
+    def _process(self, query: str, context: Dict) -> Dict:
         retry_count = 0
         
         # Step 1: Router - Check if retrieval needed
@@ -303,10 +349,13 @@ class AgenticRAGPipeline:
         # Step 2: Retrieval + Grading Loop
         current_query = query
         relevant_chunks = []
+        departments = None
+        if context.get('service_categories'):
+            departments = departments_for_services(context['service_categories'])
         
         while retry_count < self.max_retries:
             # Retrieve chunks
-            chunks = self._retrieve_chunks(current_query)
+            chunks = self._retrieve_chunks(current_query, departments=departments)
             
             # Grade chunks
             grader_result = self.grader.grade_chunks(current_query, chunks)
@@ -376,14 +425,11 @@ class AgenticRAGPipeline:
             }
         }
     
-    def _retrieve_chunks(self, query: str, top_k: int = 5) -> List[Dict]:
+    def _retrieve_chunks(self, query: str, top_k: int = 5, departments=None) -> List[Dict]:
         """Retrieve chunks from vector database"""
-        # Placeholder - integrate with actual vector DB
-        # In production: use Milvus, Pinecone, or Weaviate
-        return [
-            {"text": f"Sample chunk about {query}", "score": 0.8, "id": "chunk_1"},
-            {"text": f"Related information on {query}", "score": 0.7, "id": "chunk_2"}
-        ]
+        if departments and isinstance(self.vector_db, FederatedRetriever):
+            return self.vector_db.search(query, top_k, departments=departments)
+        return self.vector_db.search(query, top_k)
     
     def _generate_answer(
         self, 
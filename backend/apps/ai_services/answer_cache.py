@@ -0,0 +1,146 @@
+"""
+Two-level answer cache for RAG pipelines
+Level 1 is an exact match on the normalised query text. Level 2 embeds
+the query and takes the most similar cached query if its cosine
+similarity clears the threshold, so rephrasings of a common question
+("documents for land registration" / "land registration documents?")
+skip retrieval and generation too. Entries are evicted least recently
+used first, and the whole cache is dropped when the index version it
+was filled against changes.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Sequence
+import numpy as np
+from .vector_store import normalize
+
+NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase, punctuation stripped, whitespace collapsed"""
+    return NON_WORD.sub(' ', query.lower()).strip()
+
+
+def _answered(answer: Dict) -> bool:
+    # Only answers grounded in retrieved sources are cached. Failed, empty
+    # and fallback answers ("I don't have enough information...", which
+    # still carries a confidence) are retried next time
+    return bool(answer.get('answer')) and answer.get('confidence', 0) > 0 and bool(answer.get('sources'))
+
+
+class SemanticAnswerCache:
+    """Thread-safe LRU of query -> answer with exact and nearest-neighbour lookup"""
+    
+    def __init__(
+        self,
+        embed: Optional[Callable[[str], Sequence[float]]] = None,
+        max_entries: int = 1024,
+        threshold: float = 0.92,
+        cacheable: Callable[[Dict], bool] = _answered
+    ):
+        """
+        Args:
+            embed: Query embedder for level 2 (None: exact matches only)
+            max_entries: LRU capacity
+            threshold: Minimum cosine similarity for a level 2 hit
+            cacheable: Decides whether a computed answer is stored
+        """
+        self.embed = embed
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.cacheable = cacheable
+        self._lock = threading.Lock()
+        self._version = None
+        self._entries = OrderedDict()  # key -> (answer, slot)
+        self._matrix = None            # slot -> normalised query vector
+        self._slot_keys = [None] * max_entries
+        self._free = list(range(max_entries))
+        self.stats = {'exact_hits': 0, 'semantic_hits': 0, 'misses': 0, 'evictions': 0}
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def clear(self):
+        with self._lock:
+            self._reset()
+    
+    def _reset(self):
+        self._entries.clear()
+        self._slot_keys = [None] * self.max_entries
+        self._free = list(range(self.max_entries))
+        if self._matrix is not None:
+            self._matrix[:] = 0
+    
+    def _sync_version(self, version):
+        if version != self._version:
+            self._reset()
+            self._version = version
+    
+    def get_or_compute(self, query: str, version, compute: Callable[[], Dict]) -> Dict:
+        """
+        Cached answer for query at this index version, else compute() and store it
+        
+        Hits are returned with 'cache_hit' set to 'exact' or 'semantic'.
+        """
+        key = normalize_query(query)
+        with self._lock:
+            self._sync_version(version)
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.stats['exact_hits'] += 1
+                return {**self._entries[key][0], 'cache_hit': 'exact'}
+        
+        # Embed outside the lock; the model call is the slow part
+        vector = normalize(np.asarray(self.embed(query), dtype=np.float32)) if self.embed else None
+        if vector is not None:
+            with self._lock:
+                hit = self._nearest(vector) if self._version == version else None
+                if hit is not None:
+                    self._entries.move_to_end(hit)
+                    self.stats['semantic_hits'] += 1
+                    return {**self._entries[hit][0], 'cache_hit': 'semantic'}
+        
+        with self._lock:
+            self.stats['misses'] += 1
+        answer = compute()
+        if self.cacheable(answer):
+            with self._lock:
+                # Skip if the index changed while we were computing
+                if self._version == version:
+                    self._store(key, vector, answer)
+        return answer
+    
+    def _nearest(self, vector: np.ndarray) -> Optional[str]:
+        if self._matrix is None or not self._entries:
+            return None
+        scores = self._matrix @ vector
+        best = int(np.argmax(scores))
+        if self._slot_keys[best] is None or scores[best] < self.threshold:
+            return None
+        return self._slot_keys[best]
+    
+    def _store(self, key: str, vector: Optional[np.ndarray], answer: Dict):
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return
+        if not self._free:
+            _, (_, slot) = self._entries.popitem(last=False)
+            self._slot_keys[slot] = None
+            if self._matrix is not None:
+                self._matrix[slot] = 0
+            self._free.append(slot)
+            self.stats['evictions'] += 1
+        
+        slot = self._free.pop()
+        if vector is not None:
+            if self._matrix is None:
+                self._matrix = np.zeros((self.max_entries, vector.shape[0]), dtype=np.float32)
+            self._matrix[slot] = vector
+        self._slot_keys[slot] = key
+        self._entries[key] = (answer, slot)
+
+
+__all__ = ['SemanticAnswerCache', 'normalize_query']
@@ -0,0 +1,52 @@
+"""
+Lazy registry of AI backends
+Backends are named here by dotted path and imported only when first
+used, so worker boot, manage.py commands and test runs don't pay for
+langchain, llama_index, transformers or torch unless a request needs
+them. `python manage.py ai_import_report` shows what each one costs.
+"""
+
+import threading
+from functools import lru_cache
+from django.utils.module_loading import import_string
+
+BACKENDS = {
+    'classifier': 'apps.ai_services.classification.ServiceClassifier',
+    'redactor': 'apps.ai_services.redaction.DocumentRedactor',
+    'agentic_rag': 'apps.ai_services.agentic_rag.AgenticRAGPipeline',
+    'langchain_rag': 'apps.ai_services.langchain_rag.LangChainAgenticRAG',
+    'langchain_graph_rag': 'apps.ai_services.langchain_rag.LangChainGraphRAG',
+    'llamaindex_local': 'apps.ai_services.llamaindex_local.LocalLlamaIndexRAG',
+    'llamaindex': 'apps.ai_services.llamaindex_integration.LlamaIndexRAGSystem',
+}
+
+_instances = {}
+_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def get_backend_class(name: str):
+    """Import and return a backend class (KeyError for unknown names)"""
+    return import_string(BACKENDS[name])
+
+
+def get_backend(name: str):
+    """
+    Process-wide instance of a backend, built on first use.
+    Backends served this way must be safe to share between threads
+    (read-only after __init__).
+    """
+    instance = _instances.get(name)
+    if instance is None:
+        with _lock:
+            instance = _instances.get(name)
+            if instance is None:
+                instance = _instances[name] = get_backend_class(name)()
+    return instance
+
+
+def module_of(name: str) -> str:
+    return BACKENDS[name].rsplit('.', 1)[0]
+
+
+__all__ = ['BACKENDS', 'get_backend', 'get_backend_class', 'module_of']
@@ -8,6 +8,8 @@ from io import BytesIO
 from typing import Dict, Optional
 from .agentic_rag import AgenticRAGPipeline, RouterAgent, GraderAgent, ValidatorAgent
 from .graph_rag import GraphRAGPipeline
+from .policies import POLICY_DOCUMENTS
+from apps.analytics.metrics import timed_stage
 
 
 class AgenticServiceClassifier:
@@ -49,30 +51,7 @@ class AgenticServiceClassifier:
     
     def _initialize_policy_graph(self):
         """Initialize knowledge graph with government service policies"""
-        policy_docs = [
-            {
-                "id": "policy_land",
-                "text": "Land Record services include property registration, survey documents, and ownership verification. Requires property deed, survey number, and identity proof. Managed by Revenue Department."
-            },
-            {
-                "id": "policy_police",
-                "text": "Police Verification services for character certificate, employment clearance, and passport verification. Requires identity proof, address proof, and purpose statement. Managed by Police Department."
-            },
-            {
-                "id": "policy_vehicle",
-                "text": "Vehicle Registration includes new registration, transfer of ownership, and RC renewal. Requires purchase invoice, insurance, pollution certificate. Managed by Transport Department."
-            },
-            {
-                "id": "policy_building",
-                "text": "Building Permission for construction approval, plan sanction, and occupancy certificate. Requires site plan, structural design, and NOC. Managed by Municipal Corporation."
-            },
-            {
-                "id": "policy_ration",
-                "text": "Ration Card for food subsidy under Public Distribution System. Requires income proof, address proof, and family details. Managed by Food & Civil Supplies Department."
-            }
-        ]
-        
-        self.graph_rag.index_documents(policy_docs)
+        self.graph_rag.index_documents(POLICY_DOCUMENTS)
     
     def classify(self, pdf_file) -> str:
         """
@@ -267,6 +246,7 @@ class AgenticServiceClassifier:
             'reasoning': f"Final validation {'passed' if final_confidence > 0.6 else 'failed'}"
         }
     
+    @timed_stage('extraction')
     def _extract_text(self, pdf_file):
         """Extract text from PDF"""
         try:
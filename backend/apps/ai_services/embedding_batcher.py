@@ -0,0 +1,86 @@
+"""
+Dynamic micro-batching for embedding models
+Concurrent embed calls from request threads are queued and coalesced: a
+worker thread takes the first waiting request, keeps collecting until
+max_batch_size texts are queued or max_wait_ms has passed, runs one
+forward pass for all of them and resolves each caller's Future with its
+slice. One batched pass costs little more than a single text on CPU, so
+throughput scales with concurrency instead of queueing behind the model.
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Sequence
+
+
+class MicroBatcher:
+    """Coalesce embed calls into batched calls to compute(texts) -> vectors"""
+    
+    def __init__(
+        self,
+        compute: Callable[[List[str]], Sequence[Sequence[float]]],
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0
+    ):
+        self.compute = compute
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._lock = threading.Lock()
+        self._queue = None
+        self._pid = None
+    
+    def _ensure_worker(self) -> queue.Queue:
+        # Threads do not survive fork (gunicorn preload_app), so the worker
+        # is started lazily in whichever process first submits
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._queue = queue.Queue()
+                    threading.Thread(
+                        target=self._run, args=(self._queue,), daemon=True, name='embedding-batcher'
+                    ).start()
+                    self._pid = os.getpid()
+        return self._queue
+    
+    def submit(self, texts: Sequence[str]) -> Future:
+        """Queue texts; the Future resolves to their vectors in order"""
+        future = Future()
+        self._ensure_worker().put((list(texts), future))
+        return future
+    
+    def embed(self, texts: Sequence[str], timeout: float = None) -> List[List[float]]:
+        return self.submit(texts).result(timeout)
+    
+    def _run(self, requests: queue.Queue):
+        while True:
+            batch = [requests.get()]
+            size = len(batch[0][0])
+            deadline = time.monotonic() + self.max_wait
+            while size < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(requests.get(timeout=remaining))
+                except queue.Empty:
+                    break
+                size += len(batch[-1][0])
+            
+            batch = [(texts, future) for texts, future in batch if future.set_running_or_notify_cancel()]
+            try:
+                vectors = self.compute([text for texts, _ in batch for text in texts])
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            
+            offset = 0
+            for texts, future in batch:
+                future.set_result([list(vector) for vector in vectors[offset:offset + len(texts)]])
+                offset += len(texts)
+
+
+__all__ = ['MicroBatcher']
@@ -0,0 +1,111 @@
+"""
+Persistent content-addressed embedding cache
+Vectors are stored in SQLite as float16 blobs keyed by (model, sha256 of
+the text), so re-indexing unchanged text or restarting a worker does no
+model inference for anything embedded before. Used by the LangChain
+(CachedEmbeddings) and LlamaIndex (CachedHuggingFaceEmbedding) paths.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from functools import lru_cache
+from typing import Callable, List, Optional, Sequence
+import numpy as np
+
+# SQLite's default limit on bound parameters is 999
+LOOKUP_BATCH = 500
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class EmbeddingCache:
+    """SQLite (WAL) store of float16 embeddings, one connection per thread and process"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+    
+    def _connection(self) -> sqlite3.Connection:
+        # Connections must not cross a fork or be shared between threads
+        if getattr(self._local, 'pid', None) != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS embeddings ('
+                ' model TEXT NOT NULL, hash TEXT NOT NULL, vector BLOB NOT NULL,'
+                ' PRIMARY KEY (model, hash)) WITHOUT ROWID'
+            )
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return self._local.connection
+    
+    def get_many(self, model: str, hashes: Sequence[str]) -> dict:
+        """Map of hash -> float32 vector for the hashes that are cached"""
+        found = {}
+        connection = self._connection()
+        for start in range(0, len(hashes), LOOKUP_BATCH):
+            batch = hashes[start:start + LOOKUP_BATCH]
+            rows = connection.execute(
+                f"SELECT hash, vector FROM embeddings WHERE model = ? AND hash IN ({','.join('?' * len(batch))})",
+                [model, *batch]
+            )
+            for row_hash, blob in rows:
+                found[row_hash] = np.frombuffer(blob, dtype=np.float16).astype(np.float32)
+        return found
+    
+    def put_many(self, model: str, hashes: Sequence[str], vectors):
+        connection = self._connection()
+        with connection:
+            connection.executemany(
+                'INSERT OR REPLACE INTO embeddings (model, hash, vector) VALUES (?, ?, ?)',
+                [
+                    (model, row_hash, np.asarray(vector, dtype=np.float16).tobytes())
+                    for row_hash, vector in zip(hashes, vectors)
+                ]
+            )
+    
+    def embed(self, model: str, texts: Sequence[str], compute: Callable[[List[str]], Sequence[Sequence[float]]]) -> List[List[float]]:
+        """
+        Embeddings for texts, calling compute only for texts not cached yet
+        
+        Args:
+            model: Model identifier (part of the cache key)
+            texts: Texts to embed
+            compute: Embeds a list of texts with the real model
+        """
+        hashes = [text_hash(text) for text in texts]
+        found = self.get_many(model, list(set(hashes)))
+        
+        missing = {}
+        for row_hash, text in zip(hashes, texts):
+            if row_hash not in found:
+                missing.setdefault(row_hash, text)
+        if missing:
+            vectors = compute(list(missing.values()))
+            self.put_many(model, list(missing), vectors)
+            # Round through float16 so first and cached runs agree exactly
+            found.update(
+                (row_hash, np.asarray(vector, dtype=np.float16).astype(np.float32))
+                for row_hash, vector in zip(missing, vectors)
+            )
+        
+        return [found[row_hash].tolist() for row_hash in hashes]
+
+
+@lru_cache(maxsize=None)
+def get_embedding_cache(path: Optional[str] = None) -> EmbeddingCache:
+    """Shared cache for a path (default: settings.AI_EMBEDDING_CACHE_PATH)"""
+    if path is None:
+        from django.conf import settings
+        path = settings.AI_EMBEDDING_CACHE_PATH if settings.configured else './storage/embeddings.sqlite3'
+    return EmbeddingCache(path)
+
+
+__all__ = ['EmbeddingCache', 'get_embedding_cache', 'text_hash']
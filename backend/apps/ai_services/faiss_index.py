@@ -0,0 +1,122 @@
+"""
+Incrementally maintained FAISS index
+Kept apart from langchain_rag so it imports without langchain installed;
+FAISS itself is imported on first use.
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, Iterable, List, Optional
+from .vector_store import publish_generation, current_generation
+
+
+class IncrementalFAISSIndex:
+    """
+    FAISS vector store maintained incrementally by document id
+    Chunk ids are "<doc_id>:<content hash>", so re-indexing a document
+    embeds only the chunks whose text changed and deletes the ones that
+    disappeared. Unchanged documents cost nothing.
+    """
+    
+    MANIFEST = 'chunks.json'
+    
+    def __init__(self, embeddings, persist_dir: Optional[str] = None):
+        """
+        Args:
+            embeddings: LangChain embeddings used for new chunks
+            persist_dir: If set, load from here and persist after changes
+        """
+        self.embeddings = embeddings
+        self.persist_dir = persist_dir
+        self.vectorstore = None
+        self.chunk_ids: Dict[str, List[str]] = {}
+        # Bumped on every change; result caches key on it
+        self.version = 0
+        
+        if persist_dir:
+            try:
+                self._load()
+            except FileNotFoundError:
+                pass
+    
+    def store_class(self):
+        """Vector store class for new and loaded indexes"""
+        from langchain.vectorstores import FAISS
+        return FAISS
+    
+    @staticmethod
+    def _chunk_id(doc_id: str, chunk) -> str:
+        content = json.dumps([chunk.page_content, chunk.metadata], sort_keys=True, default=str)
+        return f"{doc_id}:{hashlib.sha256(content.encode()).hexdigest()[:16]}"
+    
+    def upsert(self, chunks_by_doc: Dict[str, list]) -> int:
+        """
+        Replace the chunks of each given document
+        
+        Returns:
+            Number of chunks that had to be embedded
+        """
+        to_add = {}
+        to_delete = []
+        chunk_ids = {}
+        for doc_id, chunks in chunks_by_doc.items():
+            new = {self._chunk_id(doc_id, chunk): chunk for chunk in chunks}
+            old = set(self.chunk_ids.get(doc_id, []))
+            to_delete.extend(chunk_id for chunk_id in old if chunk_id not in new)
+            to_add.update((chunk_id, chunk) for chunk_id, chunk in new.items() if chunk_id not in old)
+            chunk_ids[doc_id] = list(new)
+        
+        self._apply(to_add, to_delete, chunk_ids)
+        return len(to_add)
+    
+    def delete(self, doc_ids: Iterable[str]):
+        """Remove every chunk of the given documents"""
+        chunk_ids = {doc_id: None for doc_id in doc_ids if doc_id in self.chunk_ids}
+        to_delete = [chunk_id for doc_id in chunk_ids for chunk_id in self.chunk_ids[doc_id]]
+        self._apply({}, to_delete, chunk_ids)
+    
+    def _apply(self, to_add: Dict[str, object], to_delete: List[str], chunk_ids: Dict[str, Optional[List[str]]]):
+        """
+        Embed and add the new chunks before deleting the replaced ones, and
+        record chunk_ids (None: document removed) only once both succeeded,
+        so a failed embedding leaves the index and its manifest unchanged
+        """
+        if to_add:
+            if self.vectorstore is None:
+                self.vectorstore = self.store_class().from_documents(
+                    list(to_add.values()), self.embeddings, ids=list(to_add)
+                )
+            else:
+                self.vectorstore.add_documents(list(to_add.values()), ids=list(to_add))
+        if to_delete and self.vectorstore is not None:
+            self.vectorstore.delete(to_delete)
+        
+        for doc_id, ids in chunk_ids.items():
+            if ids is None:
+                self.chunk_ids.pop(doc_id, None)
+            else:
+                self.chunk_ids[doc_id] = ids
+        if not to_add and not to_delete:
+            return
+        self.version += 1
+        if self.persist_dir:
+            self.persist()
+    
+    def persist(self):
+        """Save as a new generation and swap it in atomically"""
+        if self.vectorstore is None:
+            return
+        
+        def write(target):
+            self.vectorstore.save_local(target)
+            with open(os.path.join(target, self.MANIFEST), 'w') as handle:
+                json.dump(self.chunk_ids, handle)
+        
+        publish_generation(self.persist_dir, write)
+    
+    def _load(self):
+        target = current_generation(self.persist_dir)
+        self.vectorstore = self.store_class().load_local(target, self.embeddings)
+        with open(os.path.join(target, self.MANIFEST)) as handle:
+            self.chunk_ids = json.load(handle)
@@ -0,0 +1,178 @@
+"""
+Federated retrieval over per-department indexes
+Policy knowledge splits by department, so each department gets its own
+small index (shard). A query fans out to the shards concurrently on a
+thread pool and the per-shard top-k lists are merged into one, so
+latency is that of the slowest shard rather than of one large index.
+Retrieval can be restricted to the departments implied by the service
+categories in play (SERVICE_TO_DEPARTMENT).
+
+Shards built with different embedders (or different backends) score on
+different scales; their scores are min-max normalised per shard before
+merging. Shards that share one embedder already produce comparable
+cosine scores, and the shared query embedding is computed only once.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+from .vector_store import VectorStoreRetriever, HashingEmbedder, policy_retriever
+
+
+def departments_for_services(service_categories: Iterable[str]) -> Set[str]:
+    """Departments that handle the given service categories"""
+    from apps.officers.constants import SERVICE_TO_DEPARTMENT
+    return {SERVICE_TO_DEPARTMENT.get(category, 'GENERAL') for category in service_categories}
+
+
+def minmax_scores(scores: Sequence[float]) -> List[float]:
+    """Scale scores to [0, 1]; a shard with one distinct score maps it to 1"""
+    if not scores:
+        return []
+    low, high = min(scores), max(scores)
+    if high - low < 1e-9:
+        return [1.0] * len(scores)
+    return [(score - low) / (high - low) for score in scores]
+
+
+class FederatedRetriever:
+    """Fan a query out to named shards and merge their top-k"""
+    
+    def __init__(
+        self,
+        shards: Dict[str, object],
+        embedder=None,
+        normalize_scores: bool = True,
+        max_workers: Optional[int] = None
+    ):
+        """
+        Args:
+            shards: Shard name (department) -> object with search(query, top_k)
+            embedder: Embedder shared by every shard. When given, shards must be
+                VectorStoreRetrievers built with it; the query is embedded
+                once and each shard's store is searched with that vector
+            normalize_scores: Min-max normalise each shard's scores before
+                merging (needed when shards score on different scales)
+            max_workers: Thread pool size (default: one thread per shard, max 8)
+        """
+        self.shards = dict(shards)
+        self.embedder = embedder
+        self.normalize_scores = normalize_scores
+        self.max_workers = max_workers or min(len(self.shards), 8) or 1
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+    
+    @property
+    def version(self):
+        return tuple(getattr(shard, 'version', None) for shard in self.shards.values())
+    
+    def _pool(self) -> ThreadPoolExecutor:
+        # Threads do not survive fork (gunicorn preload_app), so each
+        # process starts its own pool on first use
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix='federated-retriever'
+                    )
+                    self._pid = os.getpid()
+        return self._executor
+    
+    def select(self, departments: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Shard names to query: those in departments, or every shard when no
+        departments are given or none of them has a shard
+        """
+        if departments is None:
+            return list(self.shards)
+        selected = [name for name in self.shards if name in set(departments)]
+        return selected or list(self.shards)
+    
+    def search(self, query: str, top_k: int = 5, departments: Optional[Iterable[str]] = None) -> List[Dict]:
+        """
+        Top-k chunks across the selected shards, best first
+        Each chunk gains 'shard' and 'raw_score'; 'score' is the merged score.
+        """
+        names = self.select(departments)
+        if top_k <= 0 or not names:
+            return []
+        
+        if self.embedder is not None:
+            vector = self.embedder.embed([query])[0]
+            search = lambda name: self.shards[name].store.search(vector, top_k)
+        else:
+            search = lambda name: self.shards[name].search(query, top_k)
+        
+        if len(names) == 1:
+            results = [search(names[0])]
+        else:
+            results = list(self._pool().map(search, names))
+        
+        merged = []
+        for name, chunks in zip(names, results):
+            raw = [chunk['score'] for chunk in chunks]
+            scores = minmax_scores(raw) if self.normalize_scores else raw
+            for chunk, score in zip(chunks, scores):
+                merged.append({**chunk, 'score': score, 'raw_score': chunk['score'], 'shard': name})
+        
+        # Ties (e.g. each shard's normalised best) fall back to raw score
+        merged.sort(key=lambda chunk: (chunk['score'], chunk['raw_score']), reverse=True)
+        return merged[:top_k]
+
+
+def split_by_department(documents: List[Dict]) -> Dict[str, List[Dict]]:
+    """Group documents by metadata['department'] (GENERAL when missing)"""
+    groups = {}
+    for doc in documents:
+        groups.setdefault(doc.get('metadata', {}).get('department', 'GENERAL'), []).append(doc)
+    return groups
+
+
+@lru_cache(maxsize=None)
+def policy_federated_retriever() -> FederatedRetriever:
+    """
+    Process-wide federated retriever over the policy corpus, one shard per
+    department. Maps the shards saved by `manage.py build_policy_index`
+    under AI_POLICY_SHARD_DIR when present, otherwise builds them in memory.
+    All shards share one embedder, so raw cosine scores are merged as is.
+    """
+    from django.conf import settings
+    from .policies import POLICY_DOCUMENTS
+
+    embedder = HashingEmbedder()
+    shards = {}
+    for department, documents in split_by_department(POLICY_DOCUMENTS).items():
+        try:
+            shards[department] = VectorStoreRetriever.load(
+                os.path.join(settings.AI_POLICY_SHARD_DIR, department), embedder
+            )
+        except (FileNotFoundError, ValueError):
+            shards[department] = VectorStoreRetriever(embedder)
+            shards[department].index_documents(documents)
+    return FederatedRetriever(shards, embedder=embedder, normalize_scores=False)
+
+
+def configured_policy_retriever():
+    """
+    Policy retriever selected by settings.AI_POLICY_RETRIEVER: the
+    department shards ('federated') or the single index ('single')
+    
+    Raises:
+        ValueError: for any other value
+    """
+    from django.conf import settings
+    if settings.AI_POLICY_RETRIEVER == 'federated':
+        return policy_federated_retriever()
+    if settings.AI_POLICY_RETRIEVER == 'single':
+        return policy_retriever()
+    raise ValueError(f"Unknown AI_POLICY_RETRIEVER {settings.AI_POLICY_RETRIEVER!r}")
+
+
+__all__ = [
+    'FederatedRetriever', 'departments_for_services', 'minmax_scores', 'split_by_department',
+    'policy_federated_retriever', 'configured_policy_retriever'
+]
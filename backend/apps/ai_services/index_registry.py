@@ -0,0 +1,142 @@
+"""
+Memory-bounded registry of loaded vector indexes
+Each loaded index holds its whole vector store in memory, so a worker
+serving many index names keeps only as many as fit a byte budget. Indexes
+are evicted least recently used first by estimated size, and an evicted
+(or never loaded) name is reloaded from persistent storage on next use.
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+# CPython: list of floats = 8-byte pointer + 24-byte float object per value
+FLOAT_LIST_ITEM_BYTES = 32
+NODE_OVERHEAD_BYTES = 1024
+
+
+def estimate_index_bytes(index: Any) -> int:
+    """
+    Rough resident size of a LlamaIndex index with in-memory stores:
+    embeddings held as Python float lists plus node text and metadata
+    """
+    size = 0
+    vector_store = getattr(index, 'vector_store', None)
+    embeddings = getattr(getattr(vector_store, 'data', None), 'embedding_dict', None) or {}
+    for vector in embeddings.values():
+        size += sys.getsizeof(vector) + FLOAT_LIST_ITEM_BYTES * len(vector)
+    docstore = getattr(index, 'docstore', None)
+    for node in (getattr(docstore, 'docs', None) or {}).values():
+        size += NODE_OVERHEAD_BYTES + len(getattr(node, 'text', '') or '')
+    return size or sys.getsizeof(index)
+
+
+class IndexRegistry:
+    """Thread-safe LRU of name -> index, bounded by estimated bytes"""
+    
+    def __init__(
+        self,
+        loader: Callable[[str], Any],
+        max_bytes: int,
+        estimate_size: Callable[[Any], int] = estimate_index_bytes,
+        on_evict: Optional[Callable[[str], None]] = None
+    ):
+        """
+        Args:
+            loader: Loads an index by name from storage; raises if it does not exist
+            max_bytes: Memory budget; the most recently used index is always kept
+            estimate_size: Estimated resident bytes of an index
+            on_evict: Called with the name of each evicted index
+        """
+        self.loader = loader
+        self.max_bytes = max_bytes
+        self.estimate_size = estimate_size
+        self.on_evict = on_evict
+        self._lock = threading.Lock()
+        self._load_locks = {}  # name -> [lock, callers holding or waiting for it]
+        self._entries = OrderedDict()  # name -> (index, bytes)
+        self.total_bytes = 0
+        self.stats = {'hits': 0, 'misses': 0, 'loads': 0, 'evictions': 0}
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def names(self):
+        with self._lock:
+            return list(self._entries)
+    
+    def get(self, name: str) -> Any:
+        """Resident index, loading it on a miss"""
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None:
+                self._entries.move_to_end(name)
+                self.stats['hits'] += 1
+                return entry[0]
+            self.stats['misses'] += 1
+            load_entry = self._load_locks.setdefault(name, [threading.Lock(), 0])
+            load_entry[1] += 1
+            load_lock = load_entry[0]
+    
+        # One load per name at a time; other names stay servable meanwhile
+        try:
+            with load_lock:
+                with self._lock:
+                    entry = self._entries.get(name)
+                    if entry is not None:
+                        self._entries.move_to_end(name)
+                        return entry[0]
+                index = self.loader(name)
+                with self._lock:
+                    self.stats['loads'] += 1
+                self.put(name, index)
+                return index
+        finally:
+            # Drop the lock once no caller holds or waits for it, so one-off
+            # names don't accumulate and a waiter never ends up on a stale lock
+            with self._lock:
+                load_entry[1] -= 1
+                if load_entry[1] == 0:
+                    del self._load_locks[name]
+    
+    def put(self, name: str, index: Any):
+        """Register a freshly built or loaded index, evicting others to fit"""
+        size = self.estimate_size(index)
+        evicted = []
+        with self._lock:
+            previous = self._entries.pop(name, None)
+            if previous is not None:
+                self.total_bytes -= previous[1]
+            self._entries[name] = (index, size)
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+                old_name, (_, old_size) = self._entries.popitem(last=False)
+                self.total_bytes -= old_size
+                self.stats['evictions'] += 1
+                evicted.append(old_name)
+        for old_name in evicted:
+            if self.on_evict:
+                self.on_evict(old_name)
+    
+    def discard(self, name: str):
+        with self._lock:
+            entry = self._entries.pop(name, None)
+            if entry is None:
+                return
+            self.total_bytes -= entry[1]
+        if self.on_evict:
+            self.on_evict(name)
+    
+    def snapshot(self) -> Dict:
+        """Counters plus current residency, for logs and debugging"""
+        with self._lock:
+            return {
+                **self.stats,
+                'resident': list(self._entries),
+                'bytes': self.total_bytes,
+                'max_bytes': self.max_bytes
+            }
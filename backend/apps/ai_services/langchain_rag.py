@@ -3,15 +3,22 @@ LangChain-based Agentic RAG Implementation
 Uses LangChain and LangGraph for advanced multi-agent workflows
 """
 
+from functools import lru_cache
 from typing import Dict, List, Optional, TypedDict
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.embeddings import HuggingFaceEmbeddings
-from langchain.vectorstores import FAISS
 from langchain.chains import RetrievalQA
 from langchain.prompts import PromptTemplate
 from langchain.schema import Document
 from langgraph.graph import StateGraph, END
 from langchain_community.llms import Ollama
+from langchain_core.embeddings import Embeddings
+from .embedding_cache import EmbeddingCache, get_embedding_cache
+from .embedding_batcher import MicroBatcher
+from .answer_cache import SemanticAnswerCache
+from .faiss_index import IncrementalFAISSIndex
+
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
 
 
 class AgentState(TypedDict):
@@ -26,25 +33,67 @@ class AgentState(TypedDict):
     retry_count: int
 
 
+class CachedEmbeddings(Embeddings):
+    """LangChain embeddings backed by the persistent embedding cache"""
+    
+    def __init__(self, embeddings: Embeddings, model_name: str, cache: Optional[EmbeddingCache] = None):
+        self.embeddings = embeddings
+        self.model_name = model_name
+        self.cache = cache or get_embedding_cache()
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.cache.embed(self.model_name, texts, self.embeddings.embed_documents)
+    
+    def embed_query(self, text: str) -> List[float]:
+        # Separate key space: some models embed queries differently
+        return self.cache.embed(
+            f"{self.model_name}:query", [text],
+            lambda texts: [self.embeddings.embed_query(texts[0])]
+        )[0]
+
+
+class BatchedEmbeddings(Embeddings):
+    """
+    Routes embed calls through a MicroBatcher so concurrent requests share
+    forward passes. sentence-transformers embeds queries and documents the
+    same way, so both go through one batcher.
+    """
+    
+    def __init__(self, embeddings: Embeddings, max_batch_size: int = 64, max_wait_ms: float = 5.0):
+        self.embeddings = embeddings
+        self.batcher = MicroBatcher(embeddings.embed_documents, max_batch_size, max_wait_ms)
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.batcher.embed(texts)
+    
+    def embed_query(self, text: str) -> List[float]:
+        return self.batcher.embed([text])[0]
+
+
+@lru_cache(maxsize=None)
+def cached_huggingface_embeddings(model_name: str = EMBEDDING_MODEL) -> CachedEmbeddings:
+    """One model, batcher and cache per process, shared by every pipeline: cache -> batcher -> model"""
+    return CachedEmbeddings(BatchedEmbeddings(HuggingFaceEmbeddings(model_name=model_name)), model_name)
+
+
 class LangChainAgenticRAG:
     """
     Agentic RAG using LangChain and LangGraph
     Multi-agent workflow: Router → Retriever → Grader → Generator → Validator
     """
     
-    def __init__(self, use_local_llm: bool = True):
+    def __init__(self, use_local_llm: bool = True, persist_dir: Optional[str] = None):
         """
         Initialize LangChain Agentic RAG
         
         Args:
             use_local_llm: If True, uses Ollama (free local). If False, uses OpenAI
+            persist_dir: Where the FAISS index is kept between restarts (optional)
         """
         self.use_local_llm = use_local_llm
         
-        # Initialize embeddings (free, runs locally)
-        self.embeddings = HuggingFaceEmbeddings(
-            model_name="sentence-transformers/all-MiniLM-L6-v2"
-        )
+        # Initialize embeddings (free, runs locally; cached on disk)
+        self.embeddings = cached_huggingface_embeddings()
         
         # Initialize LLM
         if use_local_llm:
@@ -61,33 +110,40 @@ class LangChainAgenticRAG:
             chunk_overlap=50
         )
         
-        # Initialize vector store (will be populated with documents)
-        self.vectorstore = None
+        # Vector store, populated and updated through index_documents
+        self.index = IncrementalFAISSIndex(self.embeddings, persist_dir)
+        
+        # Answers per index version, matched exactly or by query embedding
+        self.answer_cache = SemanticAnswerCache(embed=self.embeddings.embed_query)
         
         # Build the agent graph
         self.graph = self._build_agent_graph()
     
-    def index_documents(self, documents: List[Dict[str, str]]):
+    @property
+    def vectorstore(self):
+        return self.index.vectorstore
+    
+    def index_documents(self, documents: List[Dict[str, str]]) -> int:
         """
-        Index documents into vector store
+        Add or update documents in the vector store
+        Only chunks that are new or changed are embedded.
         
         Args:
             documents: List of dicts with 'id' and 'text' keys
+        
+        Returns:
+            Number of chunks embedded
         """
-        # Convert to LangChain Document objects
-        docs = [
-            Document(
-                page_content=doc['text'],
-                metadata={'id': doc['id']}
-            )
+        return self.index.upsert({
+            doc['id']: self.text_splitter.split_documents([
+                Document(page_content=doc['text'], metadata={'id': doc['id']})
+            ])
             for doc in documents
-        ]
-        
-        # Split documents into chunks
-        split_docs = self.text_splitter.split_documents(docs)
-        
-        # Create vector store
-        self.vectorstore = FAISS.from_documents(split_docs, self.embeddings)
+        })
+    
+    def delete_documents(self, doc_ids: List[str]):
+        """Remove documents from the vector store"""
+        self.index.delete(doc_ids)
     
     def _build_agent_graph(self) -> StateGraph:
         """Build the LangGraph workflow"""
@@ -288,6 +344,10 @@ class LangChainAgenticRAG:
         Returns:
             Dict with answer, confidence, and metadata
         """
+        return self.answer_cache.get_or_compute(query, self.index.version, lambda: self._run_graph(query))
+    
+    def _run_graph(self, query: str) -> Dict:
+        """Run the agent graph for a query (uncached)"""
         # Initialize state
         initial_state: AgentState = {
             'query': query,
@@ -317,48 +377,66 @@ class LangChainGraphRAG:
     Knowledge graph-based retrieval with multi-hop reasoning
     """
     
-    def __init__(self):
-        """Initialize GraphRAG with LangChain"""
-        self.embeddings = HuggingFaceEmbeddings(
-            model_name="sentence-transformers/all-MiniLM-L6-v2"
-        )
+    def __init__(self, persist_dir: Optional[str] = None):
+        """
+        Initialize GraphRAG with LangChain
+        
+        Args:
+            persist_dir: Where the entity FAISS index is kept between restarts (optional)
+        """
+        self.embeddings = cached_huggingface_embeddings()
         self.llm = Ollama(model="llama2")
         
         # Knowledge graph structure
         self.entities = {}  # entity_id -> entity_data
         self.relationships = []  # (entity1, relation, entity2)
-        self.vectorstore = None
+        self.index = IncrementalFAISSIndex(self.embeddings, persist_dir)
+    
+    @property
+    def vectorstore(self):
+        return self.index.vectorstore
     
-    def build_knowledge_graph(self, documents: List[Dict[str, str]]):
+    def build_knowledge_graph(self, documents: List[Dict[str, str]]) -> int:
         """
-        Build knowledge graph from documents
+        Add or update documents in the knowledge graph
+        Entities of a re-submitted document replace its previous ones; only
+        new or changed entities are embedded.
         
         Args:
             documents: List of documents with 'id' and 'text'
+        
+        Returns:
+            Number of entity chunks embedded
         """
-        # Extract entities and relationships
+        entity_docs = {}
         for doc in documents:
-            # Simple entity extraction (in production, use NER)
-            entities = self._extract_entities(doc['text'])
+            self._drop_entities(doc['id'])
+            entity_docs[doc['id']] = []
             
-            for entity in entities:
+            # Simple entity extraction (in production, use NER)
+            for entity in self._extract_entities(doc['text']):
                 entity_id = f"{doc['id']}_{entity}"
                 self.entities[entity_id] = {
                     'name': entity,
                     'document_id': doc['id'],
                     'text': doc['text']
                 }
+                entity_docs[doc['id']].append(Document(
+                    page_content=doc['text'],
+                    metadata={'entity_id': entity_id, 'name': entity}
+                ))
         
-        # Create vector store for entities
-        entity_docs = [
-            Document(
-                page_content=data['text'],
-                metadata={'entity_id': eid, 'name': data['name']}
-            )
-            for eid, data in self.entities.items()
-        ]
-        
-        self.vectorstore = FAISS.from_documents(entity_docs, self.embeddings)
+        return self.index.upsert(entity_docs)
+    
+    def delete_documents(self, doc_ids: List[str]):
+        """Remove documents and their entities from the knowledge graph"""
+        for doc_id in doc_ids:
+            self._drop_entities(doc_id)
+        self.index.delete(doc_ids)
+    
+    def _drop_entities(self, doc_id: str):
+        for entity_id in [eid for eid, data in self.entities.items() if data['document_id'] == doc_id]:
+            del self.entities[entity_id]
     
     def _extract_entities(self, text: str) -> List[str]:
         """Extract entities from text (simplified)"""
@@ -21,6 +21,7 @@ from llama_index.core.agent import ReActAgent
 from llama_index.core.tools import QueryEngineTool, ToolMetadata
 from llama_index.core.memory import ChatMemoryBuffer
 import os
+from .index_registry import IndexRegistry
 
 
 class LlamaIndexRAGSystem:
@@ -33,7 +34,8 @@ class LlamaIndexRAGSystem:
         self,
         llm_model: str = "gpt-4",
         embedding_model: str = "text-embedding-3-small",
-        persist_dir: str = "./storage"
+        persist_dir: str = "./storage",
+        max_index_bytes: int = 1024 ** 3
     ):
         # Configure LlamaIndex settings
         Settings.llm = OpenAI(
@@ -49,7 +51,13 @@ class LlamaIndexRAGSystem:
         Settings.chunk_overlap = 50
         
         self.persist_dir = persist_dir
-        self.indexes = {}
+        # Loaded indexes are LRU-evicted past max_index_bytes and reloaded
+        # from persist_dir on next use
+        self.indexes = IndexRegistry(
+            loader=self._load_from_storage,
+            max_bytes=max_index_bytes,
+            on_evict=lambda name: self.query_engines.pop(name, None)
+        )
         self.query_engines = {}
         self.agents = {}
     
@@ -89,18 +97,24 @@ class LlamaIndexRAGSystem:
             persist_dir=f"{self.persist_dir}/{index_name}"
         )
         
-        self.indexes[index_name] = index
+        self.query_engines.pop(index_name, None)
+        self.indexes.put(index_name, index)
         return index
     
     def load_index(self, index_name: str = "default") -> VectorStoreIndex:
         """Load existing index from storage"""
-        storage_context = StorageContext.from_defaults(
-            persist_dir=f"{self.persist_dir}/{index_name}"
-        )
-        index = load_index_from_storage(storage_context)
-        self.indexes[index_name] = index
+        index = self._load_from_storage(index_name)
+        self.query_engines.pop(index_name, None)
+        self.indexes.put(index_name, index)
         return index
     
+    def _load_from_storage(self, index_name: str) -> VectorStoreIndex:
+        persist_dir = f"{self.persist_dir}/{index_name}"
+        if not os.path.isdir(persist_dir):
+            raise ValueError(f"Index '{index_name}' not found")
+        storage_context = StorageContext.from_defaults(persist_dir=persist_dir)
+        return load_index_from_storage(storage_context)
+    
     def create_query_engine(
         self,
         index_name: str = "default",
@@ -114,10 +128,10 @@ class LlamaIndexRAGSystem:
             index_name: Name of index to query
             similarity_top_k: Number of chunks to retrieve
             similarity_cutoff: Minimum similarity score
+        
+        Loads the index from persist_dir if it is not resident.
         """
         index = self.indexes.get(index_name)
-        if not index:
-            raise ValueError(f"Index '{index_name}' not found")
         
         # Configure retriever
         retriever = VectorIndexRetriever(
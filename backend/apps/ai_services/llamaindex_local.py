@@ -3,6 +3,7 @@ LlamaIndex Integration with LOCAL Models - NO API Keys Required
 100% Free, runs on your machine
 """
 
+import os
 from typing import Dict, List, Optional
 from llama_index.core import (
     VectorStoreIndex,
@@ -15,11 +16,50 @@ from llama_index.core.node_parser import SentenceSplitter
 from llama_index.core.retrievers import VectorIndexRetriever
 from llama_index.core.query_engine import RetrieverQueryEngine
 from llama_index.core.postprocessor import SimilarityPostprocessor
+from llama_index.core.bridge.pydantic import PrivateAttr
 
 # LOCAL MODELS - NO API KEYS
 from llama_index.embeddings.huggingface import HuggingFaceEmbedding
+from llama_index.embeddings.huggingface.utils import format_query, format_text
 from llama_index.llms.ollama import Ollama
 from llama_index.llms.huggingface import HuggingFaceLLM
+from .embedding_cache import EmbeddingCache, get_embedding_cache
+from .embedding_batcher import MicroBatcher
+from .answer_cache import SemanticAnswerCache
+from .index_registry import IndexRegistry
+
+
+class CachedHuggingFaceEmbedding(HuggingFaceEmbedding):
+    """
+    HuggingFace embedding that reads and fills the persistent embedding
+    cache, and micro-batches cache misses from concurrent callers into
+    shared forward passes: cache -> batcher -> model
+    """
+    
+    _cache: EmbeddingCache = PrivateAttr()
+    _text_batcher: MicroBatcher = PrivateAttr()
+    _query_batcher: MicroBatcher = PrivateAttr()
+    
+    def __init__(self, *args, cache: Optional[EmbeddingCache] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cache = cache or get_embedding_cache()
+        # BGE-style models prefix queries with an instruction, so queries
+        # and texts are batched (and cached) separately
+        self._text_batcher = MicroBatcher(
+            lambda texts: self._embed([format_text(t, self.model_name, self.text_instruction) for t in texts])
+        )
+        self._query_batcher = MicroBatcher(
+            lambda queries: self._embed([format_query(q, self.model_name, self.query_instruction) for q in queries])
+        )
+    
+    def _get_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        return self._cache.embed(self.model_name, texts, self._text_batcher.embed)
+    
+    def _get_text_embedding(self, text: str) -> List[float]:
+        return self._get_text_embeddings([text])[0]
+    
+    def _get_query_embedding(self, query: str) -> List[float]:
+        return self._cache.embed(f"{self.model_name}:query", [query], self._query_batcher.embed)[0]
 
 
 class LocalLlamaIndexRAG:
@@ -33,7 +73,8 @@ class LocalLlamaIndexRAG:
         embedding_model: str = "BAAI/bge-small-en-v1.5",
         llm_model: str = "llama2",  # Ollama model
         use_ollama: bool = True,
-        persist_dir: str = "./storage"
+        persist_dir: str = "./storage",
+        max_index_bytes: int = 1024 ** 3
     ):
         """
         Initialize with local models
@@ -43,11 +84,13 @@ class LocalLlamaIndexRAG:
             llm_model: Ollama model name (free) or HuggingFace model
             use_ollama: Use Ollama (recommended) or HuggingFace
             persist_dir: Storage directory
+            max_index_bytes: Memory budget for loaded indexes; least recently
+                used ones are evicted and reloaded from persist_dir on demand
         """
         
         # Configure LOCAL embedding model (FREE)
         print("Loading local embedding model...")
-        Settings.embed_model = HuggingFaceEmbedding(
+        Settings.embed_model = CachedHuggingFaceEmbedding(
             model_name=embedding_model,
             cache_folder="./models"
         )
@@ -76,8 +119,15 @@ class LocalLlamaIndexRAG:
         Settings.chunk_overlap = 50
         
         self.persist_dir = persist_dir
-        self.indexes = {}
+        self.indexes = IndexRegistry(
+            loader=self._load_from_storage,
+            max_bytes=max_index_bytes,
+            on_evict=self._drop_query_engine
+        )
         self.query_engines = {}
+        # Bumped whenever an index is (re)built or reloaded; answer caches key on it
+        self.index_versions = {}
+        self.answer_caches = {}
         
         print("✓ Local RAG system initialized (no API keys needed)")
     
@@ -111,29 +161,41 @@ class LocalLlamaIndexRAG:
             persist_dir=f"{self.persist_dir}/{index_name}"
         )
         
-        self.indexes[index_name] = index
+        self.query_engines.pop(index_name, None)
+        self.indexes.put(index_name, index)
+        self.index_versions[index_name] = self.index_versions.get(index_name, 0) + 1
         print(f"✓ Index '{index_name}' created and saved")
         return index
     
     def load_index(self, index_name: str = "default") -> VectorStoreIndex:
         """Load existing index"""
-        storage_context = StorageContext.from_defaults(
-            persist_dir=f"{self.persist_dir}/{index_name}"
-        )
-        index = load_index_from_storage(storage_context)
-        self.indexes[index_name] = index
+        index = self._load_from_storage(index_name)
+        self.query_engines.pop(index_name, None)
+        self.indexes.put(index_name, index)
+        self.index_versions[index_name] = self.index_versions.get(index_name, 0) + 1
         return index
     
+    def _load_from_storage(self, index_name: str) -> VectorStoreIndex:
+        # Also the registry's loader: a lazy reload after eviction reads the
+        # same persisted data, so it leaves index_versions alone
+        persist_dir = f"{self.persist_dir}/{index_name}"
+        if not os.path.isdir(persist_dir):
+            raise ValueError(f"Index '{index_name}' not found")
+        storage_context = StorageContext.from_defaults(persist_dir=persist_dir)
+        return load_index_from_storage(storage_context)
+    
+    def _drop_query_engine(self, index_name: str):
+        # A query engine holds its index, so it goes with it
+        self.query_engines.pop(index_name, None)
+    
     def create_query_engine(
         self,
         index_name: str = "default",
         similarity_top_k: int = 3,
         similarity_cutoff: float = 0.6
     ):
-        """Create query engine"""
+        """Create query engine (loads the index if it is not resident)"""
         index = self.indexes.get(index_name)
-        if not index:
-            raise ValueError(f"Index '{index_name}' not found")
         
         retriever = VectorIndexRetriever(
             index=index,
@@ -157,7 +219,19 @@ class LocalLlamaIndexRAG:
         query: str,
         index_name: str = "default"
     ) -> Dict:
-        """Query using local models"""
+        """Query using local models (answers cached per index version)"""
+        cache = self.answer_caches.get(index_name)
+        if cache is None:
+            cache = self.answer_caches[index_name] = SemanticAnswerCache(
+                embed=Settings.embed_model.get_query_embedding
+            )
+        return cache.get_or_compute(
+            query,
+            self.index_versions.get(index_name, 0),
+            lambda: self._query_engine_answer(query, index_name)
+        )
+    
+    def _query_engine_answer(self, query: str, index_name: str) -> Dict:
         query_engine = self.query_engines.get(index_name)
         if not query_engine:
             query_engine = self.create_query_engine(index_name)
@@ -295,7 +369,7 @@ class LocalGraphRAG:
         from llama_index.core.graph_stores import SimpleGraphStore
         
         # Use local embedding
-        Settings.embed_model = HuggingFaceEmbedding(
+        Settings.embed_model = CachedHuggingFaceEmbedding(
             model_name="BAAI/bge-small-en-v1.5"
         )
         
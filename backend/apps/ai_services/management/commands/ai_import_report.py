@@ -0,0 +1,56 @@
+import os
+import subprocess
+import sys
+from django.core.management.base import BaseCommand, CommandError
+from apps.ai_services.backends import BACKENDS, module_of
+
+
+def parse_importtime(stderr: str):
+    """Rows of (self_us, cumulative_us, module) from `python -X importtime` output"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|', 2)
+        rows.append((int(self_us), int(cumulative_us), module.strip()))
+    return rows
+
+
+class Command(BaseCommand):
+    help = 'Cold import cost of each AI backend module (python -X importtime in a fresh interpreter)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('backends', nargs='*', help='Backend names (default: all)')
+        parser.add_argument('--top', type=int, default=10, help='Heaviest imports to list per backend')
+    
+    def handle(self, *args, **options):
+        names = options['backends'] or list(BACKENDS)
+        unknown = set(names) - set(BACKENDS)
+        if unknown:
+            raise CommandError(f"Unknown backends: {', '.join(sorted(unknown))}")
+        
+        setup = 'import django; django.setup()'
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'config.settings')}
+        
+        def importtime(code):
+            return subprocess.run(
+                [sys.executable, '-X', 'importtime', '-c', code],
+                capture_output=True, text=True, env=env
+            )
+        
+        # Modules Django setup already loads are not charged to any backend
+        baseline = {module for _, _, module in parse_importtime(importtime(setup).stderr)}
+        
+        for name in names:
+            module = module_of(name)
+            result = importtime(f'{setup}; import {module}')
+            if result.returncode != 0:
+                error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'unknown error'
+                self.stdout.write(self.style.ERROR(f"{name} ({module}): import failed: {error}"))
+                continue
+            
+            rows = [row for row in parse_importtime(result.stderr) if row[2] not in baseline]
+            total = sum(self_us for self_us, _, _ in rows)
+            self.stdout.write(self.style.SUCCESS(f"{name} ({module}): {total / 1000:.1f} ms, {len(rows)} modules"))
+            for self_us, cumulative_us, mod in sorted(rows, key=lambda row: row[1], reverse=True)[:options['top']]:
+                self.stdout.write(f"  {cumulative_us / 1000:9.1f} ms cumulative  {self_us / 1000:8.1f} ms self  {mod}")
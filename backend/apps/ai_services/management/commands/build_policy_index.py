@@ -0,0 +1,28 @@
+import os
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from apps.ai_services.federated import split_by_department
+from apps.ai_services.policies import POLICY_DOCUMENTS
+from apps.ai_services.vector_store import VectorStoreRetriever
+
+
+class Command(BaseCommand):
+    help = 'Embed the policy corpus and save it as a memory-mapped vector index, plus one shard per department'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default=settings.AI_POLICY_INDEX_DIR)
+        parser.add_argument('--shard-path', default=settings.AI_POLICY_SHARD_DIR)
+    
+    def handle(self, *args, **options):
+        retriever = VectorStoreRetriever()
+        retriever.index_documents(POLICY_DOCUMENTS)
+        generation = retriever.save(options['path'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Saved {len(retriever.store)} documents to {options['path']} (generation {generation})"
+        ))
+        
+        for department, documents in sorted(split_by_department(POLICY_DOCUMENTS).items()):
+            shard = VectorStoreRetriever(retriever.embedder)
+            shard.index_documents(documents)
+            shard.save(os.path.join(options['shard_path'], department))
+            self.stdout.write(f"  {department}: {len(documents)} documents")
@@ -0,0 +1,32 @@
+"""
+Government service policy corpus
+Shared by the classifier's policy graph and the default RAG retriever.
+"""
+
+POLICY_DOCUMENTS = [
+    {
+        "id": "policy_land",
+        "text": "Land Record services include property registration, survey documents, and ownership verification. Requires property deed, survey number, and identity proof. Managed by Revenue Department.",
+        "metadata": {"department": "REVENUE"}
+    },
+    {
+        "id": "policy_police",
+        "text": "Police Verification services for character certificate, employment clearance, and passport verification. Requires identity proof, address proof, and purpose statement. Managed by Police Department.",
+        "metadata": {"department": "POLICE"}
+    },
+    {
+        "id": "policy_vehicle",
+        "text": "Vehicle Registration includes new registration, transfer of ownership, and RC renewal. Requires purchase invoice, insurance, pollution certificate. Managed by Transport Department.",
+        "metadata": {"department": "TRANSPORT"}
+    },
+    {
+        "id": "policy_building",
+        "text": "Building Permission for construction approval, plan sanction, and occupancy certificate. Requires site plan, structural design, and NOC. Managed by Municipal Corporation.",
+        "metadata": {"department": "MUNICIPAL"}
+    },
+    {
+        "id": "policy_ration",
+        "text": "Ration Card for food subsidy under Public Distribution System. Requires income proof, address proof, and family details. Managed by Food & Civil Supplies Department.",
+        "metadata": {"department": "CIVIL_SUPPLIES"}
+    }
+]
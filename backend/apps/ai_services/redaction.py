@@ -8,6 +8,7 @@ import PyPDF2
 from io import BytesIO
 from typing import Dict, List, Tuple
 from .agentic_rag import RouterAgent, GraderAgent, ValidatorAgent
+from apps.analytics.metrics import timed_stage
 
 
 class AgenticPIIDetector:
@@ -265,6 +266,7 @@ class AgenticPIIDetector:
             'total_pii_types': len(all_pii_types)
         }
     
+    @timed_stage('extraction')
     def _extract_text(self, pdf_file):
         """Extract text from PDF"""
         try:
@@ -1,11 +1,24 @@
 """
 Unit tests for AI services
 """
-from django.test import TestCase
-from .classification import DocumentClassifier
-from .redaction import PIIDetector
-from .agentic_rag import AgenticRAG, RouterAgent, GraderAgent, ValidatorAgent
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from django.test import TestCase, override_settings
+from .agentic_rag import AgenticRAGPipeline, GraderAgent, AgentDecision
+from . import backends, warmup
+from .policies import POLICY_DOCUMENTS
+from .answer_cache import SemanticAnswerCache
+from .embedding_batcher import MicroBatcher
+from .federated import FederatedRetriever, departments_for_services, split_by_department
+from .index_registry import IndexRegistry
+from .faiss_index import IncrementalFAISSIndex
+from .embedding_cache import EmbeddingCache
+from .vector_store import HashingEmbedder, VectorStore, VectorStoreRetriever, current_generation
+import numpy as np
 import tempfile
+import threading
+import time
+import json
 import os
 
 
@@ -13,6 +26,8 @@ class DocumentClassifierTests(TestCase):
     """Test document classification"""
     
     def setUp(self):
+        # Imported here so the other suites still load when these fail to
+        from .classification import DocumentClassifier
         self.classifier = DocumentClassifier()
     
     def test_classify_revenue_document(self):
@@ -49,6 +64,7 @@ class PIIDetectorTests(TestCase):
     """Test PII detection and redaction"""
     
     def setUp(self):
+        from .redaction import PIIDetector
         self.detector = PIIDetector()
     
     def test_detect_phone_number(self):
@@ -87,6 +103,7 @@ class AgenticRAGTests(TestCase):
     """Test Agentic RAG system"""
     
     def setUp(self):
+        from .agentic_rag import AgenticRAG, RouterAgent, ValidatorAgent
         self.rag = AgenticRAG()
         self.router = RouterAgent()
         self.grader = GraderAgent()
@@ -135,3 +152,572 @@ class AgenticRAGTests(TestCase):
         sources = ["Tax is a government levy", "Financial obligations to state"]
         is_valid = self.validator.validate(query, answer, sources)
         self.assertFalse(is_valid)
+
+
+LAND_QUERY = "Application for land property registration with survey number and ownership verification documents"
+
+
+class AgenticRAGPipelineTests(TestCase):
+    """Test retrieval grading and the end-to-end pipeline over the policy corpus"""
+    
+    def setUp(self):
+        self.retriever = VectorStoreRetriever()
+        self.retriever.index_documents(POLICY_DOCUMENTS)
+    
+    def test_grader_uses_retriever_score(self):
+        """Test a land-registration query keeps only the land policy"""
+        result = GraderAgent().grade_chunks(LAND_QUERY, self.retriever.search(LAND_QUERY, 5))
+        self.assertEqual(result.decision, AgentDecision.PROCEED)
+        self.assertEqual([chunk['id'] for chunk in result.data['relevant_chunks']], ['policy_land'])
+    
+    def test_grader_rejects_unrelated_chunks(self):
+        """Test low-similarity chunks send the pipeline back to retry"""
+        query = "weather forecast for sports news tomorrow please"
+        result = GraderAgent().grade_chunks(query, self.retriever.search(query, 5))
+        self.assertEqual(result.decision, AgentDecision.RETRY)
+    
+    def test_land_registration_query_is_answered(self):
+        """Test the pipeline answers from the land policy instead of failing retrieval"""
+        answer = AgenticRAGPipeline(vector_db=self.retriever).process(LAND_QUERY)
+        self.assertNotEqual(answer['pipeline'], 'failed_retrieval')
+        self.assertEqual([source['id'] for source in answer['sources']], ['policy_land'])
+
+
+class VectorStoreTests(TestCase):
+    """Test the in-process vector store"""
+    
+    def setUp(self):
+        self.store = VectorStore(2)
+        self.store.add(['a', 'b', 'c'], ['A', 'B', 'C'], [[1, 0], [0.8, 0.6], [0, 1]])
+    
+    def test_search_returns_top_k_best_first(self):
+        """Test results are ordered by cosine similarity and cut at top_k"""
+        hits = self.store.search([1, 0], top_k=2)
+        self.assertEqual([hit['id'] for hit in hits], ['a', 'b'])
+        self.assertAlmostEqual(hits[0]['score'], 1.0, places=5)
+        self.assertAlmostEqual(hits[1]['score'], 0.8, places=5)
+        self.assertEqual(len(self.store.search([1, 0], top_k=10)), 3)
+        self.assertEqual(VectorStore(2).search([1, 0]), [])
+    
+    def test_add_replaces_existing_ids(self):
+        """Test re-adding an id replaces its row and bumps the version"""
+        version = self.store.version
+        self.store.add(['a'], ['A2'], [[0, 1]])
+        self.assertEqual(len(self.store), 3)
+        self.assertGreater(self.store.version, version)
+        self.assertEqual(self.store.texts[self.store.ids.index('a')], 'A2')
+    
+    def test_delete_removes_rows(self):
+        """Test deleted ids are no longer returned"""
+        self.store.delete(['a', 'missing'])
+        self.assertEqual(self.store.ids, ['b', 'c'])
+        self.assertEqual(self.store.search([1, 0], top_k=1)[0]['id'], 'b')
+
+
+class VectorStoreGenerationTests(TestCase):
+    """Test saving indexes as generations and memory-mapping them on load"""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = self.tmp.name
+        self.retriever = VectorStoreRetriever()
+        self.retriever.index_documents(POLICY_DOCUMENTS)
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_load_maps_saved_index(self):
+        """Test a loaded index is read-only mapped and searches like the original"""
+        self.retriever.save(self.path)
+        loaded = VectorStoreRetriever.load(self.path)
+        self.assertIsInstance(loaded.store.vectors, np.memmap)
+        self.assertFalse(loaded.store.vectors.flags.writeable)
+        self.assertEqual(loaded.version, self.retriever.version)
+        self.assertEqual(
+            [hit['id'] for hit in loaded.search(LAND_QUERY)],
+            [hit['id'] for hit in self.retriever.search(LAND_QUERY)]
+        )
+    
+    def test_save_publishes_new_generation(self):
+        """Test each save moves CURRENT and only the newest two generations are kept"""
+        generations = [self.retriever.save(self.path) for _ in range(3)]
+        self.assertEqual(current_generation(self.path), os.path.join(self.path, generations[-1]))
+        kept = sorted(entry for entry in os.listdir(self.path) if os.path.isdir(os.path.join(self.path, entry)))
+        self.assertEqual(kept, sorted(generations[-2:]))
+    
+    def test_load_rejects_missing_or_mismatched_index(self):
+        """Test nothing saved raises FileNotFoundError and another embedder raises ValueError"""
+        with self.assertRaises(FileNotFoundError):
+            VectorStoreRetriever.load(self.path)
+        self.retriever.save(self.path)
+        with self.assertRaises(ValueError):
+            VectorStoreRetriever.load(self.path, HashingEmbedder(dim=64))
+
+
+class EmbeddingCacheTests(TestCase):
+    """Test the persistent embedding cache"""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = EmbeddingCache(os.path.join(self.tmp.name, 'embeddings.sqlite3'))
+        self.computed = []
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def compute(self, texts):
+        self.computed.append(list(texts))
+        return [[float(len(text)), 0.5] for text in texts]
+    
+    def test_only_missing_texts_are_computed(self):
+        """Test cached texts skip the model and duplicates are computed once"""
+        first = self.cache.embed('model-a', ['alpha', 'beta', 'alpha'], self.compute)
+        second = self.cache.embed('model-a', ['beta', 'gamma'], self.compute)
+        self.assertEqual(self.computed, [['alpha', 'beta'], ['gamma']])
+        self.assertEqual(first[0], first[2])
+        self.assertEqual(second[0], first[1])
+    
+    def test_entries_are_keyed_by_model(self):
+        """Test the same text under another model is computed again"""
+        self.cache.embed('model-a', ['alpha'], self.compute)
+        self.cache.embed('model-b', ['alpha'], self.compute)
+        self.assertEqual(self.computed, [['alpha'], ['alpha']])
+    
+    def test_cached_vectors_match_first_run(self):
+        """Test vectors round through float16 on the first run too"""
+        compute = lambda texts: [[0.1234567, 1 / 3] for _ in texts]
+        first = self.cache.embed('model-a', ['alpha'], compute)
+        cached = self.cache.embed('model-a', ['alpha'], compute)
+        self.assertEqual(first, cached)
+
+
+class MicroBatcherTests(TestCase):
+    """Test coalescing of concurrent embed calls"""
+    
+    def setUp(self):
+        self.calls = []
+    
+    def compute(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(text))] for text in texts]
+    
+    def test_waiting_requests_share_one_call(self):
+        """Test requests queued within max_wait are embedded together, each getting its slice"""
+        batcher = MicroBatcher(self.compute, max_wait_ms=200)
+        futures = [batcher.submit(texts) for texts in (['a'], ['bb', 'ccc'], ['dddd'])]
+        results = [future.result(timeout=5) for future in futures]
+        self.assertEqual(self.calls, [['a', 'bb', 'ccc', 'dddd']])
+        self.assertEqual(results, [[[1.0]], [[2.0], [3.0]], [[4.0]]])
+    
+    def test_batches_stop_at_max_batch_size(self):
+        """Test a full batch is sent without waiting for more requests"""
+        batcher = MicroBatcher(self.compute, max_batch_size=2, max_wait_ms=200)
+        futures = [batcher.submit([text]) for text in ('a', 'b', 'c')]
+        for future in futures:
+            future.result(timeout=5)
+        self.assertEqual(self.calls, [['a', 'b'], ['c']])
+    
+    def test_compute_error_reaches_every_caller(self):
+        """Test a failed batch raises in each waiting caller and the worker keeps serving"""
+        def compute(texts):
+            if 'bad' in texts:
+                raise RuntimeError('model failed')
+            return self.compute(texts)
+        
+        batcher = MicroBatcher(compute, max_wait_ms=200)
+        futures = [batcher.submit(['ok']), batcher.submit(['bad'])]
+        for future in futures:
+            with self.assertRaises(RuntimeError):
+                future.result(timeout=5)
+        self.assertEqual(batcher.embed(['ok'], timeout=5), [[2.0]])
+
+
+class BackendRegistryTests(TestCase):
+    """Test lazy, process-wide backend instances"""
+    
+    def setUp(self):
+        patcher = mock.patch.dict(backends.BACKENDS, {'test_embedder': 'apps.ai_services.vector_store.HashingEmbedder'})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(backends._instances.pop, 'test_embedder', None)
+    
+    def test_backend_is_built_once(self):
+        """Test concurrent first use builds a single shared instance"""
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            instances = list(pool.map(lambda _: backends.get_backend('test_embedder'), range(16)))
+        self.assertIsInstance(instances[0], HashingEmbedder)
+        self.assertTrue(all(instance is instances[0] for instance in instances))
+    
+    def test_unknown_backend_raises_key_error(self):
+        """Test names missing from BACKENDS are rejected"""
+        with self.assertRaises(KeyError):
+            backends.get_backend('no_such_backend')
+        self.assertEqual(backends.module_of('test_embedder'), 'apps.ai_services.vector_store')
+
+
+@override_settings(AI_WARMUP=True, AI_WARMUP_BACKENDS=[])
+class WarmupStateTests(TestCase):
+    """Test warm-up status and its effect on readiness"""
+    
+    def setUp(self):
+        patcher = mock.patch.dict(warmup._state, {'status': 'pending', 'error': None})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch(
+            'apps.analytics.health._dependency_state',
+            return_value={'status': 'healthy', 'database': 'connected'}
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def test_not_ready_until_warmed(self):
+        """Test readiness is unhealthy while warm-up is pending and healthy once done"""
+        from apps.analytics.health import readiness_state
+        self.assertFalse(warmup.warmup_state()['ready'])
+        self.assertEqual(readiness_state()['status'], 'unhealthy')
+        
+        warmup.warm_up()
+        self.assertEqual(warmup.warmup_state(), {'status': 'done', 'error': None, 'ready': True})
+        self.assertEqual(readiness_state(), {'status': 'healthy', 'database': 'connected', 'warmup': 'done'})
+    
+    def test_failed_warm_up_still_serves(self):
+        """Test a failed warm-up reports its error but does not block readiness"""
+        warmup.warm_up(backends=['no_such_backend'])
+        state = warmup.warmup_state()
+        self.assertEqual(state['status'], 'failed')
+        self.assertTrue(state['ready'])
+    
+    @override_settings(AI_WARMUP=False)
+    def test_disabled_warm_up_is_ready(self):
+        """Test readiness ignores warm-up when AI_WARMUP is off"""
+        self.assertEqual(warmup.warmup_state(), {'status': 'disabled', 'ready': True})
+
+
+class SemanticAnswerCacheTests(TestCase):
+    """Test exact and semantic answer caching"""
+    
+    VECTORS = {
+        'land registration documents': [1.0, 0.0, 0.0],
+        'documents for land registration': [0.98, 0.2, 0.0],
+        'ration card': [0.0, 1.0, 0.0],
+        'vehicle transfer': [0.0, 0.0, 1.0],
+    }
+    
+    def setUp(self):
+        self.computed = []
+    
+    def make_cache(self, **kwargs):
+        return SemanticAnswerCache(embed=lambda query: self.VECTORS[query.lower().strip('?')], **kwargs)
+    
+    def compute(self, query, **answer):
+        def compute():
+            self.computed.append(query)
+            return {'answer': f'About {query}', 'confidence': 0.8, 'sources': [{'id': query}], **answer}
+        return compute
+    
+    def test_exact_hit_on_normalised_query(self):
+        """Test case and punctuation variants of a query are exact hits"""
+        cache = self.make_cache()
+        cache.get_or_compute('land registration documents', 1, self.compute('land'))
+        answer = cache.get_or_compute('Land registration documents?', 1, self.compute('land'))
+        self.assertEqual(answer['cache_hit'], 'exact')
+        self.assertEqual(self.computed, ['land'])
+    
+    def test_semantic_hit_on_similar_query(self):
+        """Test a rephrasing above the threshold reuses the answer, an unrelated query does not"""
+        cache = self.make_cache()
+        cache.get_or_compute('land registration documents', 1, self.compute('land'))
+        answer = cache.get_or_compute('documents for land registration', 1, self.compute('land again'))
+        self.assertEqual(answer['cache_hit'], 'semantic')
+        self.assertEqual(answer['answer'], 'About land')
+        cache.get_or_compute('ration card', 1, self.compute('ration'))
+        self.assertEqual(self.computed, ['land', 'ration'])
+    
+    def test_lru_eviction_reuses_slot(self):
+        """Test the least recently used entry is evicted and its vector no longer matches"""
+        cache = self.make_cache(max_entries=2)
+        cache.get_or_compute('land registration documents', 1, self.compute('land'))
+        cache.get_or_compute('ration card', 1, self.compute('ration'))
+        cache.get_or_compute('ration card', 1, self.compute('ration'))
+        cache.get_or_compute('vehicle transfer', 1, self.compute('vehicle'))
+        
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.stats['evictions'], 1)
+        self.assertEqual(sorted(key for key in cache._slot_keys if key), ['ration card', 'vehicle transfer'])
+        answer = cache.get_or_compute('documents for land registration', 1, self.compute('land again'))
+        self.assertNotIn('cache_hit', answer)
+        self.assertEqual(self.computed, ['land', 'ration', 'vehicle', 'land again'])
+    
+    def test_version_change_invalidates(self):
+        """Test answers cached against an older index version are dropped"""
+        cache = self.make_cache()
+        cache.get_or_compute('ration card', 1, self.compute('ration'))
+        answer = cache.get_or_compute('ration card', 2, self.compute('ration v2'))
+        self.assertNotIn('cache_hit', answer)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.get_or_compute('ration card', 2, self.compute('unused'))['answer'], 'About ration v2')
+    
+    def test_fallback_answers_are_not_cached(self):
+        """Test answers without sources (e.g. "not enough information") are recomputed"""
+        cache = self.make_cache()
+        fallback = self.compute('ration', answer="I don't have enough information to answer this question.", confidence=0.3, sources=[])
+        cache.get_or_compute('ration card', 1, fallback)
+        cache.get_or_compute('ration card', 1, fallback)
+        self.assertEqual(self.computed, ['ration', 'ration'])
+        self.assertEqual(len(cache), 0)
+    
+    def test_pipeline_answers_are_cached(self):
+        """Test a repeated pipeline query is served from the cache"""
+        retriever = VectorStoreRetriever()
+        retriever.index_documents(POLICY_DOCUMENTS)
+        pipeline = AgenticRAGPipeline(vector_db=retriever)
+        pipeline.process(LAND_QUERY)
+        self.assertEqual(pipeline.process(LAND_QUERY)['cache_hit'], 'exact')
+
+
+class IndexRegistryTests(TestCase):
+    """Test the byte-bounded LRU of loaded indexes"""
+    
+    SIZES = {'small': 30, 'medium': 50, 'large': 70}
+    
+    def setUp(self):
+        self.loads = []
+        self.query_engines = {}
+        self.registry = IndexRegistry(
+            loader=self.load,
+            max_bytes=100,
+            estimate_size=lambda index: index['bytes'],
+            on_evict=lambda name: self.query_engines.pop(name, None)
+        )
+    
+    def load(self, name):
+        if name not in self.SIZES:
+            raise FileNotFoundError(name)
+        self.loads.append(name)
+        self.query_engines[name] = f'engine-{name}'
+        return {'name': name, 'bytes': self.SIZES[name]}
+    
+    def test_evicts_least_recently_used_over_budget(self):
+        """Test loading past max_bytes evicts the least recently used index and its engine"""
+        self.registry.get('small')
+        self.registry.get('medium')
+        self.registry.get('small')
+        self.registry.get('large')
+        
+        self.assertEqual(self.registry.names(), ['small', 'large'])
+        self.assertEqual(self.registry.total_bytes, 100)
+        self.assertEqual(self.registry.stats['evictions'], 1)
+        self.assertNotIn('medium', self.query_engines)
+        self.assertIn('small', self.query_engines)
+    
+    def test_evicted_index_reloads_on_next_use(self):
+        """Test an evicted name is loaded again lazily, and hits do not reload"""
+        self.registry.get('medium')
+        self.registry.get('large')
+        self.assertNotIn('medium', self.registry)
+        
+        self.assertEqual(self.registry.get('medium')['name'], 'medium')
+        self.registry.get('medium')
+        self.assertEqual(self.loads, ['medium', 'large', 'medium'])
+        self.assertEqual(self.registry.stats['hits'], 1)
+    
+    def test_oversized_index_is_still_kept(self):
+        """Test the most recently used index stays resident even alone over budget"""
+        registry = IndexRegistry(self.load, max_bytes=10, estimate_size=lambda index: index['bytes'])
+        registry.get('small')
+        registry.get('large')
+        self.assertEqual(registry.names(), ['large'])
+    
+    def test_load_locks_are_released(self):
+        """Test per-name load locks are dropped after loads, including failed ones"""
+        self.registry.get('small')
+        with self.assertRaises(FileNotFoundError):
+            self.registry.get('missing')
+        self.assertEqual(self.registry._load_locks, {})
+    
+    def test_concurrent_loads_share_one_lock(self):
+        """Test callers waiting on a load reuse its lock instead of loading again"""
+        started = threading.Event()
+        release = threading.Event()
+        
+        def slow_load(name):
+            started.set()
+            release.wait(5)
+            return self.load(name)
+        
+        registry = IndexRegistry(slow_load, max_bytes=100, estimate_size=lambda index: index['bytes'])
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            first = pool.submit(registry.get, 'small')
+            started.wait(5)
+            waiters = [pool.submit(registry.get, 'small') for _ in range(2)]
+            while registry._load_locks['small'][1] < 3:
+                time.sleep(0.01)
+            release.set()
+            results = [future.result() for future in [first, *waiters]]
+        
+        self.assertEqual(self.loads, ['small'])
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(registry._load_locks, {})
+
+
+class FakeChunk:
+    """Document-like chunk (page_content and metadata)"""
+    
+    def __init__(self, text, **metadata):
+        self.page_content = text
+        self.metadata = metadata
+
+
+class FakeFAISS:
+    """In-memory stand-in for the LangChain FAISS store"""
+    
+    def __init__(self, embeddings, documents=None):
+        self.embeddings = embeddings
+        self.documents = dict(documents or {})
+    
+    @classmethod
+    def from_documents(cls, documents, embeddings, ids):
+        store = cls(embeddings)
+        store.add_documents(documents, ids=ids)
+        return store
+    
+    def add_documents(self, documents, ids):
+        self.embeddings.embed_documents([document.page_content for document in documents])
+        self.documents.update(zip(ids, (document.page_content for document in documents)))
+    
+    def delete(self, ids):
+        for chunk_id in ids:
+            del self.documents[chunk_id]
+    
+    def save_local(self, target):
+        with open(os.path.join(target, 'fake.json'), 'w') as handle:
+            json.dump(self.documents, handle)
+    
+    @classmethod
+    def load_local(cls, target, embeddings):
+        with open(os.path.join(target, 'fake.json')) as handle:
+            return cls(embeddings, json.load(handle))
+
+
+class FakeIncrementalIndex(IncrementalFAISSIndex):
+    def store_class(self):
+        return FakeFAISS
+
+
+class IncrementalFAISSIndexTests(TestCase):
+    """Test chunk diffing and persistence of the incremental FAISS index"""
+    
+    def setUp(self):
+        self.embeddings = mock.Mock()
+        self.index = FakeIncrementalIndex(self.embeddings)
+    
+    def test_upsert_embeds_only_changed_chunks(self):
+        """Test re-indexing a document adds new chunks and deletes vanished ones"""
+        self.assertEqual(self.index.upsert({'a': [FakeChunk('one'), FakeChunk('two')]}), 2)
+        self.assertEqual(self.index.upsert({'a': [FakeChunk('one'), FakeChunk('two')]}), 0)
+        self.assertEqual(self.index.version, 1)
+        
+        self.assertEqual(self.index.upsert({'a': [FakeChunk('one'), FakeChunk('three')]}), 1)
+        self.assertEqual(sorted(self.index.vectorstore.documents.values()), ['one', 'three'])
+        self.assertEqual(set(self.index.chunk_ids['a']), set(self.index.vectorstore.documents))
+        
+        self.index.delete(['a', 'unknown'])
+        self.assertEqual(self.index.chunk_ids, {})
+        self.assertEqual(self.index.vectorstore.documents, {})
+    
+    def test_failed_embedding_keeps_previous_chunks(self):
+        """Test a failed upsert leaves both the vectors and chunk_ids as they were"""
+        self.index.upsert({'a': [FakeChunk('one')]})
+        before = dict(self.index.chunk_ids)
+        
+        self.embeddings.embed_documents.side_effect = RuntimeError('model unavailable')
+        with self.assertRaises(RuntimeError):
+            self.index.upsert({'a': [FakeChunk('two')]})
+        self.assertEqual(self.index.chunk_ids, before)
+        self.assertEqual(list(self.index.vectorstore.documents.values()), ['one'])
+        
+        self.embeddings.embed_documents.side_effect = None
+        self.assertEqual(self.index.upsert({'a': [FakeChunk('two')]}), 1)
+        self.assertEqual(list(self.index.vectorstore.documents.values()), ['two'])
+    
+    def test_persist_and_load(self):
+        """Test a persisted index reloads with its chunk manifest"""
+        with tempfile.TemporaryDirectory() as path:
+            FakeIncrementalIndex(self.embeddings, path).upsert({'a': [FakeChunk('one')], 'b': [FakeChunk('two')]})
+            
+            reloaded = FakeIncrementalIndex(self.embeddings, path)
+            self.assertEqual(sorted(reloaded.vectorstore.documents.values()), ['one', 'two'])
+            self.assertEqual(reloaded.upsert({'a': [FakeChunk('one')]}), 0)
+            self.assertEqual(reloaded.upsert({'b': []}), 0)
+            self.assertEqual(FakeIncrementalIndex(self.embeddings, path).chunk_ids, {'a': reloaded.chunk_ids['a'], 'b': []})
+
+
+class FakeShard:
+    """Shard returning fixed chunks, best first"""
+    
+    def __init__(self, scores):
+        self.scores = scores
+    
+    def search(self, query, top_k=5):
+        return [{'id': chunk_id, 'text': chunk_id, 'score': score} for chunk_id, score in self.scores[:top_k]]
+
+
+class FederatedRetrieverTests(TestCase):
+    """Test fan-out over department shards"""
+    
+    def setUp(self):
+        self.single = VectorStoreRetriever()
+        self.single.index_documents(POLICY_DOCUMENTS)
+        embedder = HashingEmbedder()
+        shards = {}
+        for department, documents in split_by_department(POLICY_DOCUMENTS).items():
+            shards[department] = VectorStoreRetriever(embedder)
+            shards[department].index_documents(documents)
+        self.federated = FederatedRetriever(shards, embedder=embedder, normalize_scores=False)
+    
+    def test_shared_embedder_merges_like_one_index(self):
+        """Test raw cosine merging across shards matches searching the whole corpus"""
+        merged = self.federated.search(LAND_QUERY, top_k=3)
+        single = self.single.search(LAND_QUERY, top_k=3)
+        self.assertEqual([chunk['id'] for chunk in merged], [chunk['id'] for chunk in single])
+        self.assertEqual(merged[0]['shard'], 'REVENUE')
+        scores = [chunk['score'] for chunk in merged]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+    
+    def test_normalised_merge_orders_by_shard_relative_score(self):
+        """Test per-shard min-max scores decide the order, with raw score breaking ties"""
+        federated = FederatedRetriever({
+            'A': FakeShard([('a1', 0.9), ('a2', 0.5), ('a3', 0.1)]),
+            'B': FakeShard([('b1', 40.0), ('b2', 35.0), ('b3', 0.0)]),
+        })
+        merged = federated.search('query', top_k=4)
+        self.assertEqual([chunk['id'] for chunk in merged], ['b1', 'a1', 'b2', 'a2'])
+        self.assertEqual(merged[0]['raw_score'], 40.0)
+    
+    def test_departments_restrict_shards(self):
+        """Test service categories map to their departments' shards only"""
+        departments = departments_for_services(['LAND_RECORD', 'REVENUE_MUTATION'])
+        self.assertEqual(departments, {'REVENUE'})
+        chunks = self.federated.search(LAND_QUERY, departments=departments)
+        self.assertEqual({chunk['shard'] for chunk in chunks}, {'REVENUE'})
+    
+    def test_departments_without_shards_search_everything(self):
+        """Test HEALTH, EDUCATION and GENERAL (no policy shards) fall back to all shards"""
+        for categories in (['HEALTH_CERTIFICATE'], ['EDUCATION_CERTIFICATE'], ['OTHER'], ['UNKNOWN']):
+            departments = departments_for_services(categories)
+            self.assertEqual(self.federated.select(departments), list(self.federated.shards))
+        self.assertEqual(departments_for_services(['UNKNOWN']), {'GENERAL'})
+    
+    def test_pipeline_uses_configured_retriever(self):
+        """Test AI_POLICY_RETRIEVER selects the default retriever and service categories narrow it"""
+        with self.settings(AI_POLICY_RETRIEVER='single'):
+            self.assertIsInstance(AgenticRAGPipeline().vector_db, VectorStoreRetriever)
+        with self.settings(AI_POLICY_RETRIEVER='federated'):
+            pipeline = AgenticRAGPipeline()
+        self.assertIsInstance(pipeline.vector_db, FederatedRetriever)
+        
+        answer = pipeline.process(
+            "vehicle transfer of ownership with insurance",
+            {'service_categories': ['VEHICLE_REGISTRATION']}
+        )
+        self.assertEqual([(source['id'], source['shard']) for source in answer['sources']], [('policy_vehicle', 'TRANSPORT')])
@@ -0,0 +1,290 @@
+"""
+In-process vector store for RAG retrieval
+Embeddings are kept L2-normalised in one float32 matrix, so cosine
+similarity is a single matrix-vector product and top-k is an
+argpartition over the scores. Brute force, but well under a millisecond
+for a corpus the size of our policy documents.
+
+On disk an index is a directory of generations plus a CURRENT pointer:
+
+    <path>/CURRENT            name of the live generation
+    <path>/<gen>/vectors.npy  float32 matrix, memory-mapped read-only on load
+    <path>/<gen>/meta.json    ids, texts, metadata, embedding model
+
+Every worker that loads the index maps the same file pages, so the
+matrix is held once in the page cache however many processes serve it.
+This applies to VectorStore indexes only; the LangChain FAISS and
+LlamaIndex stores keep their own formats and a copy per worker.
+Saving writes a new generation and swaps CURRENT with os.replace, so
+readers never see a half-written index.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def normalize(matrix: np.ndarray) -> np.ndarray:
+    """Row-wise L2 normalisation (zero rows stay zero)"""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+def publish_generation(path: str, write: Callable[[str], None], keep: int = 2) -> str:
+    """
+    Write a new generation directory under path and atomically make it current
+    
+    Args:
+        path: Index directory
+        write: Called with the new (empty) generation directory to fill
+        keep: Generations to retain; older ones are removed
+    
+    Returns:
+        Name of the new generation
+    """
+    os.makedirs(path, exist_ok=True)
+    generation = f"{time.time_ns():x}-{os.getpid()}"
+    target = os.path.join(path, generation)
+    os.makedirs(target)
+    write(target)
+    
+    pointer = os.path.join(path, f'CURRENT.{generation}')
+    with open(pointer, 'w') as handle:
+        handle.write(generation)
+    os.replace(pointer, os.path.join(path, 'CURRENT'))
+    
+    # Mapped/open readers keep unlinked files alive, so pruning is safe
+    generations = sorted(
+        (entry for entry in os.listdir(path) if os.path.isdir(os.path.join(path, entry))),
+        key=lambda entry: int(entry.split('-')[0], 16)
+    )
+    for old in generations[:-keep]:
+        shutil.rmtree(os.path.join(path, old), ignore_errors=True)
+    return generation
+
+
+def current_generation(path: str) -> str:
+    """
+    Directory of the live generation under path
+    
+    Raises:
+        FileNotFoundError: if nothing has been published at path
+    """
+    with open(os.path.join(path, 'CURRENT')) as handle:
+        return os.path.join(path, handle.read().strip())
+
+
+class HashingEmbedder:
+    """
+    Default embedder with no model download: signed feature hashing of
+    word unigrams and bigrams. Stable across processes (blake2b, not
+    hash()), so vectors can be persisted. Lexical only - pass a
+    sentence-transformers backed embedder for semantic matching.
+    """
+    
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+        self.model_name = f"hashing-{dim}"
+    
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = TOKEN_PATTERN.findall(text.lower())
+            features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+            for feature in features:
+                bucket = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), 'little')
+                matrix[row, bucket % self.dim] += 1.0 if bucket >> 63 else -1.0
+        return matrix
+
+
+class VectorStore:
+    """
+    Normalised float32 vector matrix with parallel id/text/metadata arrays.
+    `version` increases on every change so caches keyed on it go stale.
+    """
+    
+    def __init__(self, dim: int):
+        self.dim = dim
+        self.vectors = np.empty((0, dim), dtype=np.float32)
+        self.ids: List[str] = []
+        self.texts: List[str] = []
+        self.metadatas: List[Dict] = []
+        self.version = 0
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    def add(self, ids: Sequence[str], texts: Sequence[str], vectors, metadatas: Optional[Sequence[Dict]] = None):
+        """Insert rows; ids that already exist are replaced"""
+        vectors = normalize(np.asarray(vectors, dtype=np.float32).reshape(len(ids), self.dim))
+        existing = set(ids) & set(self.ids)
+        if existing:
+            self.delete(existing)
+        
+        self.vectors = np.vstack([self.vectors, vectors])
+        self.ids.extend(ids)
+        self.texts.extend(texts)
+        self.metadatas.extend(metadatas or [{} for _ in ids])
+        self.version += 1
+    
+    def delete(self, ids):
+        ids = set(ids)
+        keep = [i for i, row_id in enumerate(self.ids) if row_id not in ids]
+        if len(keep) == len(self.ids):
+            return
+        self.vectors = self.vectors[keep]
+        self.ids = [self.ids[i] for i in keep]
+        self.texts = [self.texts[i] for i in keep]
+        self.metadatas = [self.metadatas[i] for i in keep]
+        self.version += 1
+    
+    def save(self, path: str, model_name: str = None) -> str:
+        """
+        Persist as a new generation and make it current
+        
+        Args:
+            path: Index directory
+            model_name: Embedding model the vectors came from (checked on load)
+        
+        Returns:
+            Name of the new generation
+        """
+        def write(target):
+            np.save(os.path.join(target, 'vectors.npy'), np.ascontiguousarray(self.vectors, dtype=np.float32))
+            with open(os.path.join(target, 'meta.json'), 'w') as handle:
+                json.dump({
+                    'dim': self.dim,
+                    'model': model_name,
+                    'version': self.version,
+                    'ids': self.ids,
+                    'texts': self.texts,
+                    'metadatas': self.metadatas,
+                }, handle, separators=(',', ':'))
+        return publish_generation(path, write)
+    
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> Tuple['VectorStore', Optional[str]]:
+        """
+        Open the current generation of a saved index
+        
+        Returns:
+            (store, embedding model name recorded at save time)
+        
+        Raises:
+            FileNotFoundError: if nothing has been saved at path
+        """
+        target = current_generation(path)
+        with open(os.path.join(target, 'meta.json')) as handle:
+            meta = json.load(handle)
+        
+        store = cls(meta['dim'])
+        # mmap_mode='r': pages are shared and never written; add/delete
+        # build a fresh in-memory matrix instead of touching the mapping
+        store.vectors = np.load(os.path.join(target, 'vectors.npy'), mmap_mode='r' if mmap else None)
+        store.ids = meta['ids']
+        store.texts = meta['texts']
+        store.metadatas = meta['metadatas']
+        store.version = meta['version']
+        return store, meta['model']
+    
+    def search(self, query_vector, top_k: int = 5) -> List[Dict]:
+        """Top-k rows by cosine similarity, best first"""
+        if not len(self) or top_k <= 0:
+            return []
+        
+        scores = self.vectors @ normalize(np.asarray(query_vector, dtype=np.float32).reshape(self.dim))
+        k = min(top_k, len(scores))
+        # O(n) selection of the k best, then sort only those k
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        
+        return [
+            {
+                "id": self.ids[i],
+                "text": self.texts[i],
+                "score": float(scores[i]),
+                "metadata": self.metadatas[i]
+            }
+            for i in top
+        ]
+
+
+class VectorStoreRetriever:
+    """Embedder + VectorStore: index documents and search by query text"""
+    
+    def __init__(self, embedder=None, store: Optional[VectorStore] = None):
+        self.embedder = embedder or HashingEmbedder()
+        self.store = store or VectorStore(self.embedder.dim)
+    
+    @property
+    def version(self) -> int:
+        return self.store.version
+    
+    def index_documents(self, documents: List[Dict]):
+        """
+        Add or replace documents
+        
+        Args:
+            documents: List of dicts with 'id', 'text' and optional 'metadata'
+        """
+        if not documents:
+            return
+        self.store.add(
+            [doc['id'] for doc in documents],
+            [doc['text'] for doc in documents],
+            self.embedder.embed([doc['text'] for doc in documents]),
+            [doc.get('metadata', {}) for doc in documents]
+        )
+    
+    def delete_documents(self, ids: Sequence[str]):
+        self.store.delete(ids)
+    
+    def search(self, query: str, top_k: int = 5) -> List[Dict]:
+        return self.store.search(self.embedder.embed([query])[0], top_k)
+    
+    def save(self, path: str) -> str:
+        return self.store.save(path, model_name=self.embedder.model_name)
+    
+    @classmethod
+    def load(cls, path: str, embedder=None) -> 'VectorStoreRetriever':
+        """
+        Memory-map a saved index
+        
+        Raises:
+            FileNotFoundError: if nothing has been saved at path
+            ValueError: if it was built with a different embedding model
+        """
+        embedder = embedder or HashingEmbedder()
+        store, model_name = VectorStore.load(path)
+        if model_name != embedder.model_name:
+            raise ValueError(f"Index at {path} was built with {model_name}, not {embedder.model_name}")
+        return cls(embedder, store)
+
+
+@lru_cache(maxsize=None)
+def policy_retriever() -> VectorStoreRetriever:
+    """
+    Process-wide retriever over the policy corpus (read-only after build).
+    Maps the index saved by `manage.py build_policy_index` when there is
+    one, otherwise builds it in memory.
+    """
+    from django.conf import settings
+    try:
+        return VectorStoreRetriever.load(settings.AI_POLICY_INDEX_DIR)
+    except (FileNotFoundError, ValueError):
+        from .policies import POLICY_DOCUMENTS
+        retriever = VectorStoreRetriever()
+        retriever.index_documents(POLICY_DOCUMENTS)
+        return retriever
+
+
+__all__ = ['HashingEmbedder', 'VectorStore', 'VectorStoreRetriever', 'policy_retriever', 'publish_generation', 'current_generation']
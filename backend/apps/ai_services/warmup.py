@@ -0,0 +1,66 @@
+"""
+Opt-in warm-up of read-only AI assets (settings.AI_WARMUP)
+Builds the backends in AI_WARMUP_BACKENDS and the policy retriever, so
+no request pays for loading models, building the policy graph or
+compiling patterns.
+
+Under gunicorn with preload_app (see gunicorn.conf.py) this runs once in
+the master before workers fork, and the workers share the loaded objects
+copy-on-write. Afterwards the master's DB connections are closed, so no
+socket is shared across the fork, and gc.freeze() moves the loaded
+objects out of the collector's reach, so collections in the workers
+don't touch (and copy) their pages. Batcher threads and SQLite
+connections are per process already. Backends that run torch should
+not be warmed in the master: its thread pools are not fork-safe.
+
+Without preload, each worker warms up in a background thread; readiness
+reports 503 until that finishes.
+"""
+
+import gc
+import logging
+import threading
+from django.conf import settings
+from django.db import connections
+from .backends import get_backend
+
+logger = logging.getLogger(__name__)
+
+_state = {'status': 'pending', 'error': None}
+
+
+def warm_up(backends=None):
+    """Load AI assets in this process (blocking)"""
+    _state['status'] = 'running'
+    try:
+        from .federated import configured_policy_retriever
+        for name in backends or settings.AI_WARMUP_BACKENDS:
+            get_backend(name)
+        configured_policy_retriever()
+    except Exception as e:
+        # Serve anyway: backends not loaded here load on first use
+        logger.exception('AI warm-up failed')
+        _state.update(status='failed', error=str(e))
+    else:
+        _state['status'] = 'done'
+
+
+def warm_up_before_fork():
+    """Warm up in the gunicorn master, then make the result fork-friendly"""
+    warm_up()
+    connections.close_all()
+    gc.freeze()
+
+
+def start_background_warm_up():
+    threading.Thread(target=warm_up, daemon=True, name='ai-warmup').start()
+
+
+def warmup_state() -> dict:
+    """Warm-up status; 'ready' is True when disabled, done or failed"""
+    if not settings.AI_WARMUP:
+        return {'status': 'disabled', 'ready': True}
+    return {**_state, 'ready': _state['status'] in ('done', 'failed')}
+
+
+__all__ = ['warm_up', 'warm_up_before_fork', 'start_background_warm_up', 'warmup_state']
@@ -0,0 +1,62 @@
+"""
+Stale-while-revalidate cache for the admin dashboard payload.
+Within the soft TTL the cached payload is served as is. Between the soft and
+hard TTL the stale payload is still served while exactly one worker (the one
+that wins the lock) recomputes it. After the hard TTL the entry is gone and
+the payload is recomputed in line; callers arriving while another worker
+holds the lock wait for its result only briefly before computing it too.
+"""
+
+import time
+import uuid
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from .services import build_dashboard_payload
+
+DASHBOARD_CACHE_KEY = 'analytics:dashboard'
+DASHBOARD_LOCK_KEY = 'analytics:dashboard:lock'
+
+
+def _recompute() -> dict:
+    entry = {
+        'payload': build_dashboard_payload(),
+        'as_of': timezone.now().isoformat(),
+        'fresh_until': time.time() + settings.ANALYTICS_DASHBOARD_SOFT_TTL,
+    }
+    cache.set(DASHBOARD_CACHE_KEY, entry, settings.ANALYTICS_DASHBOARD_HARD_TTL)
+    return entry
+
+
+def _recompute_locked():
+    """Recompute if this caller wins the lock; None if another worker holds it"""
+    token = uuid.uuid4().hex
+    if not cache.add(DASHBOARD_LOCK_KEY, token, settings.ANALYTICS_DASHBOARD_LOCK_TIMEOUT):
+        return None
+    try:
+        return _recompute()
+    finally:
+        # A recompute that outlived the lock timeout must not release the
+        # lock a later worker has since taken
+        if cache.get(DASHBOARD_LOCK_KEY) == token:
+            cache.delete(DASHBOARD_LOCK_KEY)
+
+
+def get_dashboard_payload() -> dict:
+    """Dashboard payload with an `as_of` timestamp of when it was computed"""
+    entry = cache.get(DASHBOARD_CACHE_KEY)
+    
+    if entry is None:
+        # Cold: one worker computes, the rest wait briefly for its result
+        entry = _recompute_locked()
+        deadline = time.monotonic() + settings.ANALYTICS_DASHBOARD_COLD_WAIT
+        while entry is None and time.monotonic() < deadline:
+            time.sleep(0.05)
+            entry = cache.get(DASHBOARD_CACHE_KEY)
+        if entry is None:
+            entry = _recompute()
+    elif time.time() >= entry['fresh_until']:
+        # Stale: serve what we have unless we are the one refreshing it
+        entry = _recompute_locked() or entry
+    
+    return {**entry['payload'], 'as_of': entry['as_of']}
@@ -0,0 +1,61 @@
+"""
+Streaming exports for audits
+Rows are read through server-side cursors (iterator(chunk_size=...)) and
+rendered one at a time, so memory stays flat however many rows there are.
+Only non-identifying columns are exported: no citizen data, no tokens and
+no officer usernames/emails.
+"""
+
+import csv
+import json
+from django.conf import settings
+from config.db_router import replica_alias
+from apps.applications.models import Application, ApplicationTransition
+from apps.officers.models import Officer
+
+EXPORT_FORMATS = ('csv', 'ndjson')
+
+# dataset -> (model, exported columns)
+EXPORT_DATASETS = {
+    'applications': (Application, (
+        'id', 'service_category', 'status', 'assigned_officer_id',
+        'created_at', 'updated_at', 'status_changed_at',
+    )),
+    'officers': (Officer, (
+        'id', 'department', 'hierarchy_level', 'workload_count', 'is_active',
+    )),
+    'transitions': (ApplicationTransition, (
+        'id', 'application_id', 'from_status', 'to_status',
+        'from_officer_id', 'to_officer_id', 'created_at',
+    )),
+}
+
+
+class _Echo:
+    """File-like object whose write() returns the value, for csv.writer streaming"""
+    def write(self, value):
+        return value
+
+
+def _rows(dataset: str, chunk_size: int = None):
+    model, columns = EXPORT_DATASETS[dataset]
+    return columns, model.objects.using(replica_alias()).order_by('id').values_list(*columns).iterator(
+        chunk_size=chunk_size or settings.EXPORT_CHUNK_SIZE
+    )
+
+
+def _serialize(value):
+    return value.isoformat() if hasattr(value, 'isoformat') else value
+
+
+def stream_export(dataset: str, export_format: str, chunk_size: int = None):
+    """Yield the export of a dataset as CSV lines or NDJSON records"""
+    columns, rows = _rows(dataset, chunk_size)
+    if export_format == 'csv':
+        writer = csv.writer(_Echo())
+        yield writer.writerow(columns)
+        for row in rows:
+            yield writer.writerow([_serialize(value) for value in row])
+    else:
+        for row in rows:
+            yield json.dumps({column: _serialize(value) for column, value in zip(columns, row)}) + '\n'
@@ -0,0 +1,84 @@
+"""
+Readiness checks for load balancers and orchestrators
+Every probe reuses pooled connections (Django's persistent DB connection,
+django-redis' pool, one module-level broker client) and the combined
+result is cached in-process for HEALTH_READINESS_TTL seconds, so probe
+traffic costs at most one round of checks per worker per interval.
+"""
+
+import threading
+import time
+import redis
+from django.conf import settings
+from django.db import connection
+from django_redis import get_redis_connection
+from apps.ai_services.warmup import warmup_state
+
+_lock = threading.Lock()
+_cached = {'expires': 0.0, 'state': None}
+_broker = None
+
+
+def check_database() -> str:
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        return 'connected'
+    except Exception as e:
+        return f'error: {e}'
+
+
+def check_redis() -> str:
+    try:
+        get_redis_connection('default').ping()
+        return 'connected'
+    except NotImplementedError:
+        # Cache backend is not Redis (e.g. LocMemCache in tests)
+        return 'not_configured'
+    except Exception as e:
+        return f'unavailable: {e}'
+
+
+def celery_queue_depth():
+    """Pending messages per Celery queue (Redis broker keeps each queue as a list)"""
+    global _broker
+    try:
+        if _broker is None:
+            _broker = redis.Redis.from_url(settings.CELERY_BROKER_URL, socket_timeout=1)
+        return {queue: _broker.llen(queue) for queue in settings.HEALTH_CELERY_QUEUES}
+    except Exception as e:
+        return {'error': str(e)}
+
+
+def _collect() -> dict:
+    database = check_database()
+    return {
+        'status': 'healthy' if database == 'connected' else 'unhealthy',
+        'database': database,
+        # Redis down degrades caching but does not stop serving
+        'redis': check_redis(),
+        'celery_queues': celery_queue_depth(),
+    }
+
+
+def _dependency_state() -> dict:
+    """Dependency state, recomputed at most once per HEALTH_READINESS_TTL"""
+    now = time.monotonic()
+    if _cached['state'] is not None and now < _cached['expires']:
+        return _cached['state']
+    
+    with _lock:
+        # Another thread may have refreshed while we waited
+        if _cached['state'] is None or time.monotonic() >= _cached['expires']:
+            _cached['state'] = _collect()
+            _cached['expires'] = time.monotonic() + settings.HEALTH_READINESS_TTL
+        return _cached['state']
+
+
+def readiness_state() -> dict:
+    """Cached dependency state plus live AI warm-up status (not ready until warmed)"""
+    state = _dependency_state()
+    warmup = warmup_state()
+    if warmup['ready']:
+        return {**state, 'warmup': warmup['status']}
+    return {**state, 'status': 'unhealthy', 'warmup': warmup['status']}
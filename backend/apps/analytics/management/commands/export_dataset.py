@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from apps.analytics.exports import stream_export, EXPORT_DATASETS, EXPORT_FORMATS
+
+
+class Command(BaseCommand):
+    help = 'Stream a PII-free export of applications, officers or transitions as CSV or NDJSON'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=sorted(EXPORT_DATASETS))
+        parser.add_argument('--format', dest='export_format', choices=EXPORT_FORMATS, default='csv')
+        parser.add_argument('--output', help='File to write (default: stdout)')
+        parser.add_argument('--chunk-size', type=int, default=None)
+    
+    def handle(self, *args, **options):
+        chunks = stream_export(options['dataset'], options['export_format'], options['chunk_size'])
+        if options['output']:
+            with open(options['output'], 'w', newline='') as handle:
+                handle.writelines(chunks)
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
@@ -0,0 +1,140 @@
+from collections import Counter
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from apps.applications.models import Application, ApplicationTransition
+from apps.applications.outbox import dispatch_all
+from apps.analytics.models import ApplicationDailyRollup, OfficerStatusRollup, StatusFlowBucket, StatusDwellBucket
+from apps.analytics.rollups import OUTBOX_HANDLER, department_for, rollup_deltas
+
+
+class Command(BaseCommand):
+    help = 'Recompute analytics rollups from the applications and transitions tables'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Only compare the stored rollups with a fresh recomputation; exit non-zero on drift'
+        )
+        parser.add_argument(
+            '--if-empty',
+            action='store_true',
+            help='Backfill only when the rollup tables are empty (safe to run on every deploy)'
+        )
+    
+    def handle(self, *args, **options):
+        if options['check']:
+            self._check(*self._application_buckets(), *self._transition_buckets())
+            return
+        
+        with transaction.atomic():
+            self._lock_outbox()
+            if options['if_empty'] and (
+                ApplicationDailyRollup.objects.exists() or OfficerStatusRollup.objects.exists()
+            ):
+                self.stdout.write('Rollups already populated; nothing to backfill')
+                return
+            
+            # Pending transitions are already reflected in the tables read
+            # below; hand them to the other consumers only, or the rollup
+            # handler would apply them a second time after the rebuild
+            drained = dispatch_all(exclude=[OUTBOX_HANDLER])
+            application_buckets, officer_buckets = self._application_buckets()
+            flow_buckets, dwell_buckets = self._transition_buckets()
+            
+            for model in (ApplicationDailyRollup, OfficerStatusRollup, StatusFlowBucket, StatusDwellBucket):
+                model.objects.all().delete()
+            ApplicationDailyRollup.objects.bulk_create([
+                ApplicationDailyRollup(day=day, status=status, service_category=category, department=department, count=count)
+                for (day, status, category, department), count in application_buckets.items()
+            ], batch_size=1000)
+            OfficerStatusRollup.objects.bulk_create([
+                OfficerStatusRollup(officer_id=officer_id, status=status, count=count)
+                for (officer_id, status), count in officer_buckets.items()
+            ], batch_size=1000)
+            StatusFlowBucket.objects.bulk_create([
+                StatusFlowBucket(hour=hour, status=status, entered=count)
+                for (hour, status), count in flow_buckets.items()
+            ], batch_size=1000)
+            StatusDwellBucket.objects.bulk_create([
+                StatusDwellBucket(hour=hour, status=status, bin=bin_index, count=count)
+                for (hour, status, bin_index), count in dwell_buckets.items()
+            ], batch_size=1000)
+        
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {len(application_buckets)} application, {len(officer_buckets)} officer, '
+            f'{len(flow_buckets)} flow and {len(dwell_buckets)} dwell buckets '
+            f'({drained} pending transitions drained)'
+        ))
+    
+    def _lock_outbox(self):
+        """
+        Block transition writes and outbox dispatch until the rebuild commits,
+        so every transition is counted exactly once: either it is committed
+        (and drained here) or it is dispatched after the rebuild
+        """
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(f'LOCK TABLE {ApplicationTransition._meta.db_table} IN EXCLUSIVE MODE')
+    
+    def _application_buckets(self):
+        """Daily and officer buckets from the current applications"""
+        application_buckets = Counter()
+        for row in Application.objects.values(
+            'status', 'service_category', day=TruncDate('created_at')
+        ).annotate(count=Count('id')):
+            key = (row['day'], row['status'], row['service_category'], department_for(row['service_category']))
+            application_buckets[key] += row['count']
+        
+        officer_buckets = Counter({
+            (row['assigned_officer_id'], row['status']): row['count']
+            for row in Application.objects.filter(assigned_officer__isnull=False)
+            .values('assigned_officer_id', 'status').annotate(count=Count('id'))
+        })
+        return application_buckets, officer_buckets
+    
+    def _transition_buckets(self):
+        """Flow and dwell buckets replayed from the transition log"""
+        _, _, flow_buckets, dwell_buckets = rollup_deltas(
+            transition.states()
+            for transition in ApplicationTransition.objects.order_by('id').iterator(chunk_size=2000)
+        )
+        return +flow_buckets, +dwell_buckets
+    
+    def _check(self, application_buckets, officer_buckets, flow_buckets, dwell_buckets):
+        stored = {
+            'application': Counter({
+                (row.day, row.status, row.service_category, row.department): row.count
+                for row in ApplicationDailyRollup.objects.exclude(count=0)
+            }),
+            'officer': Counter({
+                (row.officer_id, row.status): row.count
+                for row in OfficerStatusRollup.objects.exclude(count=0)
+            }),
+            'flow': Counter({
+                (row.hour, row.status): row.entered
+                for row in StatusFlowBucket.objects.exclude(entered=0)
+            }),
+            'dwell': Counter({
+                (row.hour, row.status, row.bin): row.count
+                for row in StatusDwellBucket.objects.exclude(count=0)
+            }),
+        }
+        
+        drift = 0
+        for name, expected in (
+            ('application', application_buckets),
+            ('officer', officer_buckets),
+            ('flow', flow_buckets),
+            ('dwell', dwell_buckets),
+        ):
+            for key in set(expected) | set(stored[name]):
+                if expected[key] != stored[name][key]:
+                    drift += 1
+                    self.stdout.write(f'{name} bucket {key}: stored {stored[name][key]}, expected {expected[key]}')
+        
+        if drift:
+            raise CommandError(f'{drift} rollup bucket(s) out of date; run without --check to rebuild')
+        self.stdout.write(self.style.SUCCESS('Rollups match the applications and transitions tables'))
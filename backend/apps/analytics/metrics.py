@@ -0,0 +1,80 @@
+"""
+Prometheus metrics
+Request latency per view, application pipeline counters and AI stage
+durations. When PROMETHEUS_MULTIPROC_DIR is set (gunicorn, see
+gunicorn.conf.py) values are written to per-process files and merged
+at scrape time, so every worker's samples are counted.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from functools import wraps
+from prometheus_client import (
+    CollectorRegistry, Counter, Histogram, REGISTRY, generate_latest, multiprocess
+)
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds',
+    'Time spent producing a response, per resolved view',
+    ['view', 'method']
+)
+RESPONSES = Counter(
+    'http_responses_total',
+    'Responses per resolved view and status code',
+    ['view', 'method', 'status']
+)
+
+APPLICATIONS_SUBMITTED = Counter(
+    'applications_submitted_total',
+    'Applications received by the submit endpoint'
+)
+PII_REJECTIONS = Counter(
+    'applications_pii_rejected_total',
+    'Applications rejected because uploaded documents contained PII'
+)
+CLASSIFICATIONS = Counter(
+    'applications_classified_total',
+    'Applications classified, by service category',
+    ['category']
+)
+
+# pii and classification include their own text extraction, which is
+# also observed on its own as the extraction stage
+AI_STAGE_LATENCY = Histogram(
+    'ai_stage_duration_seconds',
+    'Duration of each application pipeline stage',
+    ['stage'],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+)
+
+
+@contextmanager
+def observe_stage(stage: str):
+    """Time a block as one AI pipeline stage"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        AI_STAGE_LATENCY.labels(stage=stage).observe(time.perf_counter() - started)
+
+
+def timed_stage(stage: str):
+    """Decorator form of observe_stage"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with observe_stage(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def render_metrics():
+    """Exposition text for this process, or for all workers in multiprocess mode"""
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry)
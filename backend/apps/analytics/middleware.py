@@ -0,0 +1,20 @@
+import time
+from .metrics import REQUEST_LATENCY, RESPONSES
+
+
+class PrometheusMetricsMiddleware:
+    """Record latency and status per resolved view (route name, not raw path)"""
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+    
+    def __call__(self, request):
+        started = time.perf_counter()
+        response = self.get_response(request)
+        
+        # Label by route so ids/tokens in the path don't explode cardinality
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else 'unresolved'
+        REQUEST_LATENCY.labels(view=view, method=request.method).observe(time.perf_counter() - started)
+        RESPONSES.labels(view=view, method=request.method, status=response.status_code).inc()
+        return response
@@ -0,0 +1,74 @@
+from django.db import models
+from apps.officers.models import Officer
+
+
+class ApplicationDailyRollup(models.Model):
+    """
+    Number of applications created on `day` that are currently in `status`,
+    per service category and the department that category routes to.
+    Maintained incrementally on every transition (see rollups.py).
+    """
+    day = models.DateField()
+    status = models.CharField(max_length=20)
+    service_category = models.CharField(max_length=100, blank=True)
+    department = models.CharField(max_length=100, blank=True)
+    count = models.IntegerField(default=0)
+    
+    class Meta:
+        db_table = 'analytics_application_rollup'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['day', 'status', 'service_category', 'department'],
+                name='uniq_application_rollup_bucket'
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.day} {self.status} {self.service_category or '-'}: {self.count}"
+
+
+class OfficerStatusRollup(models.Model):
+    """Number of applications currently assigned to an officer, per status"""
+    officer = models.ForeignKey(Officer, on_delete=models.CASCADE, related_name='status_rollups')
+    status = models.CharField(max_length=20)
+    count = models.IntegerField(default=0)
+    
+    class Meta:
+        db_table = 'analytics_officer_rollup'
+        constraints = [
+            models.UniqueConstraint(fields=['officer', 'status'], name='uniq_officer_rollup_bucket'),
+        ]
+    
+    def __str__(self):
+        return f"Officer {self.officer_id} {self.status}: {self.count}"
+
+
+class StatusFlowBucket(models.Model):
+    """Applications that entered `status` during `hour`"""
+    hour = models.DateTimeField()
+    status = models.CharField(max_length=20)
+    entered = models.IntegerField(default=0)
+    
+    class Meta:
+        db_table = 'analytics_status_flow'
+        constraints = [
+            models.UniqueConstraint(fields=['hour', 'status'], name='uniq_status_flow_bucket'),
+        ]
+
+
+class StatusDwellBucket(models.Model):
+    """
+    Histogram of time spent in `status` by applications that left it during
+    `hour`. Bins are log-spaced (see rollups.dwell_bin) so medians can be
+    estimated from counts without keeping individual durations.
+    """
+    hour = models.DateTimeField()
+    status = models.CharField(max_length=20)
+    bin = models.SmallIntegerField()
+    count = models.IntegerField(default=0)
+    
+    class Meta:
+        db_table = 'analytics_status_dwell'
+        constraints = [
+            models.UniqueConstraint(fields=['hour', 'status', 'bin'], name='uniq_status_dwell_bucket'),
+        ]
@@ -0,0 +1,127 @@
+"""
+Incremental analytics rollups
+Every application transition moves one unit from its old bucket to its new
+bucket, so the dashboard reads O(number of buckets) instead of scanning
+the applications table. Status changes also feed hourly flow and dwell-time
+buckets for the time-series endpoint.
+"""
+
+import math
+from collections import Counter
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from apps.officers.constants import SERVICE_TO_DEPARTMENT
+from .models import ApplicationDailyRollup, OfficerStatusRollup, StatusFlowBucket, StatusDwellBucket
+
+APPLICATION_BUCKET_FIELDS = ('day', 'status', 'service_category', 'department')
+OFFICER_BUCKET_FIELDS = ('officer_id', 'status')
+
+# Dwell histogram resolution: DWELL_BINS_PER_DOUBLING bins per doubling of seconds
+DWELL_BINS_PER_DOUBLING = 4
+
+
+def department_for(service_category: str) -> str:
+    """Department a category routes to ('' while unclassified)"""
+    if not service_category:
+        return ''
+    return SERVICE_TO_DEPARTMENT.get(service_category, 'GENERAL')
+
+
+def application_bucket(state: dict) -> tuple:
+    return (
+        timezone.localdate(state['created_at']),
+        state['status'],
+        state['service_category'] or '',
+        department_for(state['service_category']),
+    )
+
+
+def officer_bucket(state: dict):
+    if not state['assigned_officer_id']:
+        return None
+    return (state['assigned_officer_id'], state['status'])
+
+
+def hour_of(moment):
+    return timezone.localtime(moment).replace(minute=0, second=0, microsecond=0)
+
+
+def dwell_bin(seconds: float) -> int:
+    return int(DWELL_BINS_PER_DOUBLING * math.log2(max(seconds, 0) + 1))
+
+
+def dwell_bin_midpoint(bin_index: int) -> float:
+    """Representative duration (seconds) for a histogram bin"""
+    low = 2 ** (bin_index / DWELL_BINS_PER_DOUBLING) - 1
+    high = 2 ** ((bin_index + 1) / DWELL_BINS_PER_DOUBLING) - 1
+    return math.sqrt((low + 1) * (high + 1)) - 1
+
+
+def rollup_deltas(changes):
+    """
+    Bucket deltas for (old_state, new_state) pairs, as
+    (application, officer, flow, dwell) Counters.
+    States are dicts of Application.TRACKED_FIELDS; None means the
+    application did not exist.
+    """
+    application_deltas = Counter()
+    officer_deltas = Counter()
+    flow_deltas = Counter()
+    dwell_deltas = Counter()
+    for old_state, new_state in changes:
+        for state, sign in ((old_state, -1), (new_state, 1)):
+            if state is None:
+                continue
+            application_deltas[application_bucket(state)] += sign
+            bucket = officer_bucket(state)
+            if bucket:
+                officer_deltas[bucket] += sign
+        
+        # Stage flow/latency: only status changes count
+        if new_state is None or (old_state is not None and old_state['status'] == new_state['status']):
+            continue
+        changed_at = new_state['status_changed_at'] or timezone.now()
+        hour = hour_of(changed_at)
+        flow_deltas[(hour, new_state['status'])] += 1
+        if old_state is not None:
+            entered_at = old_state['status_changed_at'] or old_state['created_at']
+            seconds = (changed_at - entered_at).total_seconds()
+            dwell_deltas[(hour, old_state['status'], dwell_bin(seconds))] += 1
+    return application_deltas, officer_deltas, flow_deltas, dwell_deltas
+
+
+def record_transitions(changes):
+    """Apply rollup deltas for (old_state, new_state) pairs (see rollup_deltas)"""
+    application_deltas, officer_deltas, flow_deltas, dwell_deltas = rollup_deltas(changes)
+    for key, delta in application_deltas.items():
+        if delta:
+            _increment(ApplicationDailyRollup, dict(zip(APPLICATION_BUCKET_FIELDS, key)), delta)
+    for key, delta in officer_deltas.items():
+        if delta:
+            _increment(OfficerStatusRollup, dict(zip(OFFICER_BUCKET_FIELDS, key)), delta)
+    for (hour, status), delta in flow_deltas.items():
+        _increment(StatusFlowBucket, {'hour': hour, 'status': status}, delta, field='entered')
+    for (hour, status, bin_index), delta in dwell_deltas.items():
+        _increment(StatusDwellBucket, {'hour': hour, 'status': status, 'bin': bin_index}, delta)
+
+
+# Dotted path of handle_transitions in APPLICATION_OUTBOX_HANDLERS
+OUTBOX_HANDLER = 'apps.analytics.rollups.handle_transitions'
+
+
+def handle_transitions(transitions):
+    """Outbox handler: fold ApplicationTransition rows into the rollups"""
+    record_transitions(transition.states() for transition in transitions)
+
+
+def _increment(model, lookup: dict, delta: int, field: str = 'count'):
+    """Atomic counter bump; creates the bucket on first use"""
+    if model.objects.filter(**lookup).update(**{field: F(field) + delta}):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**{field: delta}, **lookup)
+    except IntegrityError:
+        # Another transaction created the bucket first
+        model.objects.filter(**lookup).update(**{field: F(field) + delta})
@@ -0,0 +1,132 @@
+"""
+Dashboard aggregation
+Application numbers are read from the incrementally maintained rollup
+tables (see rollups.py), so cost scales with the number of buckets rather
+than the size of the applications table.
+"""
+
+from collections import Counter, defaultdict
+from datetime import timedelta
+from django.db.models import Q, Sum
+from django.db.models.functions import TruncDay, TruncHour
+from django.utils import timezone
+from apps.applications.models import Application
+from apps.officers.models import Officer
+from .models import ApplicationDailyRollup, OfficerStatusRollup, StatusFlowBucket, StatusDwellBucket
+from .rollups import dwell_bin_midpoint
+
+TIMESERIES_TRUNC = {'hour': TruncHour, 'day': TruncDay}
+
+
+def _rate(part: int, total: int) -> float:
+    return round((part / total * 100) if total > 0 else 0, 2)
+
+
+def application_totals() -> dict:
+    """Status, category, recent and approval/rejection numbers from the rollups"""
+    week_ago = timezone.localdate() - timedelta(days=7)
+    
+    by_status = Counter()
+    by_category = Counter()
+    recent = 0
+    for row in ApplicationDailyRollup.objects.values('status', 'service_category').annotate(
+        total=Sum('count'),
+        recent=Sum('count', filter=Q(day__gte=week_ago))
+    ):
+        by_status[row['status']] += row['total']
+        by_category[row['service_category']] += row['total']
+        recent += row['recent'] or 0
+    
+    total = sum(by_status.values())
+    return {
+        'total_applications': total,
+        'status_breakdown': [
+            {'status': code, 'count': by_status[code]}
+            for code, _ in Application.STATUS_CHOICES
+            if by_status[code]
+        ],
+        'category_breakdown': [
+            {'service_category': category, 'count': count}
+            for category, count in sorted(by_category.items())
+            if count
+        ],
+        'recent_applications': recent,
+        'approval_rate': _rate(by_status['APPROVED'], total),
+        'rejection_rate': _rate(by_status['REJECTED'], total),
+    }
+
+
+def officer_totals() -> dict:
+    """Workload rows with per-status counters, and the department breakdown"""
+    officer_workload = list(Officer.objects.filter(is_active=True).values(
+        'id', 'user__username', 'department', 'hierarchy_level', 'workload_count'
+    ))
+    
+    status_counts = defaultdict(dict)
+    for officer_id, status, count in OfficerStatusRollup.objects.filter(
+        officer__is_active=True, count__gt=0
+    ).values_list('officer_id', 'status', 'count'):
+        status_counts[officer_id][status] = count
+    for officer in officer_workload:
+        officer['status_counts'] = status_counts.get(officer.pop('id'), {})
+    
+    departments = Counter(officer['department'] for officer in officer_workload)
+    return {
+        'officer_workload': officer_workload,
+        'department_breakdown': [
+            {'department': department, 'officer_count': count}
+            for department, count in sorted(departments.items())
+        ],
+    }
+
+
+def _median_from_histogram(histogram: dict):
+    """Median duration (seconds) from {bin: count}, or None when empty"""
+    total = sum(histogram.values())
+    if not total:
+        return None
+    seen = 0
+    for bin_index in sorted(histogram):
+        seen += histogram[bin_index]
+        if seen * 2 >= total:
+            return round(dwell_bin_midpoint(bin_index), 1)
+
+
+def status_timeseries(interval: str, start, end) -> list:
+    """
+    Throughput and stage latency per interval bucket between start and end,
+    read from the precomputed hourly flow/dwell buckets.
+    """
+    trunc = TIMESERIES_TRUNC[interval]
+    statuses = [code for code, _ in Application.STATUS_CHOICES]
+    
+    entered = defaultdict(Counter)
+    for row in StatusFlowBucket.objects.filter(hour__gte=start, hour__lt=end).annotate(
+        bucket=trunc('hour')
+    ).values('bucket', 'status').annotate(total=Sum('entered')):
+        entered[row['bucket']][row['status']] += row['total']
+    
+    dwell = defaultdict(lambda: defaultdict(Counter))
+    for row in StatusDwellBucket.objects.filter(hour__gte=start, hour__lt=end).annotate(
+        bucket=trunc('hour')
+    ).values('bucket', 'status', 'bin').annotate(total=Sum('count')):
+        dwell[row['bucket']][row['status']][row['bin']] += row['total']
+    
+    series = []
+    for bucket in sorted(set(entered) | set(dwell)):
+        counts = entered[bucket]
+        series.append({
+            'bucket': bucket,
+            'submissions': counts['SUBMITTED'],
+            'approvals': counts['APPROVED'],
+            'rejections': counts['REJECTED'],
+            'entered': {code: counts[code] for code in statuses},
+            'median_seconds_in_status': {
+                code: _median_from_histogram(dwell[bucket][code]) for code in statuses
+            },
+        })
+    return series
+
+
+def build_dashboard_payload() -> dict:
+    return {**application_totals(), **officer_totals()}
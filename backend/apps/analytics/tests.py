@@ -0,0 +1,198 @@
+"""
+Unit tests for analytics rollups and the dashboard cache
+"""
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django.contrib.auth.models import User
+from apps.applications.models import Application, ApplicationTransition
+from apps.applications.outbox import dispatch_all
+from apps.officers.models import Officer
+from apps.users.models import Citizen
+from .models import ApplicationDailyRollup, OfficerStatusRollup, StatusFlowBucket, StatusDwellBucket
+from .cache import DASHBOARD_CACHE_KEY, DASHBOARD_LOCK_KEY, get_dashboard_payload
+from .rollups import dwell_bin, hour_of, record_transitions
+
+
+def state(status, officer_id=None, category='LAND_RECORD', created_at=None, changed_at=None):
+    created_at = created_at or timezone.now()
+    return {
+        'status': status,
+        'service_category': category,
+        'created_at': created_at,
+        'assigned_officer_id': officer_id,
+        'status_changed_at': changed_at or created_at,
+    }
+
+
+class RecordTransitionsTests(TestCase):
+    """Test incremental rollup deltas"""
+    
+    def setUp(self):
+        officer_user = User.objects.create_user(username='rollup_officer', password='officer123')
+        self.officer = Officer.objects.create(
+            user=officer_user,
+            department='REVENUE',
+            hierarchy_level=1,
+            is_active=True
+        )
+    
+    def count(self, status):
+        return sum(ApplicationDailyRollup.objects.filter(status=status).values_list('count', flat=True))
+    
+    def test_create_and_delete_move_daily_buckets(self):
+        """Test a creation adds one unit to its bucket and a deletion removes it"""
+        created = state('SUBMITTED')
+        record_transitions([(None, created), (None, state('SUBMITTED'))])
+        self.assertEqual(self.count('SUBMITTED'), 2)
+        
+        bucket = ApplicationDailyRollup.objects.get(status='SUBMITTED')
+        self.assertEqual((bucket.service_category, bucket.department), ('LAND_RECORD', 'REVENUE'))
+        
+        record_transitions([(created, None)])
+        self.assertEqual(self.count('SUBMITTED'), 1)
+    
+    def test_assignment_moves_officer_bucket(self):
+        """Test reassigning an application moves it between officer buckets"""
+        submitted = state('SUBMITTED')
+        assigned = {**submitted, 'status': 'ASSIGNED', 'assigned_officer_id': self.officer.id}
+        record_transitions([(None, submitted), (submitted, assigned)])
+        self.assertEqual(OfficerStatusRollup.objects.get(officer=self.officer, status='ASSIGNED').count, 1)
+        self.assertEqual(self.count('SUBMITTED'), 0)
+        self.assertEqual(self.count('ASSIGNED'), 1)
+        
+        approved = {**assigned, 'status': 'APPROVED'}
+        record_transitions([(assigned, approved)])
+        self.assertEqual(OfficerStatusRollup.objects.get(officer=self.officer, status='ASSIGNED').count, 0)
+        self.assertEqual(OfficerStatusRollup.objects.get(officer=self.officer, status='APPROVED').count, 1)
+    
+    def test_status_change_records_flow_and_dwell(self):
+        """Test a status change counts an entry and the time spent in the old status"""
+        created_at = timezone.now() - timedelta(hours=2)
+        changed_at = created_at + timedelta(minutes=30)
+        submitted = state('SUBMITTED', created_at=created_at)
+        classified = {**submitted, 'status': 'CLASSIFIED', 'status_changed_at': changed_at}
+        record_transitions([(None, submitted), (submitted, classified)])
+        
+        self.assertEqual(StatusFlowBucket.objects.get(hour=hour_of(changed_at), status='CLASSIFIED').entered, 1)
+        self.assertEqual(StatusFlowBucket.objects.get(hour=hour_of(created_at), status='SUBMITTED').entered, 1)
+        dwell = StatusDwellBucket.objects.get(status='SUBMITTED')
+        self.assertEqual((dwell.hour, dwell.bin, dwell.count), (hour_of(changed_at), dwell_bin(1800), 1))
+    
+    def test_non_status_change_skips_flow(self):
+        """Test an officer change without a status change records no flow"""
+        assigned = state('ASSIGNED')
+        record_transitions([(assigned, {**assigned, 'assigned_officer_id': self.officer.id})])
+        self.assertFalse(StatusFlowBucket.objects.exists())
+        self.assertEqual(self.count('ASSIGNED'), 0)
+
+
+class RebuildAnalyticsRollupsTests(TestCase):
+    """Test rebuilding the rollups from applications and transitions"""
+    
+    def setUp(self):
+        self.citizen = Citizen.objects.create(
+            name='Test Citizen',
+            age=30,
+            address='Test Address',
+            aadhaar='123456789012'
+        )
+    
+    def create_applications(self, count):
+        return [
+            Application.objects.create(
+                citizen=self.citizen,
+                token_original=f'rollup-token-{i}',
+                token_te1=f'rollup-te1-{i}',
+                token_te2=f'rollup-te2-{i}',
+                service_category='LAND_RECORD',
+                status='SUBMITTED'
+            )
+            for i in range(count)
+        ]
+    
+    def rebuild(self, *args):
+        call_command('rebuild_analytics_rollups', *args, stdout=StringIO())
+    
+    def test_pending_transitions_are_not_applied_twice(self):
+        """Test transitions pending at rebuild time are drained, not re-applied by the outbox"""
+        self.create_applications(3)
+        self.assertEqual(ApplicationTransition.objects.filter(dispatched_at__isnull=True).count(), 3)
+        
+        self.rebuild()
+        self.assertFalse(ApplicationTransition.objects.filter(dispatched_at__isnull=True).exists())
+        self.assertEqual(dispatch_all(), 0)
+        self.assertEqual(ApplicationDailyRollup.objects.get(status='SUBMITTED').count, 3)
+        self.rebuild('--check')
+    
+    def test_rebuild_restores_flow_and_dwell(self):
+        """Test the time-series buckets are replayed from the transition log"""
+        application = self.create_applications(1)[0]
+        application.status = 'CLASSIFIED'
+        application.save()
+        dispatch_all()
+        expected = {
+            'flow': sorted(StatusFlowBucket.objects.values_list('hour', 'status', 'entered')),
+            'dwell': sorted(StatusDwellBucket.objects.values_list('hour', 'status', 'bin', 'count')),
+        }
+        self.assertEqual(len(expected['flow']), 2)
+        
+        StatusFlowBucket.objects.all().delete()
+        StatusDwellBucket.objects.update(count=5)
+        with self.assertRaises(CommandError):
+            self.rebuild('--check')
+        
+        self.rebuild()
+        self.assertEqual(sorted(StatusFlowBucket.objects.values_list('hour', 'status', 'entered')), expected['flow'])
+        self.assertEqual(sorted(StatusDwellBucket.objects.values_list('hour', 'status', 'bin', 'count')), expected['dwell'])
+        self.rebuild('--check')
+    
+    def test_if_empty_keeps_populated_rollups(self):
+        """Test --if-empty leaves existing rollups alone"""
+        self.create_applications(2)
+        dispatch_all()
+        ApplicationDailyRollup.objects.update(count=7)
+        self.rebuild('--if-empty')
+        self.assertEqual(ApplicationDailyRollup.objects.get(status='SUBMITTED').count, 7)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class DashboardCacheTests(TestCase):
+    """Test the dashboard recompute lock"""
+    
+    def setUp(self):
+        cache.clear()
+    
+    @mock.patch('apps.analytics.cache.build_dashboard_payload', return_value={'total': 1})
+    def test_lock_taken_over_is_not_released(self, build):
+        """Test a recompute that outlived its lock leaves the new holder's lock alone"""
+        def expire_and_retake():
+            cache.set(DASHBOARD_LOCK_KEY, 'other-worker')
+            return {'total': 1}
+        build.side_effect = expire_and_retake
+        
+        self.assertEqual(get_dashboard_payload()['total'], 1)
+        self.assertEqual(cache.get(DASHBOARD_LOCK_KEY), 'other-worker')
+    
+    @mock.patch('apps.analytics.cache.build_dashboard_payload', return_value={'total': 2})
+    def test_own_lock_is_released(self, build):
+        """Test the lock is dropped once the recompute finishes"""
+        get_dashboard_payload()
+        self.assertIsNone(cache.get(DASHBOARD_LOCK_KEY))
+    
+    @override_settings(ANALYTICS_DASHBOARD_COLD_WAIT=0.2)
+    @mock.patch('apps.analytics.cache.build_dashboard_payload', return_value={'total': 3})
+    def test_cold_miss_waits_only_briefly(self, build):
+        """Test a cold miss computes in line once the capped wait for another worker runs out"""
+        cache.add(DASHBOARD_LOCK_KEY, 'other-worker', 30)
+        started = time.monotonic()
+        self.assertEqual(get_dashboard_payload()['total'], 3)
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertIsNotNone(cache.get(DASHBOARD_CACHE_KEY))
+        self.assertEqual(cache.get(DASHBOARD_LOCK_KEY), 'other-worker')
@@ -3,5 +3,9 @@ from . import views
 
 urlpatterns = [
     path('dashboard/', views.get_dashboard_stats, name='dashboard-stats'),
-    path('health/', views.health_check, name='health-check'),
+    path('timeseries/', views.StatusTimeseriesView.as_view(), name='status-timeseries'),
+    path('export/<str:dataset>/', views.ExportView.as_view(), name='analytics-export'),
+    path('health/', views.readiness, name='health-check'),
+    path('health/live/', views.liveness, name='health-live'),
+    path('health/ready/', views.readiness, name='health-ready'),
 ]
@@ -1,96 +1,96 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework import permissions
-from rest_framework.decorators import api_view, permission_classes
-from django.db.models import Count, Q
-from django.db import connection
-from apps.applications.models import Application
-from apps.officers.models import Officer
-from datetime import datetime, timedelta
+from rest_framework import permissions, status
 from django.conf import settings
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from datetime import timedelta
+from .cache import get_dashboard_payload
+from .services import status_timeseries, TIMESERIES_TRUNC
+from .exports import stream_export, EXPORT_DATASETS, EXPORT_FORMATS
+from .metrics import render_metrics
+from .health import readiness_state
+from config.db_router import replica_reads
+from prometheus_client import CONTENT_TYPE_LATEST
 
 class AnalyticsDashboardView(APIView):
     """Admin analytics dashboard"""
     permission_classes = [permissions.IsAdminUser]
     
+    @replica_reads
     def get(self, request):
-        # Total applications
-        total_applications = Application.objects.count()
-        
-        # Status breakdown
-        status_breakdown = Application.objects.values('status').annotate(count=Count('id'))
-        
-        # Applications by service category
-        category_breakdown = Application.objects.values('service_category').annotate(count=Count('id'))
-        
-        # Officer workload distribution
-        officer_workload = Officer.objects.filter(is_active=True).values(
-            'user__username', 'department', 'hierarchy_level', 'workload_count'
-        )
-        
-        # Recent applications (last 7 days)
-        week_ago = datetime.now() - timedelta(days=7)
-        recent_apps = Application.objects.filter(created_at__gte=week_ago).count()
-        
-        # Approval/Rejection rates
-        approved = Application.objects.filter(status='APPROVED').count()
-        rejected = Application.objects.filter(status='REJECTED').count()
+        return Response(get_dashboard_payload())
+
+
+class StatusTimeseriesView(APIView):
+    """Submissions, approvals, rejections and median time in each status per hour/day"""
+    permission_classes = [permissions.IsAdminUser]
+    
+    @replica_reads
+    def get(self, request):
+        interval = request.query_params.get('interval', 'day')
+        if interval not in TIMESERIES_TRUNC:
+            return Response({'error': 'interval must be "hour" or "day"'}, status=status.HTTP_400_BAD_REQUEST)
         
-        # Department-wise distribution
-        dept_breakdown = Officer.objects.filter(is_active=True).values('department').annotate(
-            officer_count=Count('id')
-        )
+        try:
+            days = int(request.query_params.get('days', 7 if interval == 'hour' else 90))
+        except ValueError:
+            return Response({'error': 'days must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        if not 1 <= days <= settings.ANALYTICS_TIMESERIES_MAX_DAYS:
+            return Response(
+                {'error': f'days must be between 1 and {settings.ANALYTICS_TIMESERIES_MAX_DAYS}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
+        end = timezone.now()
+        start = end - timedelta(days=days)
         return Response({
-            'total_applications': total_applications,
-            'status_breakdown': list(status_breakdown),
-            'category_breakdown': list(category_breakdown),
-            'officer_workload': list(officer_workload),
-            'recent_applications': recent_apps,
-            'approval_rate': round((approved / total_applications * 100) if total_applications > 0 else 0, 2),
-            'rejection_rate': round((rejected / total_applications * 100) if total_applications > 0 else 0, 2),
-            'department_breakdown': list(dept_breakdown)
+            'interval': interval,
+            'start': start,
+            'end': end,
+            'series': status_timeseries(interval, start, end),
         })
 
 
-@api_view(['GET'])
-@permission_classes([permissions.AllowAny])
-def health_check(request):
-    """Health check endpoint for load balancer"""
-    health_status = {
-        'status': 'healthy',
-        'database': 'unknown',
-        'redis': 'unknown'
-    }
-    
-    # Check database connection
-    try:
-        connection.ensure_connection()
-        health_status['database'] = 'connected'
-    except Exception as e:
-        health_status['status'] = 'unhealthy'
-        health_status['database'] = f'error: {str(e)}'
+class ExportView(APIView):
+    """Streaming CSV/NDJSON export of applications, officers or transitions (no PII)"""
+    permission_classes = [permissions.IsAdminUser]
     
-    # Check Redis connection (optional - don't fail if Redis not configured)
-    try:
-        if hasattr(settings, 'CACHES') and 'default' in settings.CACHES:
-            import redis
-            redis_url = settings.CACHES['default'].get('LOCATION', '')
-            if redis_url:
-                r = redis.from_url(redis_url)
-                r.ping()
-                health_status['redis'] = 'connected'
-            else:
-                health_status['redis'] = 'not_configured'
-        else:
-            health_status['redis'] = 'not_configured'
-    except ImportError:
-        health_status['redis'] = 'redis_not_installed'
-    except Exception as e:
-        # Don't fail health check if Redis is down
-        health_status['redis'] = f'unavailable: {str(e)}'
+    CONTENT_TYPES = {'csv': 'text/csv', 'ndjson': 'application/x-ndjson'}
     
-    status_code = 200 if health_status['status'] == 'healthy' else 503
-    return Response(health_status, status=status_code)
+    def get(self, request, dataset):
+        if dataset not in EXPORT_DATASETS:
+            return Response({'error': f'Unknown dataset {dataset!r}'}, status=status.HTTP_404_NOT_FOUND)
+        
+        # Not "format": DRF reserves that query parameter for renderer selection
+        export_format = request.query_params.get('output', 'csv')
+        if export_format not in EXPORT_FORMATS:
+            return Response({'error': 'output must be "csv" or "ndjson"'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        response = StreamingHttpResponse(
+            stream_export(dataset, export_format),
+            content_type=self.CONTENT_TYPES[export_format]
+        )
+        response['Content-Disposition'] = f'attachment; filename="{dataset}.{export_format}"'
+        return response
+
+
+# Probes are plain Django views: no DRF authentication or content
+# negotiation on paths hit every few seconds
+def liveness(request):
+    """Process is up and serving requests; touches no dependencies"""
+    return JsonResponse({'status': 'alive'})
+
+
+def readiness(request):
+    """Database, Redis and Celery queue depth, cached for HEALTH_READINESS_TTL"""
+    state = readiness_state()
+    return JsonResponse(state, status=200 if state['status'] == 'healthy' else 503)
+
 
 get_dashboard_stats = AnalyticsDashboardView.as_view()
+
+
+def metrics(request):
+    """Prometheus scrape endpoint (plain Django view: text exposition format)"""
+    return HttpResponse(render_metrics(), content_type=CONTENT_TYPE_LATEST)
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Application, ApplicationFile
+from .models import Application, ApplicationFile, ApplicationTransition
 
 @admin.register(Application)
 class ApplicationAdmin(admin.ModelAdmin):
@@ -12,3 +12,18 @@ class ApplicationAdmin(admin.ModelAdmin):
 class ApplicationFileAdmin(admin.ModelAdmin):
     list_display = ['id', 'application', 'is_redacted', 'uploaded_at']
     list_filter = ['is_redacted']
+
+
+@admin.register(ApplicationTransition)
+class ApplicationTransitionAdmin(admin.ModelAdmin):
+    list_display = ['id', 'application_id', 'from_status', 'to_status', 'to_officer_id', 'created_at', 'dispatched_at']
+    list_filter = ['to_status']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+    
+    def has_delete_permission(self, request, obj=None):
+        return False
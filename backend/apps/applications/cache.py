@@ -0,0 +1,96 @@
+"""
+Read-through cache for citizen status lookups.
+Entries are keyed by the TE1 token digest and dropped whenever the
+application changes; STATUS_CACHE_TTL is only a safety net.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from apps.encryption.services import token_digest
+from .models import Application
+from .serializers import ApplicationSerializer
+
+STATUS_CACHE_PREFIX = 'app-status'
+
+
+def status_cache_key(digest: str) -> str:
+    return f'{STATUS_CACHE_PREFIX}:{digest}'
+
+
+def get_cached_status(token: str):
+    """Cached entry ({'payload', 'updated_at'}) for a TE1 token, or None"""
+    return cache.get(status_cache_key(token_digest(token)))
+
+
+def fill_missing_digests(tokens) -> dict:
+    """
+    Fill token_te1_digest for applications stored before the column existed,
+    matching them on the raw TE1 token. Returns {token: status} for the rows
+    found. Deploys run `manage.py backfill_token_digests`, so this only
+    matters until that has finished.
+    """
+    rows = list(
+        Application.objects.db_manager('default')
+        .filter(token_te1_digest__isnull=True, token_te1__in=list(tokens))
+        .values_list('id', 'token_te1', 'status')
+    )
+    for application_id, token, _ in rows:
+        Application.objects.filter(id=application_id, token_te1_digest__isnull=True).update(
+            token_te1_digest=token_digest(token)
+        )
+    return {token: current_status for _, token, current_status in rows}
+
+
+def get_status_version(token: str):
+    """
+    (id, updated_at) for a TE1 token without loading the row or its files.
+    
+    Raises:
+        Application.DoesNotExist: if no application has this token
+    """
+    lookup = Application.objects.filter(token_te1_digest=token_digest(token)).values_list('id', 'updated_at')
+    try:
+        return lookup.get()
+    except Application.DoesNotExist:
+        if not fill_missing_digests([token]):
+            raise
+        return lookup.using('default').get()
+
+
+def get_status_entry(token: str) -> dict:
+    """
+    Return the cached status entry for a TE1 token, loading it on a miss.
+    
+    Raises:
+        Application.DoesNotExist: if no application has this token
+    """
+    digest = token_digest(token)
+    key = status_cache_key(digest)
+    entry = cache.get(key)
+    if entry is None:
+        # Fill from the primary: a lagging replica row would otherwise be
+        # cached for the full TTL after its invalidation already ran
+        lookup = Application.objects.db_manager('default').prefetch_related('files')
+        try:
+            application = lookup.get(token_te1_digest=digest)
+        except Application.DoesNotExist:
+            if not fill_missing_digests([token]):
+                raise
+            application = lookup.get(token_te1_digest=digest)
+        entry = {
+            'payload': dict(ApplicationSerializer(application).data),
+            'updated_at': application.updated_at,
+        }
+        cache.set(key, entry, settings.STATUS_CACHE_TTL)
+    return entry
+
+
+def invalidate_status_cache(digests):
+    """
+    Drop cached entries once the surrounding transaction commits, so a
+    concurrent read cannot re-cache the pre-commit state.
+    """
+    keys = [status_cache_key(digest) for digest in digests if digest]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
@@ -0,0 +1,37 @@
+"""
+HTTP conditional GET helpers.
+Validators are derived from updated_at so a 304 can be returned before
+anything is serialized.
+"""
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def make_validators(updated_at, *parts):
+    """Return (etag, last_modified) for a resource version"""
+    if updated_at is None:
+        return quote_etag('-'.join(str(p) for p in parts + ('empty',))), None
+    version = int(updated_at.timestamp() * 1_000_000)
+    etag = quote_etag('-'.join(str(p) for p in parts + (version,)))
+    return etag, int(updated_at.timestamp())
+
+
+def is_conditional(request) -> bool:
+    return 'HTTP_IF_NONE_MATCH' in request.META or 'HTTP_IF_MODIFIED_SINCE' in request.META
+
+
+def not_modified_response(request, etag, last_modified):
+    """HttpResponseNotModified if the client's copy is current, else None"""
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def set_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = 'private, no-cache'
+    return response
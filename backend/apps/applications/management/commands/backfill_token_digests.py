@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from apps.applications.models import Application
+from apps.encryption.services import token_digest
+
+
+class Command(BaseCommand):
+    help = 'Populate token_te1_digest for applications created before the column existed'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+    
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        pending = Application.objects.filter(token_te1_digest__isnull=True).only('id', 'token_te1')
+        
+        batch = []
+        updated = 0
+        for application in pending.iterator(chunk_size=batch_size):
+            application.token_te1_digest = token_digest(application.token_te1)
+            batch.append(application)
+            if len(batch) >= batch_size:
+                Application.objects.bulk_update(batch, ['token_te1_digest'])
+                updated += len(batch)
+                batch = []
+        if batch:
+            Application.objects.bulk_update(batch, ['token_te1_digest'])
+            updated += len(batch)
+        
+        self.stdout.write(self.style.SUCCESS(f'Backfilled {updated} token digests'))
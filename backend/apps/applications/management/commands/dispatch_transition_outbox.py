@@ -0,0 +1,21 @@
+import time
+from django.core.management.base import BaseCommand
+from apps.applications.outbox import dispatch_all
+
+
+class Command(BaseCommand):
+    help = 'Dispatch pending application transitions to outbox handlers (rollups, caches, notifications)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Keep polling instead of exiting when drained')
+        parser.add_argument('--interval', type=float, default=1.0, help='Seconds between polls with --loop')
+        parser.add_argument('--batch-size', type=int, default=None)
+    
+    def handle(self, *args, **options):
+        while True:
+            dispatched = dispatch_all(options['batch_size'])
+            if dispatched:
+                self.stdout.write(f'Dispatched {dispatched} transition(s)')
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
@@ -1,6 +1,8 @@
-from django.db import models
+from django.db import models, router, transaction
+from django.utils import timezone
 from apps.users.models import Citizen
 from apps.officers.models import Officer
+from apps.encryption.services import token_digest
 
 class Application(models.Model):
     """Application model with double-blind token"""
@@ -18,18 +20,77 @@ class Application(models.Model):
     citizen = models.ForeignKey(Citizen, on_delete=models.CASCADE)
     token_original = models.CharField(max_length=255, unique=True)
     token_te1 = models.TextField()
+    # Indexed lookup key for token_te1 (Fernet tokens are long, unindexed text)
+    token_te1_digest = models.CharField(max_length=64, unique=True, null=True, editable=False)
     token_te2 = models.TextField()
     service_category = models.CharField(max_length=100, blank=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='SUBMITTED')
     assigned_officer = models.ForeignKey(Officer, on_delete=models.SET_NULL, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # When the application entered its current status (stage latency analytics)
+    status_changed_at = models.DateTimeField(null=True, blank=True)
     
     class Meta:
         db_table = 'applications'
+        indexes = [
+            # Officer inbox: filter by officer/status, keyset on (created_at, id)
+            models.Index(fields=['assigned_officer', 'status', 'created_at', 'id'], name='app_officer_queue_idx'),
+        ]
     
     def __str__(self):
         return f"Application {self.id} - {self.status}"
+    
+    # Fields whose transitions feed analytics rollups
+    TRACKED_FIELDS = ('status', 'service_category', 'created_at', 'assigned_officer_id', 'status_changed_at')
+    
+    # State as last loaded/saved; None until known
+    loaded_state = None
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if not instance.get_deferred_fields().intersection(cls.TRACKED_FIELDS):
+            instance.loaded_state = instance.tracked_state()
+        return instance
+    
+    def tracked_state(self) -> dict:
+        return {field: getattr(self, field) for field in self.TRACKED_FIELDS}
+    
+    @classmethod
+    def tracked_state_of(cls, row: dict) -> dict:
+        """tracked_state() for a values() row"""
+        return {field: row[field] for field in cls.TRACKED_FIELDS}
+    
+    def fetch_loaded_state(self, using: str = None):
+        """Tracked state as currently stored (None if the row does not exist)"""
+        using = using or router.db_for_write(type(self), instance=self)
+        return (
+            type(self)._base_manager.using(using).filter(pk=self.pk)
+            .values(*self.TRACKED_FIELDS)
+            .first()
+        )
+    
+    def save(self, *args, **kwargs):
+        if self.token_te1:
+            self.token_te1_digest = token_digest(self.token_te1)
+        if not self._state.adding and self.loaded_state is None:
+            # Deferred/.only() instances carry no loaded state; read it so
+            # a status change is still detected (and logged by the signals)
+            self.loaded_state = self.fetch_loaded_state(kwargs.get('using'))
+        if (
+            self._state.adding
+            or self.loaded_state is None
+            or self.loaded_state['status'] != self.status
+        ):
+            self.status_changed_at = timezone.now()
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'status_changed_at' not in update_fields:
+                kwargs['update_fields'] = [*update_fields, 'status_changed_at']
+        # The post_save signal inserts the transition row; keep it in the
+        # same transaction as the UPDATE even on autocommit callers
+        with transaction.atomic(using=kwargs.get('using') or router.db_for_write(type(self), instance=self)):
+            super().save(*args, **kwargs)
 
 
 class ApplicationFile(models.Model):
@@ -41,3 +102,77 @@ class ApplicationFile(models.Model):
     
     class Meta:
         db_table = 'application_files'
+
+
+class ApplicationTransition(models.Model):
+    """
+    Append-only log of application state changes, written in the same
+    transaction as the change. Rows with no dispatched_at form the outbox
+    drained by outbox.dispatch_pending(); each row carries enough of the
+    before/after state that consumers never re-query applications.
+    """
+    application = models.ForeignKey(
+        Application, on_delete=models.DO_NOTHING, db_constraint=False, related_name='transitions'
+    )
+    token_te1_digest = models.CharField(max_length=64, null=True)
+    from_status = models.CharField(max_length=20, null=True)  # None: application created
+    to_status = models.CharField(max_length=20, null=True)  # None: application deleted
+    from_officer_id = models.BigIntegerField(null=True)
+    to_officer_id = models.BigIntegerField(null=True)
+    from_service_category = models.CharField(max_length=100, blank=True)
+    to_service_category = models.CharField(max_length=100, blank=True)
+    application_created_at = models.DateTimeField()
+    from_status_changed_at = models.DateTimeField(null=True)
+    to_status_changed_at = models.DateTimeField(null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    dispatched_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'application_transitions'
+        indexes = [
+            models.Index(fields=['application', 'id'], name='transition_application_idx'),
+            # The outbox: only undispatched rows
+            models.Index(
+                fields=['id'], name='transition_outbox_idx',
+                condition=models.Q(dispatched_at__isnull=True)
+            ),
+        ]
+    
+    def __str__(self):
+        return f"Application {self.application_id}: {self.from_status} -> {self.to_status}"
+    
+    @classmethod
+    def from_states(cls, application_id, token_te1_digest, old_state, new_state):
+        """Build a row from Application.tracked_state() dicts (None = absent)"""
+        current = new_state or old_state
+        return cls(
+            application_id=application_id,
+            token_te1_digest=token_te1_digest,
+            from_status=old_state and old_state['status'],
+            to_status=new_state and new_state['status'],
+            from_officer_id=old_state and old_state['assigned_officer_id'],
+            to_officer_id=new_state and new_state['assigned_officer_id'],
+            from_service_category=(old_state and old_state['service_category']) or '',
+            to_service_category=(new_state and new_state['service_category']) or '',
+            application_created_at=current['created_at'],
+            from_status_changed_at=old_state and old_state['status_changed_at'],
+            to_status_changed_at=new_state and new_state['status_changed_at'],
+        )
+    
+    def states(self):
+        """(old_state, new_state) in Application.tracked_state() form"""
+        old_state = None if self.from_status is None else {
+            'status': self.from_status,
+            'service_category': self.from_service_category,
+            'created_at': self.application_created_at,
+            'assigned_officer_id': self.from_officer_id,
+            'status_changed_at': self.from_status_changed_at,
+        }
+        new_state = None if self.to_status is None else {
+            'status': self.to_status,
+            'service_category': self.to_service_category,
+            'created_at': self.application_created_at,
+            'assigned_officer_id': self.to_officer_id,
+            'status_changed_at': self.to_status_changed_at,
+        }
+        return old_state, new_state
@@ -0,0 +1,88 @@
+"""
+Transition log writer and outbox dispatcher.
+State changes are logged to ApplicationTransition inside the caller's
+transaction; dispatch_pending() later hands undispatched rows to the
+handlers in settings.APPLICATION_OUTBOX_HANDLERS (rollups, officer
+notifications) and marks them dispatched in the same transaction.
+The citizen status cache is not an outbox consumer: it is dropped on
+commit of the writing transaction, so a lookup never waits on dispatch.
+"""
+
+import logging
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from .cache import invalidate_status_cache
+from .models import ApplicationTransition
+
+logger = logging.getLogger(__name__)
+
+
+def log_transitions(changes):
+    """
+    Append transition rows for (application_id, token_te1_digest, old_state, new_state)
+    tuples in one INSERT, drop their cached status and schedule dispatch
+    once the transaction commits.
+    """
+    rows = [
+        ApplicationTransition.from_states(application_id, digest, old_state, new_state)
+        for application_id, digest, old_state, new_state in changes
+    ]
+    if not rows:
+        return []
+    rows = ApplicationTransition.objects.bulk_create(rows)
+    invalidate_status_cache(row.token_te1_digest for row in rows)
+    transaction.on_commit(schedule_dispatch)
+    return rows
+
+
+def schedule_dispatch():
+    """Kick the outbox consumer; the periodic sweep covers any failure here"""
+    if settings.APPLICATION_OUTBOX_EAGER:
+        dispatch_all()
+        return
+    try:
+        from .tasks import dispatch_transition_outbox
+        dispatch_transition_outbox.apply_async(retry=False)
+    except Exception:
+        logger.warning('Could not enqueue outbox dispatch; the periodic sweep will pick it up', exc_info=True)
+
+
+def dispatch_pending(batch_size: int = None, exclude=()) -> int:
+    """
+    Hand one batch of undispatched transitions to every handler.
+    Rows are locked with SKIP LOCKED so several consumers can run at once.
+    A handler error rolls the batch back and it is retried on the next run.
+    Handlers whose dotted path is in exclude are skipped for this batch
+    (the rollup rebuild already accounts for it).
+    """
+    batch_size = batch_size or settings.APPLICATION_OUTBOX_BATCH_SIZE
+    handlers = [
+        import_string(path) for path in settings.APPLICATION_OUTBOX_HANDLERS if path not in exclude
+    ]
+    
+    with transaction.atomic():
+        batch = list(
+            ApplicationTransition.objects.select_for_update(skip_locked=True)
+            .filter(dispatched_at__isnull=True)
+            .order_by('id')[:batch_size]
+        )
+        if not batch:
+            return 0
+        for handler in handlers:
+            handler(batch)
+        ApplicationTransition.objects.filter(id__in=[t.id for t in batch]).update(
+            dispatched_at=timezone.now()
+        )
+    return len(batch)
+
+
+def dispatch_all(batch_size: int = None, exclude=()) -> int:
+    """Drain the outbox; returns the number of transitions dispatched"""
+    total = 0
+    while True:
+        dispatched = dispatch_pending(batch_size, exclude)
+        if not dispatched:
+            return total
+        total += dispatched
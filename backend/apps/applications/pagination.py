@@ -0,0 +1,13 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class OfficerQueueCursorPagination(CursorPagination):
+    """
+    Keyset pagination for the officer inbox.
+    Orders by (created_at, id) so page cost stays flat regardless of queue depth.
+    """
+    ordering = ('created_at', 'id')
+    page_size = settings.OFFICER_QUEUE_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = settings.OFFICER_QUEUE_MAX_PAGE_SIZE
@@ -1,3 +1,4 @@
+from django.conf import settings
 from rest_framework import serializers
 from .models import Application, ApplicationFile
 
@@ -33,3 +34,26 @@ class OfficerApplicationSerializer(serializers.ModelSerializer):
 class ApplicationActionSerializer(serializers.Serializer):
     action = serializers.ChoiceField(choices=['APPROVE', 'REJECT'])
     remarks = serializers.CharField(required=False, allow_blank=True)
+
+class BulkActionItemSerializer(ApplicationActionSerializer):
+    application_id = serializers.IntegerField()
+
+class ApplicationBulkActionSerializer(serializers.Serializer):
+    items = serializers.ListField(
+        child=BulkActionItemSerializer(),
+        allow_empty=False,
+        max_length=settings.BULK_ACTION_MAX_ITEMS
+    )
+    
+    def validate_items(self, items):
+        ids = [item['application_id'] for item in items]
+        if len(ids) != len(set(ids)):
+            raise serializers.ValidationError('Each application may appear only once')
+        return items
+
+class ApplicationStatusBatchSerializer(serializers.Serializer):
+    tokens = serializers.ListField(
+        child=serializers.CharField(),
+        allow_empty=False,
+        max_length=settings.STATUS_BATCH_MAX_TOKENS
+    )
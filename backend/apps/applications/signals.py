@@ -0,0 +1,38 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from .models import Application, ApplicationFile
+from .cache import invalidate_status_cache
+from .outbox import log_transitions
+
+
+@receiver(pre_save, sender=Application)
+def remember_previous_state(sender, instance, **kwargs):
+    """
+    Application.save() fetches the prior state of deferred rows itself; this
+    covers save_base() callers that bypass it
+    """
+    if instance._state.adding or instance.loaded_state is not None:
+        return
+    instance.loaded_state = instance.fetch_loaded_state(kwargs.get('using'))
+
+
+@receiver(post_save, sender=Application)
+def log_application_saved(sender, instance, created, **kwargs):
+    old_state = None if created else instance.loaded_state
+    new_state = instance.tracked_state()
+    if old_state != new_state:
+        log_transitions([(instance.pk, instance.token_te1_digest, old_state, new_state)])
+    instance.loaded_state = new_state
+
+
+@receiver(post_delete, sender=Application)
+def log_application_deleted(sender, instance, **kwargs):
+    log_transitions([(instance.pk, instance.token_te1_digest, instance.tracked_state(), None)])
+
+
+@receiver([post_save, post_delete], sender=ApplicationFile)
+def application_file_changed(sender, instance, **kwargs):
+    """Files are part of the status payload but not a state transition"""
+    invalidate_status_cache(
+        Application.objects.filter(id=instance.application_id).values_list('token_te1_digest', flat=True)
+    )
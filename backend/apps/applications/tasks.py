@@ -0,0 +1,8 @@
+from celery import shared_task
+from .outbox import dispatch_all
+
+
+@shared_task(ignore_result=True)
+def dispatch_transition_outbox():
+    """Drain the application transition outbox"""
+    return dispatch_all()
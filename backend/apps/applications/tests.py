@@ -1,11 +1,20 @@
 """
 Unit tests for application models and views
 """
-from django.test import TestCase, Client
+from datetime import timedelta
+from unittest import mock
+from django.db import DatabaseError
+from django.http import HttpResponse
+from django.test import TestCase, Client, RequestFactory, override_settings
+from django.core.cache import cache
+from django.utils import timezone
 from django.contrib.auth.models import User
-from .models import Application
+from .models import Application, ApplicationTransition
+from .cache import get_status_entry, get_status_version
 from apps.officers.models import Officer
+from apps.users.models import Citizen
 from apps.encryption.services import EncryptionService
+from config.db_router import ReplicaRouter, ReplicaRoutingMiddleware, replica_reads
 import json
 
 
@@ -145,3 +154,347 @@ class ApplicationAPITests(TestCase):
         
         # Should return 200 or 401 depending on auth
         self.assertIn(response.status_code, [200, 401, 404])
+
+
+class OfficerQueuePaginationTests(TestCase):
+    """Test cursor pagination of the officer inbox"""
+    
+    def setUp(self):
+        self.client = Client()
+        self.officer_user = User.objects.create_user(
+            username='queue_officer',
+            password='officer123'
+        )
+        self.officer = Officer.objects.create(
+            user=self.officer_user,
+            department='REVENUE',
+            hierarchy_level=1,
+            is_active=True
+        )
+        citizen = Citizen.objects.create(
+            name='Test Citizen',
+            age=30,
+            address='Test Address',
+            aadhaar='123456789012'
+        )
+        for i in range(5):
+            Application.objects.create(
+                citizen=citizen,
+                token_original=f'queue-token-{i}',
+                token_te1=f'te1-{i}',
+                token_te2=f'te2-{i}',
+                service_category='LAND_RECORD',
+                status='ASSIGNED',
+                assigned_officer=self.officer
+            )
+        self.client.force_login(self.officer_user)
+    
+    def test_queue_is_cursor_paginated(self):
+        """Test pages follow (created_at, id) and expose a next cursor"""
+        response = self.client.get('/api/applications/officer/list/?page_size=2')
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(len(body['results']), 2)
+        self.assertIsNotNone(body['next'])
+        
+        seen = [app['id'] for app in body['results']]
+        next_url = body['next']
+        while next_url:
+            body = self.client.get(next_url).json()
+            seen.extend(app['id'] for app in body['results'])
+            next_url = body['next']
+        
+        self.assertEqual(seen, sorted(seen))
+        self.assertEqual(len(seen), 5)
+    
+    def test_queue_item_lookup(self):
+        """Test one queued application can be fetched, and forwarded ones cannot"""
+        application = Application.objects.filter(assigned_officer=self.officer).first()
+        
+        response = self.client.get(f'/api/applications/officer/list/{application.id}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['token_te2'], application.token_te2)
+        
+        Application.objects.filter(id=application.id).update(status='FORWARDED')
+        response = self.client.get(f'/api/applications/officer/list/{application.id}/')
+        self.assertEqual(response.status_code, 404)
+
+
+class ApplicationBulkActionTests(TestCase):
+    """Test officers approving/rejecting many applications at once"""
+    
+    def setUp(self):
+        self.client = Client()
+        self.officer = self.create_officer('bulk_officer', hierarchy_level=1, workload_count=4)
+        other_officer = self.create_officer('bulk_other', hierarchy_level=1, workload_count=1)
+        self.citizen = Citizen.objects.create(
+            name='Test Citizen',
+            age=30,
+            address='Test Address',
+            aadhaar='123456789012'
+        )
+        self.apps = [self.create_application(f'bulk-{i}', 'ASSIGNED', self.officer) for i in range(4)]
+        self.closed = self.create_application('bulk-closed', 'APPROVED', self.officer)
+        self.foreign = self.create_application('bulk-foreign', 'ASSIGNED', other_officer)
+        self.client.force_login(self.officer.user)
+    
+    def create_officer(self, username, hierarchy_level, workload_count=0):
+        user = User.objects.create_user(username=username, password='officer123')
+        return Officer.objects.create(
+            user=user,
+            department='REVENUE',
+            hierarchy_level=hierarchy_level,
+            workload_count=workload_count,
+            is_active=True
+        )
+    
+    def create_application(self, token, status, officer):
+        return Application.objects.create(
+            citizen=self.citizen,
+            token_original=f'{token}-token',
+            token_te1=f'{token}-te1',
+            token_te2=f'{token}-te2',
+            service_category='LAND_RECORD',
+            status=status,
+            assigned_officer=officer
+        )
+    
+    def post(self, items):
+        return self.client.post(
+            '/api/applications/officer/action/bulk/',
+            data=json.dumps({'items': [{'application_id': i, 'action': action} for i, action in items]}),
+            content_type='application/json'
+        )
+    
+    def test_results_and_workload(self):
+        """Test final approvals and rejections close items and lower the officer's workload"""
+        response = self.post([
+            (self.apps[0].id, 'APPROVE'),
+            (self.apps[1].id, 'REJECT'),
+            (self.apps[2].id, 'REJECT'),
+        ])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {
+            'processed': 3,
+            'failed': 0,
+            'results': [
+                {'application_id': self.apps[0].id, 'status': 'APPROVED', 'message': 'Application approved'},
+                {'application_id': self.apps[1].id, 'status': 'REJECTED', 'message': 'Application rejected'},
+                {'application_id': self.apps[2].id, 'status': 'REJECTED', 'message': 'Application rejected'},
+            ]
+        })
+        statuses = dict(Application.objects.filter(id__in=[a.id for a in self.apps]).values_list('id', 'status'))
+        self.assertEqual(
+            [statuses[a.id] for a in self.apps],
+            ['APPROVED', 'REJECTED', 'REJECTED', 'ASSIGNED']
+        )
+        self.officer.refresh_from_db()
+        self.assertEqual(self.officer.workload_count, 1)
+        self.assertEqual(
+            ApplicationTransition.objects.filter(application_id__in=[a.id for a in self.apps[:3]], from_status='ASSIGNED').count(),
+            3
+        )
+    
+    def test_approval_forwards_to_next_level(self):
+        """Test approvals move to a next-level officer when one exists"""
+        senior = self.create_officer('bulk_senior', hierarchy_level=2)
+        response = self.post([(self.apps[0].id, 'APPROVE'), (self.apps[1].id, 'APPROVE')])
+        
+        self.assertEqual([result['status'] for result in response.json()['results']], ['FORWARDED', 'FORWARDED'])
+        self.assertEqual(
+            Application.objects.filter(assigned_officer=senior, status='FORWARDED').count(),
+            2
+        )
+        self.officer.refresh_from_db()
+        senior.refresh_from_db()
+        self.assertEqual((self.officer.workload_count, senior.workload_count), (2, 2))
+    
+    def test_foreign_and_closed_items_fail_individually(self):
+        """Test items the officer does not own or already closed are reported, the rest processed"""
+        response = self.post([
+            (self.foreign.id, 'APPROVE'),
+            (self.closed.id, 'REJECT'),
+            (self.apps[0].id, 'REJECT'),
+            (999999, 'APPROVE'),
+        ])
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual((body['processed'], body['failed']), (1, 3))
+        self.assertEqual(body['results'], [
+            {'application_id': self.foreign.id, 'error': 'Application not found'},
+            {'application_id': self.closed.id, 'error': 'Application already approved'},
+            {'application_id': self.apps[0].id, 'status': 'REJECTED', 'message': 'Application rejected'},
+            {'application_id': 999999, 'error': 'Application not found'},
+        ])
+        self.foreign.refresh_from_db()
+        self.closed.refresh_from_db()
+        self.assertEqual((self.foreign.status, self.closed.status), ('ASSIGNED', 'APPROVED'))
+        self.officer.refresh_from_db()
+        self.assertEqual(self.officer.workload_count, 3)
+    
+    def test_duplicate_ids_are_rejected(self):
+        """Test a batch naming an application twice is refused as a whole"""
+        response = self.post([(self.apps[0].id, 'APPROVE'), (self.apps[0].id, 'REJECT')])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('items', response.json())
+        self.apps[0].refresh_from_db()
+        self.assertEqual(self.apps[0].status, 'ASSIGNED')
+    
+    def test_requires_officer_profile(self):
+        """Test users without an officer profile get 404"""
+        self.client.force_login(User.objects.create_user(username='bulk_citizen', password='citizen123'))
+        response = self.post([(self.apps[0].id, 'APPROVE')])
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class ApplicationStatusCacheTests(TestCase):
+    """Test read-through status cache and its invalidation"""
+    
+    def setUp(self):
+        cache.clear()
+        citizen = Citizen.objects.create(
+            name='Test Citizen',
+            age=30,
+            address='Test Address',
+            aadhaar='123456789012'
+        )
+        self.app = Application.objects.create(
+            citizen=citizen,
+            token_original='cache-token',
+            token_te1='cache-te1',
+            token_te2='cache-te2',
+            status='SUBMITTED'
+        )
+    
+    def test_status_change_invalidates_cached_payload(self):
+        """Test a status change is visible on the next lookup"""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(get_status_entry('cache-te1')['payload']['status'], 'SUBMITTED')
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            self.app.status = 'APPROVED'
+            self.app.save()
+        
+        self.assertEqual(get_status_entry('cache-te1')['payload']['status'], 'APPROVED')
+
+    
+    def test_status_conditional_get_returns_304(self):
+        """Test a matching ETag short-circuits to 304 Not Modified"""
+        response = self.client.get('/api/applications/status/cache-te1/')
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        
+        response = self.client.get('/api/applications/status/cache-te1/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    
+    def test_batch_status_lookup(self):
+        """Test batched lookup maps known tokens to status and unknown to null"""
+        response = self.client.post(
+            '/api/applications/status/batch/',
+            data=json.dumps({'tokens': ['cache-te1', 'missing-te1']}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['statuses'], {'cache-te1': 'SUBMITTED', 'missing-te1': None})
+    
+    def test_lookup_fills_missing_digest(self):
+        """Test rows stored before token_te1_digest existed are still found and backfilled"""
+        Application.objects.filter(id=self.app.id).update(token_te1_digest=None)
+        response = self.client.post(
+            '/api/applications/status/batch/',
+            data=json.dumps({'tokens': ['cache-te1']}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.json()['statuses'], {'cache-te1': 'SUBMITTED'})
+        self.app.refresh_from_db()
+        self.assertIsNotNone(self.app.token_te1_digest)
+        
+        Application.objects.filter(id=self.app.id).update(token_te1_digest=None)
+        response = self.client.get('/api/applications/status/cache-te1/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['id'], self.app.id)
+        
+        Application.objects.filter(id=self.app.id).update(token_te1_digest=None)
+        self.assertEqual(get_status_version('cache-te1')[0], self.app.id)
+
+    
+    @override_settings(APPLICATION_OUTBOX_EAGER=True)
+    def test_status_change_is_logged_to_outbox(self):
+        """Test a status change appends a transition that dispatch marks done"""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.app.status = 'CLASSIFIED'
+            self.app.save()
+        
+        transition = ApplicationTransition.objects.filter(application=self.app).latest('id')
+        self.assertEqual((transition.from_status, transition.to_status), ('SUBMITTED', 'CLASSIFIED'))
+        self.assertIsNotNone(transition.dispatched_at)
+    
+    def test_failed_transition_insert_rolls_back_save(self):
+        """Test the UPDATE and its transition row commit or roll back together"""
+        with mock.patch('apps.applications.signals.log_transitions', side_effect=DatabaseError):
+            self.app.status = 'CLASSIFIED'
+            with self.assertRaises(DatabaseError):
+                self.app.save()
+        self.app.refresh_from_db()
+        self.assertEqual(self.app.status, 'SUBMITTED')
+    
+    def test_deferred_status_change_bumps_timestamp(self):
+        """Test .only() instances and update_fields saves still stamp status_changed_at"""
+        yesterday = timezone.now() - timedelta(days=1)
+        Application.objects.filter(id=self.app.id).update(status_changed_at=yesterday)
+        
+        app = Application.objects.only('id', 'status').get(id=self.app.id)
+        app.status = 'CLASSIFIED'
+        app.save()
+        self.app.refresh_from_db()
+        self.assertGreater(self.app.status_changed_at, yesterday)
+        
+        Application.objects.filter(id=self.app.id).update(status_changed_at=yesterday)
+        self.app.refresh_from_db()
+        self.app.status = 'ASSIGNED'
+        self.app.save(update_fields=['status'])
+        self.app.refresh_from_db()
+        self.assertGreater(self.app.status_changed_at, yesterday)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+@mock.patch('config.db_router.replica_alias', return_value='replica')
+class ReplicaPinTests(TestCase):
+    """Test read-after-write pinning to the primary"""
+    
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.router = ReplicaRouter()
+    
+    def route(self, request, write=False):
+        """Database a replica-eligible read in this request is routed to"""
+        routed = []
+        
+        @replica_reads
+        def view(request):
+            if write:
+                self.router.db_for_write(Application)
+            routed.append(self.router.db_for_read(Application))
+            return HttpResponse()
+        
+        ReplicaRoutingMiddleware(view)(request)
+        return routed[0]
+    
+    def test_read_after_write_goes_to_primary(self, replica_alias):
+        """Test the writing client's next read is pinned to default, others are not"""
+        officer = {'HTTP_AUTHORIZATION': 'Token officer-token'}
+        other = {'HTTP_AUTHORIZATION': 'Token other-token'}
+        self.assertEqual(self.route(self.factory.get('/', **officer)), 'replica')
+        
+        self.assertEqual(self.route(self.factory.post('/', **officer), write=True), 'default')
+        self.assertEqual(self.route(self.factory.get('/', **officer)), 'default')
+        self.assertEqual(self.route(self.factory.get('/', **other)), 'replica')
+    
+    def test_anonymous_clients_are_pinned_by_address(self, replica_alias):
+        """Test cookie-less clients (citizens, SMS gateway) are pinned by address"""
+        self.route(self.factory.post('/', REMOTE_ADDR='10.0.0.1'), write=True)
+        self.assertEqual(self.route(self.factory.get('/', REMOTE_ADDR='10.0.0.1')), 'default')
+        self.assertEqual(self.route(self.factory.get('/', REMOTE_ADDR='10.0.0.2')), 'replica')
@@ -2,13 +2,19 @@ from django.urls import path
 from .views import (
     ApplicationCreateView, 
     ApplicationStatusView,
+    ApplicationStatusBatchView,
     OfficerApplicationListView,
-    ApplicationActionView
+    OfficerApplicationDetailView,
+    ApplicationActionView,
+    ApplicationBulkActionView
 )
 
 urlpatterns = [
     path('submit/', ApplicationCreateView.as_view(), name='application-submit'),
+    path('status/batch/', ApplicationStatusBatchView.as_view(), name='application-status-batch'),
     path('status/<str:token>/', ApplicationStatusView.as_view(), name='application-status'),
     path('officer/list/', OfficerApplicationListView.as_view(), name='officer-applications'),
+    path('officer/list/<int:application_id>/', OfficerApplicationDetailView.as_view(), name='officer-application'),
+    path('officer/action/bulk/', ApplicationBulkActionView.as_view(), name='application-bulk-action'),
     path('officer/action/<int:application_id>/', ApplicationActionView.as_view(), name='application-action'),
 ]
@@ -1,14 +1,22 @@
-from rest_framework import generics, status, permissions
+from rest_framework import status, permissions
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import F, Q, Count, Max
+from django.utils import timezone
 from .models import Application, ApplicationFile
-from .serializers import ApplicationSerializer, ApplicationCreateSerializer, OfficerApplicationSerializer, ApplicationActionSerializer
+from .serializers import ApplicationCreateSerializer, OfficerApplicationSerializer, ApplicationActionSerializer, ApplicationBulkActionSerializer, ApplicationStatusBatchSerializer
+from .pagination import OfficerQueueCursorPagination
+from .cache import fill_missing_digests, get_cached_status, get_status_entry, get_status_version
+from .outbox import log_transitions
+from .conditional import make_validators, is_conditional, not_modified_response, set_validators
 from apps.users.models import Citizen
-from apps.encryption.services import TokenEncryptionService
-from apps.ai_services.classification import ServiceClassifier
-from apps.ai_services.redaction import DocumentRedactor
+from apps.officers.models import Officer
+from apps.encryption.services import TokenEncryptionService, token_digest
+from apps.ai_services.backends import get_backend
 from apps.officers.assignment import OfficerAssignmentAlgorithm
+from config.db_router import replica_reads
+from apps.analytics.metrics import observe_stage, APPLICATIONS_SUBMITTED, PII_REJECTIONS, CLASSIFICATIONS
 
 class ApplicationCreateView(APIView):
     permission_classes = [permissions.AllowAny]
@@ -19,6 +27,7 @@ class ApplicationCreateView(APIView):
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         
         data = serializer.validated_data
+        APPLICATIONS_SUBMITTED.inc()
         
         # Create citizen
         citizen = Citizen.objects.create(
@@ -50,10 +59,12 @@ class ApplicationCreateView(APIView):
             )
         
         # AI Redaction check FIRST (before classification)
-        redactor = DocumentRedactor()
+        redactor = get_backend('redactor')
         for file in data['files']:
-            has_pii = redactor.check_for_pii(file)
+            with observe_stage('pii'):
+                has_pii = redactor.check_for_pii(file)
             if has_pii:
+                PII_REJECTIONS.inc()
                 application.status = 'REJECTED'
                 application.save()
                 return Response({
@@ -61,15 +72,18 @@ class ApplicationCreateView(APIView):
                 }, status=status.HTTP_400_BAD_REQUEST)
         
         # AI Classification
-        classifier = ServiceClassifier()
-        service_category = classifier.classify(data['files'][0] if data['files'] else None)
+        with observe_stage('classification'):
+            classifier = get_backend('classifier')
+            service_category = classifier.classify(data['files'][0] if data['files'] else None)
+        CLASSIFICATIONS.labels(category=service_category).inc()
         application.service_category = service_category
         application.status = 'CLASSIFIED'
         application.save()
         
         # Auto-assign to officer based on workload
-        assignment_algo = OfficerAssignmentAlgorithm()
-        officer = assignment_algo.assign_officer(application, service_category)
+        with observe_stage('assignment'):
+            assignment_algo = OfficerAssignmentAlgorithm()
+            officer = assignment_algo.assign_officer(application, service_category)
         
         if officer:
             application.status = 'ASSIGNED'
@@ -87,30 +101,117 @@ class ApplicationCreateView(APIView):
 class ApplicationStatusView(APIView):
     permission_classes = [permissions.AllowAny]
     
+    @replica_reads
     def get(self, request, token):
         try:
-            application = Application.objects.get(token_te1=token)
-            serializer = ApplicationSerializer(application)
-            return Response(serializer.data)
+            entry = get_cached_status(token)
+            if entry is None and is_conditional(request):
+                # Revalidate against updated_at before paying for serialization
+                application_id, updated_at = get_status_version(token)
+                etag, last_modified = make_validators(updated_at, application_id)
+                not_modified = not_modified_response(request, etag, last_modified)
+                if not_modified:
+                    return not_modified
+            if entry is None:
+                entry = get_status_entry(token)
         except Application.DoesNotExist:
             return Response({'error': 'Application not found'}, status=status.HTTP_404_NOT_FOUND)
+        
+        etag, last_modified = make_validators(entry['updated_at'], entry['payload']['id'])
+        not_modified = not_modified_response(request, etag, last_modified)
+        if not_modified:
+            return not_modified
+        return set_validators(Response(entry['payload']), etag, last_modified)
+
+
+class ApplicationStatusBatchView(APIView):
+    """Status of many TE1 tokens in one round trip (SMS/IVR gateway, kiosks)"""
+    permission_classes = [permissions.AllowAny]
+    
+    @replica_reads
+    def post(self, request):
+        serializer = ApplicationStatusBatchSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        digest_to_token = {token_digest(token): token for token in serializer.validated_data['tokens']}
+        statuses = dict.fromkeys(digest_to_token.values())
+        
+        # Single IN query over the indexed digest column
+        for digest, current_status in Application.objects.filter(
+            token_te1_digest__in=list(digest_to_token)
+        ).values_list('token_te1_digest', 'status'):
+            statuses[digest_to_token[digest]] = current_status
+        
+        missing = [token for token, current_status in statuses.items() if current_status is None]
+        if missing:
+            statuses.update(fill_missing_digests(missing))
+        
+        return Response({'statuses': statuses})
 
 
 class OfficerApplicationListView(APIView):
     """List applications assigned to logged-in officer"""
     permission_classes = [permissions.IsAuthenticated]
     
+    QUEUE_STATUSES = ['ASSIGNED', 'IN_REVIEW']
+    
+    @replica_reads
     def get(self, request):
         try:
             officer = request.user.officer
-            applications = Application.objects.filter(
-                assigned_officer=officer,
-                status__in=['ASSIGNED', 'IN_REVIEW']
-            )
-            serializer = OfficerApplicationSerializer(applications, many=True)
-            return Response(serializer.data)
-        except:
+        except Officer.DoesNotExist:
             return Response({'error': 'Officer profile not found'}, status=status.HTTP_404_NOT_FOUND)
+        
+        queue_filter = Q(status__in=self.QUEUE_STATUSES)
+        
+        # Queue version in one aggregate: the count catches removals, the
+        # max updated_at catches additions and changes. Last-Modified spans
+        # all of the officer's applications so approvals/rejections that
+        # leave the queue still move it forward.
+        version = Application.objects.filter(assigned_officer=officer).aggregate(
+            queued=Count('id', filter=queue_filter),
+            queue_updated_at=Max('updated_at', filter=queue_filter),
+            last_updated_at=Max('updated_at')
+        )
+        etag, _ = make_validators(version['queue_updated_at'], officer.id, version['queued'])
+        _, last_modified = make_validators(version['last_updated_at'])
+        not_modified = not_modified_response(request, etag, last_modified)
+        if not_modified:
+            return not_modified
+        
+        applications = Application.objects.filter(
+            queue_filter,
+            assigned_officer=officer
+        ).prefetch_related('files')
+        
+        # Keyset pagination keeps the inbox flat for officers with deep queues
+        paginator = OfficerQueueCursorPagination()
+        page = paginator.paginate_queryset(applications, request, view=self)
+        serializer = OfficerApplicationSerializer(page, many=True)
+        return set_validators(paginator.get_paginated_response(serializer.data), etag, last_modified)
+
+
+class OfficerApplicationDetailView(APIView):
+    """One application from the logged-in officer's queue (dashboard refresh on events)"""
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request, application_id):
+        try:
+            officer = request.user.officer
+        except Officer.DoesNotExist:
+            return Response({'error': 'Officer profile not found'}, status=status.HTTP_404_NOT_FOUND)
+        
+        # Read from the primary: this follows an assignment event for a fresh write
+        application = Application.objects.filter(
+            id=application_id,
+            assigned_officer=officer,
+            status__in=OfficerApplicationListView.QUEUE_STATUSES
+        ).prefetch_related('files').first()
+        if application is None:
+            return Response({'error': 'Application not found'}, status=status.HTTP_404_NOT_FOUND)
+        
+        return Response(OfficerApplicationSerializer(application).data)
 
 
 class ApplicationActionView(APIView):
@@ -156,3 +257,90 @@ class ApplicationActionView(APIView):
             'message': message,
             'status': application.status
         })
+
+
+class ApplicationBulkActionView(APIView):
+    """Officer approves/rejects many applications in one request"""
+    permission_classes = [permissions.IsAuthenticated]
+    
+    # States an officer can still act on
+    ACTIONABLE_STATUSES = ['ASSIGNED', 'IN_REVIEW', 'FORWARDED']
+    
+    def post(self, request):
+        try:
+            officer = request.user.officer
+        except Officer.DoesNotExist:
+            return Response({'error': 'Officer profile not found'}, status=status.HTTP_404_NOT_FOUND)
+        
+        serializer = ApplicationBulkActionSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        items = serializer.validated_data['items']
+        results = {}
+        approve_ids = []
+        reject_ids = []
+        
+        with transaction.atomic():
+            # Ownership check for the whole batch in one query
+            owned = {
+                row['id']: row
+                for row in Application.objects.select_for_update()
+                .filter(id__in=[item['application_id'] for item in items], assigned_officer=officer)
+                .values('id', 'token_te1_digest', *Application.TRACKED_FIELDS)
+            }
+            
+            for item in items:
+                application_id = item['application_id']
+                if application_id not in owned:
+                    results[application_id] = {'error': 'Application not found'}
+                elif owned[application_id]['status'] not in self.ACTIONABLE_STATUSES:
+                    results[application_id] = {'error': f"Application already {owned[application_id]['status'].lower()}"}
+                else:
+                    results[application_id] = None
+                    if item['action'] == 'APPROVE':
+                        approve_ids.append(application_id)
+                    else:
+                        reject_ids.append(application_id)
+            
+            # Approvals go up a level when one exists, otherwise they are final
+            assignment_algo = OfficerAssignmentAlgorithm()
+            forwarded = assignment_algo.forward_many_to_next_level(
+                officer, [owned[i] for i in approve_ids]
+            )
+            approved_ids = [i for i in approve_ids if i not in forwarded]
+            
+            now = timezone.now()
+            if approved_ids:
+                Application.objects.filter(id__in=approved_ids).update(status='APPROVED', updated_at=now, status_changed_at=now)
+            if reject_ids:
+                Application.objects.filter(id__in=reject_ids).update(status='REJECTED', updated_at=now, status_changed_at=now)
+            
+            closed = len(approved_ids) + len(reject_ids)
+            if closed:
+                Officer.objects.filter(id=officer.id).update(workload_count=F('workload_count') - closed)
+            
+            # Set-based updates bypass post_save, so log the transitions explicitly
+            log_transitions(
+                (i, owned[i]['token_te1_digest'], Application.tracked_state_of(owned[i]), {
+                    **Application.tracked_state_of(owned[i]), 'status': new_status, 'status_changed_at': now
+                })
+                for new_status, ids in (('APPROVED', approved_ids), ('REJECTED', reject_ids))
+                for i in ids
+            )
+        
+        for application_id in forwarded:
+            results[application_id] = {'status': 'FORWARDED', 'message': 'Application forwarded to next level'}
+        for application_id in approved_ids:
+            results[application_id] = {'status': 'APPROVED', 'message': 'Application approved'}
+        for application_id in reject_ids:
+            results[application_id] = {'status': 'REJECTED', 'message': 'Application rejected'}
+        
+        return Response({
+            'processed': len(approve_ids) + len(reject_ids),
+            'failed': sum(1 for result in results.values() if 'error' in result),
+            'results': [
+                {'application_id': application_id, **result}
+                for application_id, result in results.items()
+            ]
+        })
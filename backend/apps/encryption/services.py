@@ -1,8 +1,14 @@
 from cryptography.fernet import Fernet
 from django.conf import settings
+import hashlib
 import uuid
 
 
+def token_digest(token: str) -> str:
+    """SHA-256 hex digest of a token, used as a fixed-width index/cache key"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
 class EncryptionService:
     """Double-blind token encryption service"""
     
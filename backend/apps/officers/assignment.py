@@ -1,6 +1,11 @@
+import heapq
+from collections import defaultdict
+from django.db.models import F
+from django.utils import timezone
 from .models import Officer
 from .constants import SERVICE_TO_DEPARTMENT
 from apps.applications.models import Application
+from apps.applications.outbox import log_transitions
 
 
 class OfficerAssignmentAlgorithm:
@@ -79,6 +84,74 @@ class OfficerAssignmentAlgorithm:
         
         return next_officer
     
+    def forward_many_to_next_level(self, current_officer: Officer, applications):
+        """
+        Forward several applications to the next hierarchy level in one pass.
+        Spreads them over next-level officers by workload and applies the
+        workload deltas and status changes as set-based updates.
+        
+        Args:
+            current_officer: Officer the applications are assigned to
+            applications: Row dicts with id, token_te1_digest and
+                Application.TRACKED_FIELDS (as loaded by the caller)
+        
+        Returns:
+            Dict mapping application id to the next-level officer.
+            Empty if there is no higher level (applications are final).
+        """
+        applications = list(applications)
+        if not applications:
+            return {}
+        
+        officers = list(Officer.objects.filter(
+            department=current_officer.department,
+            hierarchy_level=current_officer.hierarchy_level + 1,
+            is_active=True
+        ).order_by('workload_count', 'id'))
+        
+        if not officers:
+            return {}
+        
+        # Lowest-workload-first, same rule as forward_to_next_level
+        heap = [(o.workload_count, o.id, o) for o in officers]
+        heapq.heapify(heap)
+        assignments = {}
+        grouped = defaultdict(list)
+        for row in applications:
+            workload, officer_id, next_officer = heapq.heappop(heap)
+            assignments[row['id']] = next_officer
+            grouped[officer_id].append(row['id'])
+            heapq.heappush(heap, (workload + 1, officer_id, next_officer))
+        
+        now = timezone.now()
+        for officer_id, ids in grouped.items():
+            Officer.objects.filter(id=officer_id).update(
+                workload_count=F('workload_count') + len(ids)
+            )
+            Application.objects.filter(id__in=ids).update(
+                assigned_officer_id=officer_id,
+                status='FORWARDED',
+                updated_at=now,
+                status_changed_at=now
+            )
+        
+        Officer.objects.filter(id=current_officer.id).update(
+            workload_count=F('workload_count') - len(applications)
+        )
+        
+        # Set-based updates bypass post_save, so log the transitions explicitly
+        log_transitions(
+            (row['id'], row['token_te1_digest'], Application.tracked_state_of(row), {
+                **Application.tracked_state_of(row),
+                'status': 'FORWARDED',
+                'assigned_officer_id': assignments[row['id']].id,
+                'status_changed_at': now
+            })
+            for row in applications
+        )
+        
+        return assignments
+    
     def _get_department(self, service_category: str) -> str:
         """Map service category to department using constants"""
         return SERVICE_TO_DEPARTMENT.get(service_category, 'GENERAL')
@@ -0,0 +1,101 @@
+"""
+Officer event feed
+Assignment/forward events are derived from the application transition
+outbox, published on a per-officer Redis pub/sub channel and streamed to
+the officer's browser as server-sent events.
+"""
+
+import json
+import logging
+import time
+from django.conf import settings
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = 'officer-events'
+
+
+def channel_for(officer_id) -> str:
+    """Pub/sub channel carrying events for one officer"""
+    return f'{CHANNEL_PREFIX}:{officer_id}'
+
+
+def _redis():
+    from django_redis import get_redis_connection
+    return get_redis_connection('default')
+
+
+def publish_officer_event(officer_id, event: str, data: dict):
+    """
+    Publish an event to an officer once the current transaction commits,
+    so subscribers never see work that was rolled back.
+    Publishing is best effort: a Redis outage must not fail an assignment.
+    """
+    message = json.dumps({'event': event, 'data': data}, default=str)
+    
+    def _publish():
+        try:
+            _redis().publish(channel_for(officer_id), message)
+        except Exception:
+            logger.warning('Could not publish %s event for officer %s', event, officer_id, exc_info=True)
+    
+    transaction.on_commit(_publish)
+
+
+# Statuses that keep an application in its officer's inbox
+QUEUE_STATUSES = ('ASSIGNED', 'IN_REVIEW', 'FORWARDED')
+
+
+def handle_transitions(transitions):
+    """
+    Outbox handler: notify officers whose queue gained or lost an application.
+    The new officer gets 'assigned'/'forwarded', and the previous officer
+    (or the same officer, once the application is closed) gets 'removed'.
+    """
+    for transition in transitions:
+        data = {
+            'application_id': transition.application_id,
+            'service_category': transition.to_service_category,
+            'status': transition.to_status,
+            'created_at': transition.application_created_at,
+        }
+        if transition.from_officer_id != transition.to_officer_id:
+            if transition.from_officer_id:
+                publish_officer_event(transition.from_officer_id, 'removed', data)
+            if transition.to_officer_id:
+                event = 'forwarded' if transition.to_status == 'FORWARDED' else 'assigned'
+                publish_officer_event(transition.to_officer_id, event, data)
+        elif (
+            transition.to_officer_id
+            and transition.from_status in QUEUE_STATUSES
+            and transition.to_status not in QUEUE_STATUSES
+        ):
+            publish_officer_event(transition.to_officer_id, 'removed', data)
+
+
+def stream_officer_events(officer_id):
+    """
+    Yield server-sent event frames for an officer.
+    Sends a keep-alive comment every OFFICER_EVENTS_HEARTBEAT seconds and
+    closes after OFFICER_EVENTS_MAX_STREAM_SECONDS so a connection is not
+    held forever; EventSource reconnects on its own using the retry hint.
+    Meant for gevent workers (the events service), where the blocking Redis
+    read yields to other streams instead of occupying a whole worker.
+    """
+    heartbeat = settings.OFFICER_EVENTS_HEARTBEAT
+    deadline = time.monotonic() + settings.OFFICER_EVENTS_MAX_STREAM_SECONDS
+    
+    pubsub = _redis().pubsub(ignore_subscribe_messages=True)
+    pubsub.subscribe(channel_for(officer_id))
+    try:
+        yield f'retry: {heartbeat * 1000}\n\n'
+        while time.monotonic() < deadline:
+            message = pubsub.get_message(timeout=heartbeat)
+            if message is None:
+                yield ': keep-alive\n\n'
+                continue
+            payload = json.loads(message['data'])
+            yield f"event: {payload['event']}\ndata: {json.dumps(payload['data'])}\n\n"
+    finally:
+        pubsub.close()
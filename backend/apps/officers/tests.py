@@ -1,11 +1,13 @@
 """
 Unit tests for officer management and assignment
 """
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.contrib.auth.models import User
+from rest_framework.test import APIClient
 from .models import Officer
 from .assignment import OfficerAssignmentAlgorithm
 from apps.applications.models import Application
+from apps.users.models import Citizen
 
 
 class OfficerModelTests(TestCase):
@@ -137,3 +139,64 @@ class OfficerAssignmentTests(TestCase):
         
         self.assertIsNotNone(assigned_officer)
         self.assertEqual(assigned_officer.department, 'HEALTH')
+    
+    def test_forward_many_spreads_by_workload(self):
+        """Test bulk forwarding balances next-level officers and updates workloads"""
+        seniors = []
+        for i in range(2):
+            user = User.objects.create_user(
+                username=f'senior{i}',
+                password='officer123'
+            )
+            seniors.append(Officer.objects.create(
+                user=user,
+                department='REVENUE',
+                hierarchy_level=2,
+                is_active=True,
+                workload_count=0
+            ))
+        
+        junior = self.officers[0]
+        junior.workload_count = 4
+        junior.save()
+        citizen = Citizen.objects.create(name='Test', age=30, address='Addr', aadhaar='123456789012')
+        apps = [
+            Application.objects.create(
+                citizen=citizen,
+                token_original=f'fwd-{i}',
+                token_te1=f'te1-{i}',
+                token_te2=f'te2-{i}',
+                status='ASSIGNED',
+                assigned_officer=junior
+            )
+            for i in range(4)
+        ]
+        
+        rows = Application.objects.filter(id__in=[a.id for a in apps]).values(
+            'id', 'token_te1_digest', *Application.TRACKED_FIELDS
+        )
+        forwarded = self.algorithm.forward_many_to_next_level(junior, rows)
+        
+        self.assertEqual(len(forwarded), 4)
+        for senior in seniors:
+            senior.refresh_from_db()
+            self.assertEqual(senior.workload_count, 2)
+        junior.refresh_from_db()
+        self.assertEqual(junior.workload_count, 0)
+        self.assertEqual(Application.objects.filter(status='FORWARDED').count(), 4)
+
+
+class OfficerEventStreamTests(TestCase):
+    """Test the SSE endpoint stays off the sync API workers"""
+    
+    @override_settings(OFFICER_EVENTS_ENABLED=False)
+    def test_stream_refused_when_disabled(self):
+        """API workers answer 503 instead of holding a worker open"""
+        user = User.objects.create_user(username='streamer', password='officer123')
+        Officer.objects.create(user=user, department='REVENUE', hierarchy_level=1)
+        client = APIClient()
+        client.force_authenticate(user=user)
+        
+        response = client.get('/api/officers/events/')
+        
+        self.assertEqual(response.status_code, 503)
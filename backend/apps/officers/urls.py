@@ -3,7 +3,8 @@ from .views import (
     OfficerListView,
     OfficerCreateView,
     OfficerUpdateView,
-    OfficerDeleteView
+    OfficerDeleteView,
+    OfficerEventStreamView
 )
 
 urlpatterns = [
@@ -11,4 +12,5 @@ urlpatterns = [
     path('create/', OfficerCreateView.as_view(), name='officer-create'),
     path('update/<int:officer_id>/', OfficerUpdateView.as_view(), name='officer-update'),
     path('delete/<int:officer_id>/', OfficerDeleteView.as_view(), name='officer-delete'),
+    path('events/', OfficerEventStreamView.as_view(), name='officer-events'),
 ]
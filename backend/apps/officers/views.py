@@ -2,9 +2,13 @@ from rest_framework import generics, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import permissions
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.db import connections
+from django.http import StreamingHttpResponse
 from .models import Officer
 from .serializers import OfficerSerializer, OfficerCreateSerializer
+from .events import stream_officer_events
 
 class OfficerListView(generics.ListAPIView):
     queryset = Officer.objects.filter(is_active=True)
@@ -80,3 +84,33 @@ class OfficerDeleteView(APIView):
             return Response({'message': 'Officer deactivated successfully'})
         except Officer.DoesNotExist:
             return Response({'error': 'Officer not found'}, status=status.HTTP_404_NOT_FOUND)
+
+
+class OfficerEventStreamView(APIView):
+    """Server-sent events for the logged-in officer (new assignments and forwards)"""
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request):
+        if not settings.OFFICER_EVENTS_ENABLED:
+            # Would pin a sync worker for minutes; route to the events service
+            return Response(
+                {'error': 'Event stream is served by the events service'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+        
+        try:
+            officer = request.user.officer
+        except Officer.DoesNotExist:
+            return Response({'error': 'Officer profile not found'}, status=status.HTTP_404_NOT_FOUND)
+        
+        # The stream only reads Redis; don't keep a database connection open
+        # per idle subscriber for the lifetime of the stream
+        connections.close_all()
+        
+        response = StreamingHttpResponse(
+            stream_officer_events(officer.id),
+            content_type='text/event-stream'
+        )
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'  # Let nginx pass events through unbuffered
+        return response
@@ -0,0 +1,117 @@
+"""
+Read-replica routing
+Reads go to the replica only inside views that opt in with @replica_reads
+(analytics, status lookups, officer queue) and only while the client is not
+pinned to the primary. Any write pins the rest of the request to the primary
+and records a short-lived pin in the cache under the client's key, so that
+client's next requests (read-after-write: submit then check status, act
+then reload the queue) also read from the primary until replication has
+caught up. The pin is server-side because neither the cross-origin,
+token-authenticated frontend nor the SMS gateway sends cookies back.
+Without a 'replica' entry in DATABASES everything stays on 'default'.
+"""
+
+import contextvars
+import hashlib
+import logging
+from functools import wraps
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+REPLICA = 'replica'
+PIN_KEY_PREFIX = 'db-pin'
+
+_routing = contextvars.ContextVar('db_routing', default=None)
+
+
+def replica_alias() -> str:
+    """Alias for reads that never need read-after-write (exports, rebuilds)"""
+    return REPLICA if REPLICA in settings.DATABASES else 'default'
+
+
+def replica_reads(view):
+    """Let reads made by this view (or view method) use the replica"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        state = _routing.get()
+        if state is None:
+            return view(*args, **kwargs)
+        previous = state['replica']
+        state['replica'] = True
+        try:
+            return view(*args, **kwargs)
+        finally:
+            state['replica'] = previous
+    return wrapper
+
+
+def pin_key(request) -> str:
+    """
+    Cache key identifying the client: its auth token or session, else its
+    address (anonymous citizens, the SMS gateway)
+    """
+    credentials = request.META.get('HTTP_AUTHORIZATION') or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    if not credentials:
+        forwarded = request.META.get('HTTP_X_FORWARDED_FOR', '')
+        credentials = forwarded.split(',')[0].strip() or request.META.get('REMOTE_ADDR', '')
+    return f'{PIN_KEY_PREFIX}:{hashlib.sha256(credentials.encode()).hexdigest()}'
+
+
+def _is_pinned(state) -> bool:
+    """Look the client's pin up once, on the first read that could use the replica"""
+    if state['pinned'] is None:
+        try:
+            state['pinned'] = bool(cache.get(state['pin_key']))
+        except Exception:
+            # Without the pin we cannot rule out a recent write
+            logger.warning('Could not read replica pin; reading from the primary', exc_info=True)
+            state['pinned'] = True
+    return state['pinned']
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        # Related lookups follow the object they start from
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        state = _routing.get()
+        if state and state['replica'] and replica_alias() != 'default' and not _is_pinned(state):
+            return REPLICA
+        return 'default'
+    
+    def db_for_write(self, model, **hints):
+        state = _routing.get()
+        if state is not None:
+            state['pinned'] = state['wrote'] = True
+        return 'default'
+    
+    def allow_relation(self, obj1, obj2, **hints):
+        # Same data on both aliases
+        return True
+    
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
+
+
+class ReplicaRoutingMiddleware:
+    """Per-request routing state plus the sticky-primary pin"""
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+    
+    def __call__(self, request):
+        state = {'replica': False, 'pinned': None, 'wrote': False, 'pin_key': pin_key(request)}
+        token = _routing.set(state)
+        try:
+            response = self.get_response(request)
+            if state['wrote'] and replica_alias() != 'default':
+                try:
+                    cache.set(state['pin_key'], 1, settings.DB_REPLICA_PIN_SECONDS)
+                except Exception:
+                    logger.warning('Could not record replica pin', exc_info=True)
+            return response
+        finally:
+            _routing.reset(token)
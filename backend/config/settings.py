@@ -29,6 +29,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'apps.analytics.middleware.PrometheusMetricsMiddleware',
+    'config.db_router.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -71,6 +73,20 @@ DATABASES = {
     }
 }
 
+# Optional streaming read replica (see config/db_router.py)
+DB_REPLICA_HOST = config('DB_REPLICA_HOST', default='')
+if DB_REPLICA_HOST:
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': DB_REPLICA_HOST,
+        'PORT': config('DB_REPLICA_PORT', default=DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_ROUTERS = ['config.db_router.ReplicaRouter']
+
+# Clients that wrote read from the primary for this long (replication lag)
+DB_REPLICA_PIN_SECONDS = config('DB_REPLICA_PIN_SECONDS', default=5, cast=int)
+
 # Redis cache configuration
 CACHES = {
     'default': {
@@ -82,6 +98,42 @@ CACHES = {
     }
 }
 
+# Citizen status payload cache (invalidated on change; TTL is a safety net)
+STATUS_CACHE_TTL = config('STATUS_CACHE_TTL', default=300, cast=int)
+
+# Maximum number of TE1 tokens per batched status request
+STATUS_BATCH_MAX_TOKENS = config('STATUS_BATCH_MAX_TOKENS', default=500, cast=int)
+
+# Admin dashboard stale-while-revalidate cache (seconds)
+ANALYTICS_DASHBOARD_SOFT_TTL = config('ANALYTICS_DASHBOARD_SOFT_TTL', default=30, cast=int)
+ANALYTICS_DASHBOARD_HARD_TTL = config('ANALYTICS_DASHBOARD_HARD_TTL', default=600, cast=int)
+ANALYTICS_DASHBOARD_LOCK_TIMEOUT = config('ANALYTICS_DASHBOARD_LOCK_TIMEOUT', default=30, cast=int)
+# How long a cold-cache request waits for another worker's recompute before computing it itself
+ANALYTICS_DASHBOARD_COLD_WAIT = config('ANALYTICS_DASHBOARD_COLD_WAIT', default=3, cast=float)
+ANALYTICS_TIMESERIES_MAX_DAYS = config('ANALYTICS_TIMESERIES_MAX_DAYS', default=366, cast=int)
+
+# Readiness probe: seconds a dependency check result is reused per worker,
+# and the Celery queues whose depth it reports
+HEALTH_READINESS_TTL = config('HEALTH_READINESS_TTL', default=5, cast=int)
+HEALTH_CELERY_QUEUES = config('HEALTH_CELERY_QUEUES', default='celery').split(',')
+
+# Memory-mapped policy vector index (manage.py build_policy_index)
+AI_POLICY_INDEX_DIR = config('AI_POLICY_INDEX_DIR', default=str(BASE_DIR / 'storage' / 'policy_index'))
+# Per-department shards of the same corpus for federated retrieval (one index per subdirectory)
+AI_POLICY_SHARD_DIR = config('AI_POLICY_SHARD_DIR', default=str(BASE_DIR / 'storage' / 'policy_shards'))
+# Default RAG retriever over the policy corpus: 'federated' (the shards) or 'single' (the one index)
+AI_POLICY_RETRIEVER = config('AI_POLICY_RETRIEVER', default='federated')
+
+# Content-addressed embedding cache shared by the RAG pipelines
+AI_EMBEDDING_CACHE_PATH = config('AI_EMBEDDING_CACHE_PATH', default=str(BASE_DIR / 'storage' / 'embeddings.sqlite3'))
+
+# Load AI backends at boot instead of on first request (see gunicorn.conf.py)
+AI_WARMUP = config('AI_WARMUP', default=False, cast=bool)
+AI_WARMUP_BACKENDS = config('AI_WARMUP_BACKENDS', default='redactor,classifier').split(',')
+
+# Rows fetched per server-side cursor round trip in streaming exports
+EXPORT_CHUNK_SIZE = config('EXPORT_CHUNK_SIZE', default=2000, cast=int)
+
 # Celery configuration
 CELERY_BROKER_URL = config('REDIS_URL', default='redis://localhost:6379/0')
 CELERY_RESULT_BACKEND = config('REDIS_URL', default='redis://localhost:6379/0')
@@ -89,6 +141,22 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
+CELERY_BEAT_SCHEDULE = {
+    # Safety-net sweep; commits also enqueue a dispatch immediately
+    'dispatch-transition-outbox': {
+        'task': 'apps.applications.tasks.dispatch_transition_outbox',
+        'schedule': config('APPLICATION_OUTBOX_SWEEP_SECONDS', default=10.0, cast=float),
+    },
+}
+
+# Application transition outbox consumers (see apps/applications/outbox.py)
+APPLICATION_OUTBOX_HANDLERS = [
+    'apps.analytics.rollups.handle_transitions',
+    'apps.officers.events.handle_transitions',
+]
+APPLICATION_OUTBOX_BATCH_SIZE = config('APPLICATION_OUTBOX_BATCH_SIZE', default=500, cast=int)
+# Dispatch in-process on commit instead of via Celery (development/tests)
+APPLICATION_OUTBOX_EAGER = config('APPLICATION_OUTBOX_EAGER', default=False, cast=bool)
 
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -118,6 +186,20 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Officer inbox pagination (keyset / cursor based)
+OFFICER_QUEUE_PAGE_SIZE = config('OFFICER_QUEUE_PAGE_SIZE', default=50, cast=int)
+OFFICER_QUEUE_MAX_PAGE_SIZE = config('OFFICER_QUEUE_MAX_PAGE_SIZE', default=200, cast=int)
+
+# Maximum number of applications per bulk approve/reject request
+BULK_ACTION_MAX_ITEMS = config('BULK_ACTION_MAX_ITEMS', default=200, cast=int)
+
+# Officer server-sent event stream
+OFFICER_EVENTS_HEARTBEAT = config('OFFICER_EVENTS_HEARTBEAT', default=15, cast=int)
+OFFICER_EVENTS_MAX_STREAM_SECONDS = config('OFFICER_EVENTS_MAX_STREAM_SECONDS', default=300, cast=int)
+# Streams hold their worker for their whole lifetime, so they are served by
+# the gevent 'events' deployment only; sync API workers set this to False
+OFFICER_EVENTS_ENABLED = config('OFFICER_EVENTS_ENABLED', default=True, cast=bool)
+
 # Add rest_framework.authtoken to INSTALLED_APPS
 INSTALLED_APPS.append('rest_framework.authtoken')
 
@@ -3,6 +3,7 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from rest_framework.authtoken.views import obtain_auth_token
+from apps.analytics.views import metrics
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -11,6 +12,7 @@ urlpatterns = [
     path('api/officers/', include('apps.officers.urls')),
     path('api/applications/', include('apps.applications.urls')),
     path('api/analytics/', include('apps.analytics.urls')),
+    path('metrics', metrics, name='prometheus-metrics'),
 ]
 
 if settings.DEBUG:
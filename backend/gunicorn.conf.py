@@ -0,0 +1,52 @@
+"""
+Gunicorn settings picked up automatically from the working directory.
+Prometheus multiprocess hooks and AI warm-up live here; bind/workers
+stay on the command line.
+"""
+
+import os
+import shutil
+from decouple import config
+
+AI_WARMUP = config('AI_WARMUP', default=False, cast=bool)
+
+# Load the app (and warm AI assets) once in the master, shared by all
+# workers copy-on-write; otherwise each worker warms up on its own
+preload_app = AI_WARMUP and config('AI_WARMUP_PRELOAD', default=True, cast=bool)
+
+
+def reset_metrics_dir():
+    """
+    Start from an empty metrics directory; files left by a previous master
+    would otherwise be merged into the new totals. Runs when this module is
+    loaded, before a preloaded app imports the metrics and opens its files
+    (on_starting would be too late). Config reloads (HUP) in the same
+    master keep the live workers' files.
+    """
+    path = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if path and os.environ.get('PROMETHEUS_MULTIPROC_MASTER') != str(os.getpid()):
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+        os.environ['PROMETHEUS_MULTIPROC_MASTER'] = str(os.getpid())
+
+
+reset_metrics_dir()
+
+
+def child_exit(server, worker):
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
+
+
+def when_ready(server):
+    # Master, after the preloaded app is imported and before any fork
+    if preload_app:
+        from apps.ai_services.warmup import warm_up_before_fork
+        warm_up_before_fork()
+
+
+def post_worker_init(worker):
+    if AI_WARMUP and not preload_app:
+        from apps.ai_services.warmup import start_background_warm_up
+        start_background_warm_up()
@@ -28,12 +28,14 @@ setup(
         'django-redis>=5.4.0',
         'django-cors-headers>=4.3.1',
         'gunicorn>=21.2.0',
+        'gevent>=23.9.1',
         'prometheus-client>=0.19.0',
         'langchain>=0.1.0',
         'langchain-community>=0.0.10',
         'langgraph>=0.0.20',
         'langchain-core>=0.1.10',
         'faiss-cpu>=1.7.4',
+        'numpy>=1.26.3',
         'sentence-transformers>=2.2.2',
     ],
     classifiers=[
@@ -29,7 +29,12 @@ echo Step 5: Running migrations...
 docker-compose exec backend python manage.py migrate
 
 echo.
-echo Step 6: Creating superuser (optional)...
+echo Step 6: Backfilling token digests and analytics rollups (no-op once populated)...
+docker-compose exec backend python manage.py backfill_token_digests
+docker-compose exec backend python manage.py rebuild_analytics_rollups --if-empty
+
+echo.
+echo Step 7: Creating superuser (optional)...
 docker-compose exec backend python manage.py createsuperuser
 
 echo.
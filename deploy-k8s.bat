@@ -26,8 +26,11 @@ timeout /t 20
 echo.
 echo Step 5: Deploying application...
 kubectl apply -f k8s/backend-deployment.yaml
+kubectl apply -f k8s/events-deployment.yaml
 kubectl apply -f k8s/frontend-deployment.yaml
 kubectl apply -f k8s/celery-deployment.yaml
+kubectl delete job db-setup -n gov-portal --ignore-not-found
+kubectl apply -f k8s/db-setup-job.yaml
 
 echo.
 echo Step 6: Enabling autoscaling...
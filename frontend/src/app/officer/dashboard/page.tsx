@@ -16,20 +16,96 @@ interface Application {
 export default function OfficerDashboardPage() {
   const router = useRouter()
   const [applications, setApplications] = useState<Application[]>([])
+  const [nextPage, setNextPage] = useState<string | null>(null)
+  const [loadingMore, setLoadingMore] = useState(false)
   const [loading, setLoading] = useState(true)
   const [selectedApp, setSelectedApp] = useState<Application | null>(null)
   const [scrollY, setScrollY] = useState(0)
 
   useEffect(() => {
     fetchApplications()
+    const stopEvents = subscribeToEvents()
     
     const handleScroll = () => {
       setScrollY(window.scrollY)
     }
     window.addEventListener('scroll', handleScroll, { passive: true })
-    return () => window.removeEventListener('scroll', handleScroll)
+    return () => {
+      window.removeEventListener('scroll', handleScroll)
+      stopEvents()
+    }
   }, [])
 
+  // Apply assignment/forward deltas pushed by the server instead of polling the queue
+  const subscribeToEvents = () => {
+    const controller = new AbortController()
+    const token = localStorage.getItem('authToken')
+
+    const dropApplication = (id: number) => {
+      setApplications(apps => apps.filter(app => app.id !== id))
+    }
+
+    // Events only carry ids and status; fetch the full row (token, files) for new assignments
+    const refreshApplication = async (id: number) => {
+      try {
+        const response = await axios.get(
+          `${process.env.NEXT_PUBLIC_API_URL}/applications/officer/list/${id}/`,
+          { headers: { Authorization: `Token ${token}` } }
+        )
+        setApplications(apps => [...apps.filter(app => app.id !== id), response.data].sort(
+          (a, b) => a.created_at.localeCompare(b.created_at) || a.id - b.id
+        ))
+      } catch (err) {
+        // No longer in this officer's queue
+        dropApplication(id)
+      }
+    }
+
+    const applyEvent = (event: string, data: any) => {
+      if (event === 'assigned') {
+        refreshApplication(data.application_id)
+      } else if (event === 'removed' || event === 'forwarded') {
+        // The queue lists ASSIGNED/IN_REVIEW only; forwarded items are not shown
+        dropApplication(data.application_id)
+      }
+    }
+
+    const connect = async () => {
+      while (!controller.signal.aborted) {
+        try {
+          const response = await fetch(
+            `${process.env.NEXT_PUBLIC_API_URL}/officers/events/`,
+            { headers: { Authorization: `Token ${token}` }, signal: controller.signal }
+          )
+          if (!response.ok || !response.body) return
+          const reader = response.body.getReader()
+          const decoder = new TextDecoder()
+          let buffer = ''
+          while (true) {
+            const { value, done } = await reader.read()
+            if (done) break
+            buffer += decoder.decode(value, { stream: true })
+            const frames = buffer.split('\n\n')
+            buffer = frames.pop() || ''
+            for (const frame of frames) {
+              const event = frame.match(/^event: (.*)$/m)
+              const data = frame.match(/^data: (.*)$/m)
+              if (event && data) applyEvent(event[1], JSON.parse(data[1]))
+            }
+          }
+          // Stream closed by the server; resync in case events were missed while reconnecting
+          fetchApplications()
+        } catch (err) {
+          if (controller.signal.aborted) return
+          await new Promise(resolve => setTimeout(resolve, 5000))
+        }
+      }
+    }
+
+    connect()
+    return () => controller.abort()
+  }
+
   const fetchApplications = async () => {
     const token = localStorage.getItem('authToken')
     if (!token) {
@@ -42,7 +118,8 @@ export default function OfficerDashboardPage() {
         `${process.env.NEXT_PUBLIC_API_URL}/applications/officer/list/`,
         { headers: { Authorization: `Token ${token}` } }
       )
-      setApplications(response.data)
+      setApplications(response.data.results)
+      setNextPage(response.data.next)
     } catch (err) {
       console.error(err)
     } finally {
@@ -50,6 +127,26 @@ export default function OfficerDashboardPage() {
     }
   }
 
+  // The queue is cursor-paginated; follow `next` to append the following page
+  const loadMore = async () => {
+    if (!nextPage) return
+    const token = localStorage.getItem('authToken')
+    setLoadingMore(true)
+
+    try {
+      const response = await axios.get(nextPage, { headers: { Authorization: `Token ${token}` } })
+      setApplications(apps => [
+        ...apps,
+        ...response.data.results.filter((app: Application) => !apps.some(existing => existing.id === app.id))
+      ])
+      setNextPage(response.data.next)
+    } catch (err) {
+      console.error(err)
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
   const handleAction = async (appId: number, action: 'APPROVE' | 'REJECT') => {
     const token = localStorage.getItem('authToken')
     
@@ -99,7 +196,7 @@ export default function OfficerDashboardPage() {
 
       <div className="card">
         <h2 style={{ marginTop: 0, marginBottom: '2rem', letterSpacing: '0.05em', fontWeight: 400, textTransform: 'uppercase' }}>
-          Assigned Applications ({applications.length})
+          Assigned Applications ({applications.length}{nextPage ? '+' : ''})
         </h2>
         
         {applications.length === 0 ? (
@@ -184,6 +281,17 @@ export default function OfficerDashboardPage() {
             ))}
           </div>
         )}
+
+        {nextPage && (
+          <button
+            onClick={loadMore}
+            className="btn"
+            disabled={loadingMore}
+            style={{ marginTop: '2rem', width: '100%' }}
+          >
+            {loadingMore ? 'Loading...' : 'Load more'}
+          </button>
+        )}
       </div>
     </div>
   )
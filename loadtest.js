@@ -28,7 +28,7 @@ export default function () {
   sleep(1);
 
   // Test API health check
-  res = http.get(`${BASE_URL}/api/health/`);
+  res = http.get(`${BASE_URL}/api/analytics/health/ready/`);
   check(res, {
     'health check status is 200': (r) => r.status === 200,
     'health check is healthy': (r) => r.json('status') === 'healthy',